@@ -1,3 +1,14 @@
+import os
+import sys
+
+# Shared helpers (buffer_input) live at the repository root
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from buffer_input import as_sequence, exact_int64, numpy_array, wide_array
+
+
 def pair_sum_unsorted(lst, tgt):
     """
     Original implementation - Good approach but has a logical issue.
@@ -32,13 +43,18 @@ def pair_sum_optimized(lst, tgt):
     Space Complexity: O(n) - Hash map storage in worst case
     
     Args:
-        lst: List of integers
+        lst: List of integers, or any 1-D numeric buffer (array.array,
+             memoryview, NumPy array); long buffers go to pair_sum_vectorized
         tgt: Target sum
         
     Returns:
         List containing indices [i, j] where lst[i] + lst[j] = tgt,
         or empty list if no such pair exists
     """
+    values = numpy_array(lst)
+    if values is not None and exact_int64(values, tgt):
+        return pair_sum_vectorized(values, tgt)
+    lst = as_sequence(lst)
     if len(lst) < 2:
         return []
     
@@ -57,6 +73,40 @@ def pair_sum_optimized(lst, tgt):
     return []
 
 
+def pair_sum_vectorized(values, tgt):
+    """
+    pair_sum_optimized over a NumPy array, with the same answer: the first j
+    whose complement occurs before it, paired with the latest such index.
+
+    A stable argsort groups equal values in index order, so one
+    searchsorted finds each complement's first occurrence; a second one,
+    inside the winning complement's group, finds its last index before j.
+
+    Time Complexity: O(n log n), vectorized
+    Space Complexity: O(n)
+    """
+    import numpy as np
+
+    values = wide_array(values)
+    n = len(values)
+    if n < 2:
+        return []
+    order = np.argsort(values, kind="stable")
+    ordered = values[order]
+    complements = tgt - values
+    lo = np.searchsorted(ordered, complements, side="left")
+    inside = lo < n
+    lo_clipped = np.minimum(lo, n - 1)
+    found = inside & (ordered[lo_clipped] == complements) & (order[lo_clipped] < np.arange(n))
+    if not found.any():
+        return []
+    j = int(found.argmax())
+    hi = int(np.searchsorted(ordered, complements[j], side="right"))
+    group = order[lo_clipped[j]:hi]
+    i = int(group[np.searchsorted(group, j) - 1])
+    return [i, j]
+
+
 def pair_sum_all_pairs(lst, tgt):
     """
     Find ALL pairs that sum to target (not just the first one).
@@ -67,6 +117,7 @@ def pair_sum_all_pairs(lst, tgt):
     Returns:
         List of all pairs [i, j] where lst[i] + lst[j] = tgt
     """
+    lst = as_sequence(lst)
     if len(lst) < 2:
         return []
     
@@ -96,6 +147,7 @@ def pair_sum_brute_force(lst, tgt):
     Time Complexity: O(n²)
     Space Complexity: O(1)
     """
+    lst = as_sequence(lst)
     if len(lst) < 2:
         return []
     
@@ -129,10 +181,10 @@ def test_implementations():
         print(f"Array: {lst}, Target: {target}")
         print("-" * 40)
         
-        result_original = pair_sum_unsorted(lst.copy(), target)
-        result_optimized = pair_sum_optimized(lst.copy(), target) 
-        result_brute = pair_sum_brute_force(lst.copy(), target)
-        result_all = pair_sum_all_pairs(lst.copy(), target)
+        result_original = pair_sum_unsorted(lst, target)
+        result_optimized = pair_sum_optimized(lst, target) 
+        result_brute = pair_sum_brute_force(lst, target)
+        result_all = pair_sum_all_pairs(lst, target)
         
         print(f"Original:    {result_original}")
         print(f"Optimized:   {result_optimized}")
@@ -167,13 +219,13 @@ def performance_analysis():
         
         # Test optimized implementation
         start_time = time.time()
-        result_opt = pair_sum_optimized(test_array.copy(), target)
+        result_opt = pair_sum_optimized(test_array, target)
         time_opt = time.time() - start_time
         
         # Test brute force (only for smaller sizes to avoid timeout)
         if size <= 5000:
             start_time = time.time()
-            result_brute = pair_sum_brute_force(test_array.copy(), target)
+            result_brute = pair_sum_brute_force(test_array, target)
             time_brute = time.time() - start_time
             
             print(f"Optimized:   {time_opt:.6f}s - Result: {result_opt}")
@@ -258,6 +310,25 @@ def complexity_analysis():
     print(analysis)
 
 
+def register_benchmarks(register):
+    """Benchmarks for benchmark.py: worst case, no pair sums to the target."""
+    def make_input(size, rng):
+        return [rng.randrange(10 * size) for _ in range(size)], -1
+
+    def dict_counters(name):
+        return {"dict_probes": ("contains", name), "dict_reads": ("reads", name),
+                "dict_stores": ("writes", name)}
+
+    register("pair_sum_unsorted.original", pair_sum_unsorted, make_input, [1000, 10000, 100000],
+             complexity="n", counters=dict_counters("complement"))
+    register("pair_sum_unsorted.optimized", pair_sum_optimized, make_input, [1000, 10000, 100000],
+             complexity="n", counters=dict_counters("seen"))
+    register("pair_sum_unsorted.all_pairs", pair_sum_all_pairs, make_input, [1000, 10000, 100000],
+             complexity="n", counters=dict_counters("seen"))
+    register("pair_sum_unsorted.brute_force", pair_sum_brute_force, make_input, [100, 1000],
+             complexity="n^2", counters={"pairs_checked": ("loop", "range(i + 1, len(lst))")})
+
+
 if __name__ == "__main__":
     test_implementations()
     performance_analysis()
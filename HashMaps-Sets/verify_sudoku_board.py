@@ -1,5 +1,1547 @@
+import os
+import sys
+from collections import namedtuple
+from functools import lru_cache
+from itertools import chain
+
+# Shared helpers (buffer_input) live at the repository root
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from buffer_input import has_numpy
+
+
 def verify_sudoku_board(sudoku):
-    pass
+    """
+    Check that no digit repeats in any row, column or box.
+
+    Cells hold 0 (empty) or a digit 1-9; empty cells are ignored, so partially
+    filled boards are valid as long as they have no duplicate so far. Other
+    n² x n² boards (4x4, 16x16, ... with digits 1..n²) are checked the same
+    way through find_sudoku_conflict_n.
+
+    Time Complexity: O(81) - one pass, stops at the first conflict (O(n⁴) in general)
+    Space Complexity: O(1)
+
+    Returns:
+        True if the board has no conflict (see find_sudoku_conflict for where
+        the first one is)
+    """
+    return find_sudoku_conflict(sudoku) is None
+
+
+SudokuGeometry = namedtuple('SudokuGeometry', 'n size all_digits cell_units unit_cells cell_masks')
+
+
+@lru_cache(maxsize=None)
+def sudoku_geometry(n):
+    """
+    Index tables for boards made of n x n boxes (size = n² rows, columns and
+    digits), built once per n:
+
+    - all_digits: bits 1..size set, the candidate mask of an empty unit;
+    - cell_units[i]: the (row, column, box) unit numbers of cell i, with rows
+      numbered 0..size-1, columns size..2*size-1, boxes 2*size..3*size-1;
+    - unit_cells[u]: the cells of unit u, in row-major order;
+    - cell_masks[i][d]: the bits digit d sets for cell i in a packed seen-mask
+      holding one size-bit field per unit (unit u at bits u*size..), so one
+      AND tests a cell's three units and one OR updates them.
+    """
+    size = n * n
+    cell_units = tuple((r, size + c, 2 * size + r // n * n + c // n)
+                       for r in range(size) for c in range(size))
+    unit_cells = (
+        tuple(tuple(r * size + c for c in range(size)) for r in range(size))
+        + tuple(tuple(r * size + c for r in range(size)) for c in range(size))
+        + tuple(tuple((b // n * n + i // n) * size + b % n * n + i % n for i in range(size))
+                for b in range(size))
+    )
+    cell_masks = tuple(
+        (0,) + tuple((1 << (a * size + d)) | (1 << (b * size + d)) | (1 << (c * size + d))
+                     for d in range(size))
+        for a, b, c in cell_units
+    )
+    return SudokuGeometry(n, size, ((1 << size) - 1) << 1, cell_units, unit_cells, cell_masks)
+
+
+CELL_MASKS = sudoku_geometry(3).cell_masks
+CELLS = tuple((r, c) for r in range(9) for c in range(9))
+
+
+def find_sudoku_conflict(sudoku):
+    """
+    Single pass over the 81 cells with one bitmask per row, column and box:
+    bit d of a unit's mask is set once digit d has been seen in it. The 27
+    masks are 9-bit fields of a single int (see sudoku_geometry), which saves
+    the three separate list lookups and stores per cell. Boards that do not
+    have 9 rows go to find_sudoku_conflict_n.
+
+    Time Complexity: O(81)
+    Space Complexity: O(1)
+
+    Returns:
+        (row, col) of the first cell, in row-major order, whose digit already
+        appeared in its row, column or box; None if there is no conflict
+
+    Raises:
+        ValueError: for ragged boards and digits outside 0-9
+    """
+    if len(sudoku) != 9:
+        return find_sudoku_conflict_n(sudoku)
+    if any(len(row) != 9 for row in sudoku):
+        raise ValueError("a 9x9 board must have 9 cells in every row")
+    seen = 0
+    try:
+        for digit, masks, cell in zip(chain.from_iterable(sudoku), CELL_MASKS, CELLS):
+            if digit > 0:
+                mask = masks[digit]
+                if seen & mask:
+                    return cell
+                seen |= mask
+            elif digit:
+                # masks[-1] would silently read as digit 9
+                raise IndexError
+    except IndexError:
+        raise ValueError(f"cell {cell} holds {digit!r}, expected 0-9") from None
+
+    return None
+
+
+def board_geometry(board):
+    """sudoku_geometry for a square board of side n²."""
+    from math import isqrt
+
+    n = isqrt(len(board))
+    if n * n != len(board) or any(len(row) != len(board) for row in board):
+        raise ValueError(f"a board must be n² x n², got {len(board)} rows")
+    return sudoku_geometry(n)
+
+
+def find_sudoku_conflict_n(board):
+    """
+    find_sudoku_conflict for an n² x n² board (4x4, 9x9, 16x16, 25x25, ...).
+
+    Same packed seen-mask as find_sudoku_conflict, one n²-bit field per
+    unit, with the per-cell masks from the cached sudoku_geometry tables.
+
+    Time Complexity: O(n⁴)
+    Space Complexity: O(n⁴) bits for the mask
+
+    Raises:
+        ValueError: if the board is not n² x n² or a digit is outside 0..n²
+    """
+    geometry = board_geometry(board)
+    seen = 0
+    try:
+        for i, (digit, masks) in enumerate(zip(chain.from_iterable(board), geometry.cell_masks)):
+            if digit > 0:
+                mask = masks[digit]
+                if seen & mask:
+                    return divmod(i, geometry.size)
+                seen |= mask
+            elif digit:
+                raise IndexError
+    except IndexError:
+        raise ValueError(f"cell {divmod(i, geometry.size)} holds {digit!r}, "
+                         f"expected 0-{geometry.size}") from None
+
+    return None
+
+
+def verify_sudoku_board_n(board):
+    """verify_sudoku_board for an n² x n² board."""
+    return find_sudoku_conflict_n(board) is None
+
+
+def verify_sudoku_board_sets(sudoku):
+    """
+    Naive approach for comparison: one set per row, column and box, each
+    unit checked in its own pass. Works for any n² x n² board.
+
+    Time Complexity: O(3 * n⁴)
+    Space Complexity: O(3 * n⁴)
+    """
+    size = len(sudoku)
+    n = int(size ** 0.5)
+
+    for r in range(size):
+        seen = set()
+        for c in range(size):
+            digit = sudoku[r][c]
+            if digit:
+                if digit in seen:
+                    return False
+                seen.add(digit)
+
+    for c in range(size):
+        seen = set()
+        for r in range(size):
+            digit = sudoku[r][c]
+            if digit:
+                if digit in seen:
+                    return False
+                seen.add(digit)
+
+    for box in range(size):
+        seen = set()
+        for r in range(box // n * n, box // n * n + n):
+            for c in range(box % n * n, box % n * n + n):
+                digit = sudoku[r][c]
+                if digit:
+                    if digit in seen:
+                        return False
+                    seen.add(digit)
+
+    return True
+
+
+UNIT_CELLS = sudoku_geometry(3).unit_cells
+
+
+def verify_sudoku_boards(boards, chunk_size=1 << 14):
+    """
+    find_sudoku_conflict for every board of an (N, 9, 9) uint8 array at once.
+
+    Each cell becomes the bitmask of its digit (as in find_sudoku_conflict)
+    and cells are gathered by unit (rows, columns, boxes; members of each unit
+    in row-major order). A running OR over the 9 members of every unit marks
+    each cell whose digit already occurred earlier in that unit; the smallest
+    marked cell index of a board is its first conflict. Boards are processed
+    `chunk_size` at a time, which bounds the temporaries at about 1.5 KB per
+    board.
+
+    Time Complexity: O(N * 27 * 9), vectorized
+    Space Complexity: O(chunk_size) beyond the (N,) and (N, 2) results
+
+    Returns:
+        Tuple (valid, conflicts): valid[k] is verify_sudoku_board(boards[k])
+        and conflicts[k] is find_sudoku_conflict(boards[k]) as (row, col), or
+        (-1, -1) when the board is valid. NumPy arrays of shape (N,) and
+        (N, 2); plain lists if NumPy is not installed.
+
+    Raises:
+        ValueError: for digits outside 0-9, naming the first board holding one
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        conflicts = [find_sudoku_conflict(board) for board in boards]
+        return [conflict is None for conflict in conflicts], [
+            conflict or (-1, -1) for conflict in conflicts]
+
+    boards = np.asarray(boards)
+    n = len(boards)
+    if boards.dtype != np.uint8:
+        # Check before narrowing, so -1 or 265 cannot wrap into 0-9
+        wide = boards.reshape(n, 81).T
+        _check_bulk_digits((wide < 0) | (wide > 9), wide, 0)
+        boards = boards.astype(np.uint8)
+    flat = boards.reshape(n, 81)
+    # members-major layout: members[k] is the k-th cell of all 27 units
+    members = np.array(UNIT_CELLS, dtype=np.intp).T
+    later_cells = members[1:].ravel()
+    stamp_order = np.argsort(later_cells)[::-1].tolist()
+    one = np.uint16(1)
+
+    conflicts = np.full((n, 2), -1, dtype=np.int64)
+    valid = np.ones(n, dtype=bool)
+
+    for start in range(0, n, chunk_size):
+        # Boards last, so every per-member slice below is contiguous
+        cells = np.ascontiguousarray(flat[start:start + chunk_size].T)     # (81, m)
+        # 10-15 would become extra bits below and 16 up would shift out as blanks
+        if cells.max(initial=0) > 9:
+            _check_bulk_digits(cells > 9, cells, start)
+        bits = np.left_shift(one, cells[members], dtype=np.uint16) >> 1    # (9, 27, m)
+        m = bits.shape[2]
+
+        # A cell repeats a digit if its bit is already in the OR of the unit
+        # members before it
+        seen = bits[0].copy()
+        repeated = np.empty((8, 27, m), dtype=bool)
+        for k in range(1, 9):
+            np.not_equal(bits[k] & seen, 0, out=repeated[k - 1])
+            seen |= bits[k]
+
+        # Stamp each marked cell index onto its boards, largest first, so
+        # the smallest (first in row-major order) one is left
+        first = np.full(m, 81, dtype=np.intp)
+        repeated = repeated.reshape(216, m)
+        for row in stamp_order:
+            first[repeated[row]] = later_cells[row]
+        has_conflict = first < 81
+        first = first[has_conflict]
+        valid[start:start + m] = ~has_conflict
+        conflicts[start:start + m][has_conflict] = np.stack([first // 9, first % 9], axis=1)
+
+    return valid, conflicts
+
+
+def _check_bulk_digits(bad, cells, start):
+    """Raise ValueError for the first board with a marked cell; bad and cells are (81, m)."""
+    if bad.any():
+        board = int(bad.any(axis=0).argmax())
+        cell = int(bad[:, board].argmax())
+        raise ValueError(f"board {start + board}: cell {divmod(cell, 9)} holds "
+                         f"{cells[cell, board].item()!r}, expected 0-9")
+
+
+PACKED_BOARD_BYTES = 41
+
+
+def pack_board(board):
+    """
+    Pack a board into 41 bytes: 4 bits per cell in row-major order, two cells
+    per byte (high nibble first), the last low nibble unused.
+    """
+    cells = [digit for row in board for digit in row]
+    cells.append(0)
+    return bytes((cells[i] << 4) | cells[i + 1] for i in range(0, 82, 2))
+
+
+def unpack_board(data):
+    """Inverse of pack_board: 41 bytes (bytes, memoryview, ...) to a 9x9 nested list."""
+    cells = []
+    for byte in data:
+        cells.append(byte >> 4)
+        cells.append(byte & 15)
+    return [cells[r * 9:r * 9 + 9] for r in range(9)]
+
+
+def parse_board_line(line):
+    """A board from its 81-character text form; '0' or '.' marks an empty cell."""
+    line = line.strip().replace('.', '0')
+    if len(line) != 81:
+        raise ValueError(f"expected 81 cells, got {len(line)}")
+    return [[int(ch) for ch in line[r * 9:r * 9 + 9]] for r in range(9)]
+
+
+def convert_text_boards(text_path, packed_path, batch_size=1 << 16):
+    """
+    Convert a text file of 81-character board lines to the packed format.
+
+    The text is read `batch_size` lines at a time; blank lines are skipped.
+    With NumPy each batch is packed in a few vectorized steps, otherwise board
+    by board with pack_board.
+
+    Returns:
+        Number of boards written
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    count = 0
+    with open(text_path, 'rb') as src, open(packed_path, 'wb') as dst:
+        while True:
+            lines = [line.strip() for line in src.readlines(batch_size * 82) if line.strip()]
+            if not lines:
+                break
+            for line in lines:
+                if len(line) != 81:
+                    raise ValueError(f"board {count + lines.index(line)}: "
+                                     f"expected 81 cells, got {len(line)}")
+
+            if np is None:
+                for line in lines:
+                    dst.write(pack_board(parse_board_line(line.decode('ascii'))))
+            else:
+                cells = np.frombuffer(b''.join(lines).replace(b'.', b'0'), dtype=np.uint8)
+                cells = cells.reshape(len(lines), 81) - ord('0')
+                if (cells > 9).any():
+                    raise ValueError("board text may only contain digits and '.'")
+                padded = np.zeros((len(lines), 82), dtype=np.uint8)
+                padded[:, :81] = cells
+                dst.write(((padded[:, 0::2] << 4) | padded[:, 1::2]).tobytes())
+            count += len(lines)
+
+    return count
+
+
+def open_packed_boards(path):
+    """
+    Memory-map a packed board file as an (N, 41) uint8 array (np.memmap).
+
+    Nothing is read up front; pages are loaded as slices of the array are
+    used, and slices are views into the mapping, not copies.
+    """
+    import os
+    import numpy as np
+
+    size = os.path.getsize(path)
+    if size % PACKED_BOARD_BYTES:
+        raise ValueError(f"{path}: size {size} is not a multiple of {PACKED_BOARD_BYTES} bytes")
+    if size == 0:
+        return np.zeros((0, PACKED_BOARD_BYTES), dtype=np.uint8)
+    return np.memmap(path, dtype=np.uint8, mode='r',
+                     shape=(size // PACKED_BOARD_BYTES, PACKED_BOARD_BYTES))
+
+
+def unpack_boards(packed):
+    """(N, 41) packed bytes to (N, 9, 9) uint8 boards."""
+    import numpy as np
+
+    packed = np.asarray(packed, dtype=np.uint8)
+    cells = np.empty((len(packed), 82), dtype=np.uint8)
+    np.right_shift(packed, 4, out=cells[:, 0::2])
+    np.bitwise_and(packed, 15, out=cells[:, 1::2])
+    return cells[:, :81].reshape(len(packed), 9, 9)
+
+
+def iter_packed_boards(path):
+    """
+    Yield each board of a packed file as a nested list, for verify_sudoku_board
+    and the other per-board functions. The file is memory-mapped and each
+    board is decoded straight from a memoryview slice of the mapping.
+    """
+    import mmap
+
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return
+        with mm:
+            if len(mm) % PACKED_BOARD_BYTES:
+                raise ValueError(f"{path}: size {len(mm)} is not a multiple of "
+                                 f"{PACKED_BOARD_BYTES} bytes")
+            view = memoryview(mm)
+            try:
+                for offset in range(0, len(mm), PACKED_BOARD_BYTES):
+                    yield unpack_board(view[offset:offset + PACKED_BOARD_BYTES])
+            finally:
+                view.release()
+
+
+def verify_packed_boards(path, chunk_size=1 << 14):
+    """
+    verify_sudoku_boards over a packed board file.
+
+    Chunks of `chunk_size` boards are sliced from the memory-mapped file
+    (zero-copy), unpacked and validated, so memory stays bounded by the chunk
+    size rather than the file size. Without NumPy, falls back to
+    iter_packed_boards and find_sudoku_conflict.
+
+    Returns:
+        Same (valid, conflicts) as verify_sudoku_boards
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return verify_sudoku_boards(list(iter_packed_boards(path)))
+
+    packed = open_packed_boards(path)
+    n = len(packed)
+    valid = np.empty(n, dtype=bool)
+    conflicts = np.empty((n, 2), dtype=np.int64)
+    for start in range(0, n, chunk_size):
+        chunk_valid, chunk_conflicts = verify_sudoku_boards(
+            unpack_boards(packed[start:start + chunk_size]), chunk_size)
+        valid[start:start + chunk_size] = chunk_valid
+        conflicts[start:start + chunk_size] = chunk_conflicts
+    return valid, conflicts
+
+
+def solve_sudoku(board):
+    """
+    Solve an n² x n² board (9x9, 16x16, 25x25, ...) with bitmask constraint
+    propagation and backtracking.
+
+    State is the cells plus one used-digit bitset per unit (see
+    sudoku_geometry); a cell's candidates are all_digits minus the OR of its
+    three unit masks. Propagation repeats until nothing changes:
+    - naked singles: an empty cell with one candidate gets it;
+    - hidden singles: a digit with one possible cell in a unit goes there.
+    Then the empty cell with the fewest candidates (MRV) is branched on.
+    Every placement is pushed on a trail, and a failed branch is undone by
+    popping the trail back to its mark, so the board is never copied.
+
+    Time Complexity: exponential in the worst case; a few hundred
+                     propagation passes for typical hard 9x9 puzzles
+    Space Complexity: O(n⁴)
+
+    Returns:
+        The solved board as a new nested list, or None if the board has a
+        conflict or no solution. The input is not modified.
+    """
+    if find_sudoku_conflict_n(board) is not None:
+        return None
+
+    geometry = board_geometry(board)
+    size = geometry.size
+    all_digits = geometry.all_digits
+    cell_units = geometry.cell_units
+    unit_cells = geometry.unit_cells
+    cell_range = range(size * size)
+
+    cells = [digit for row in board for digit in row]
+    used = [0] * (3 * size)
+    for i, digit in enumerate(cells):
+        if digit:
+            for u in cell_units[i]:
+                used[u] |= 1 << digit
+    trail = []
+
+    def place(i, digit):
+        bit = 1 << digit
+        a, b, c = cell_units[i]
+        used[a] |= bit
+        used[b] |= bit
+        used[c] |= bit
+        cells[i] = digit
+        trail.append(i)
+
+    def undo(mark):
+        while len(trail) > mark:
+            i = trail.pop()
+            bit = 1 << cells[i]
+            a, b, c = cell_units[i]
+            used[a] ^= bit
+            used[b] ^= bit
+            used[c] ^= bit
+            cells[i] = 0
+
+    def propagate():
+        """Apply singles to a fixpoint; (MRV cell, its candidates), (-1, 0) if solved, None if stuck."""
+        while True:
+            progress = False
+            best, best_count, best_candidates = -1, size + 1, 0
+
+            for i in cell_range:
+                if cells[i]:
+                    continue
+                a, b, c = cell_units[i]
+                candidates = all_digits & ~(used[a] | used[b] | used[c])
+                if not candidates:
+                    return None
+                if not candidates & (candidates - 1):
+                    place(i, candidates.bit_length() - 1)
+                    progress = True
+                elif candidates.bit_count() < best_count:
+                    best, best_count, best_candidates = i, candidates.bit_count(), candidates
+            if progress:
+                continue
+
+            for u, members in enumerate(unit_cells):
+                # Digits that are a candidate of at least one / two cells
+                once = twice = 0
+                for i in members:
+                    if not cells[i]:
+                        a, b, c = cell_units[i]
+                        candidates = all_digits & ~(used[a] | used[b] | used[c])
+                        twice |= once & candidates
+                        once |= candidates
+                if once | used[u] != all_digits:
+                    return None
+
+                hidden = once & ~twice
+                while hidden:
+                    bit = hidden & -hidden
+                    hidden ^= bit
+                    for i in members:
+                        if not cells[i]:
+                            a, b, c = cell_units[i]
+                            if bit & ~(used[a] | used[b] | used[c]):
+                                place(i, bit.bit_length() - 1)
+                                progress = True
+                                break
+                    else:
+                        # Its only cell was just taken by another hidden single
+                        return None
+            if not progress:
+                return best, best_candidates
+
+    def search():
+        found = propagate()
+        if found is None:
+            return False
+        i, candidates = found
+        if i < 0:
+            return True
+        while candidates:
+            bit = candidates & -candidates
+            candidates ^= bit
+            mark = len(trail)
+            place(i, bit.bit_length() - 1)
+            if search():
+                return True
+            undo(mark)
+        return False
+
+    if not search():
+        return None
+    return [cells[r * size:(r + 1) * size] for r in range(size)]
+
+
+def solve_sudoku_brute_force(board):
+    """
+    Naive backtracking for comparison: fill the first empty cell with each
+    digit not yet in its row, column or box (found by scanning them into a
+    set), no propagation.
+
+    Time Complexity: exponential
+    Space Complexity: O(n⁴)
+    """
+    if not verify_sudoku_board_sets(board):
+        return None
+
+    size = len(board)
+    n = int(size ** 0.5)
+    grid = [row.copy() for row in board]
+    empty = [(r, c) for r in range(size) for c in range(size) if not grid[r][c]]
+
+    def search(k):
+        if k == len(empty):
+            return True
+        r, c = empty[k]
+        taken = set(grid[r])
+        taken.update(grid[i][c] for i in range(size))
+        r0, c0 = r // n * n, c // n * n
+        taken.update(grid[i][j] for i in range(r0, r0 + n) for j in range(c0, c0 + n))
+        for digit in range(1, size + 1):
+            if digit not in taken:
+                grid[r][c] = digit
+                if search(k + 1):
+                    return True
+        grid[r][c] = 0
+        return False
+
+    return grid if search(0) else None
+
+
+def solve_packed_boards(path, workers=1, chunk_boards=256):
+    """
+    solve_sudoku for every board of a packed board file.
+
+    The file is split into ranges of `chunk_boards` boards. With workers > 1
+    the ranges go to a process pool; each worker reads its own range from the
+    file and sends back the solutions packed (41 bytes per board), so only
+    file offsets and packed bytes cross process boundaries.
+
+    Returns:
+        List of solved boards (nested lists, None where unsolvable) in file order
+    """
+    import os
+
+    size = os.path.getsize(path)
+    if size % PACKED_BOARD_BYTES:
+        raise ValueError(f"{path}: size {size} is not a multiple of {PACKED_BOARD_BYTES} bytes")
+    n = size // PACKED_BOARD_BYTES
+    starts = range(0, n, chunk_boards)
+    stops = [min(start + chunk_boards, n) for start in starts]
+    paths = [path] * len(starts)
+
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            packed = list(pool.map(_solve_packed_range, paths, starts, stops))
+    else:
+        packed = list(map(_solve_packed_range, paths, starts, stops))
+
+    empty = bytes(PACKED_BOARD_BYTES)
+    solutions = []
+    for data in packed:
+        for offset in range(0, len(data), PACKED_BOARD_BYTES):
+            board = data[offset:offset + PACKED_BOARD_BYTES]
+            solutions.append(None if board == empty else unpack_board(board))
+    return solutions
+
+
+def _solve_packed_range(path, start, stop):
+    """Solve boards [start, stop) of a packed file; solutions packed, all-zero bytes if unsolvable."""
+    with open(path, 'rb') as f:
+        f.seek(start * PACKED_BOARD_BYTES)
+        data = memoryview(f.read((stop - start) * PACKED_BOARD_BYTES))
+
+    empty = bytes(PACKED_BOARD_BYTES)
+    out = []
+    for offset in range(0, len(data), PACKED_BOARD_BYTES):
+        solution = solve_sudoku(unpack_board(data[offset:offset + PACKED_BOARD_BYTES]))
+        out.append(empty if solution is None else pack_board(solution))
+    return b''.join(out)
+
+
+class SudokuBoard:
+    """
+    Mutable n² x n² board that stays validated as digits are placed and
+    cleared one at a time.
+
+    Per unit it keeps an occupancy bitmask (bit d set while digit d is in the
+    unit) and per (unit, digit) a count, plus a running total of conflicts:
+    the number of digit placements beyond the first in each unit. A move only
+    touches the three units of its cell, so every operation is O(1).
+
+    Time Complexity: O(1) place / clear / can_place / is_valid / undo
+    Space Complexity: O(n⁴) for the cells and counts
+
+    Usage:
+        board = SudokuBoard(sudoku_board)
+        board.place(0, 2, 4)
+        board.is_valid()                # == verify_sudoku_board_n(board.to_list())
+        board.undo()
+    """
+
+    def __init__(self, board=None, n=3):
+        if board is not None:
+            self._geometry = board_geometry(board)
+        else:
+            self._geometry = sudoku_geometry(n)
+        size = self._geometry.size
+        self._cells = [0] * (size * size)
+        self._used = [0] * (3 * size)
+        self._counts = [0] * (3 * size * (size + 1))
+        self._conflicts = 0
+        self._history = []
+
+        if board is not None:
+            for i, digit in enumerate(chain.from_iterable(board)):
+                if digit:
+                    self._check_digit(digit)
+                    self._set(i, digit)
+
+    @property
+    def size(self):
+        return self._geometry.size
+
+    @property
+    def conflicts(self):
+        """Digit placements beyond the first in each row, column and box."""
+        return self._conflicts
+
+    def __getitem__(self, cell):
+        r, c = cell
+        return self._cells[self._index(r, c)]
+
+    def is_valid(self):
+        """True if no digit repeats in any unit."""
+        return self._conflicts == 0
+
+    def can_place(self, r, c, digit):
+        """True if `digit` is not yet in the row, column or box of (r, c), ignoring (r, c) itself."""
+        size = self._geometry.size
+        if not (0 <= r < size and 0 <= c < size and 0 <= digit <= size):
+            self._index(r, c)
+            self._check_digit(digit)
+        i = r * size + c
+        units = self._geometry.cell_units[i]
+        used = self._used
+        if not (used[units[0]] | used[units[1]] | used[units[2]]) & (1 << digit):
+            return True
+        if self._cells[i] != digit:
+            return False
+        # The cell's own digit is in all three masks; it only blocks if repeated
+        stride = self._geometry.size + 1
+        return all(self._counts[u * stride + digit] == 1 for u in units)
+
+    def place(self, r, c, digit):
+        """Put `digit` at (r, c), replacing what was there; 0 clears the cell."""
+        size = self._geometry.size
+        # One combined test on the hot path; the helpers raise the specific error
+        if not (0 <= r < size and 0 <= c < size and 0 <= digit <= size):
+            self._index(r, c)
+            self._check_digit(digit)
+        i = r * size + c
+        self._history.append((i, self._cells[i]))
+        self._set(i, digit)
+
+    def clear(self, r, c):
+        """Empty cell (r, c)."""
+        self.place(r, c, 0)
+
+    def undo(self):
+        """Revert the last place or clear; IndexError if there is nothing to undo."""
+        i, digit = self._history.pop()
+        self._set(i, digit)
+
+    def to_list(self):
+        size = self._geometry.size
+        return [self._cells[r * size:(r + 1) * size] for r in range(size)]
+
+    def _index(self, r, c):
+        """Flat index of (r, c); ValueError off the board (r * size + c would wrap into another cell)."""
+        size = self._geometry.size
+        if not (0 <= r < size and 0 <= c < size):
+            raise ValueError(f"cell ({r}, {c}) is outside the {size}x{size} board")
+        return r * size + c
+
+    def _check_digit(self, digit):
+        size = self._geometry.size
+        if not 0 <= digit <= size:
+            raise ValueError(f"digit must be between 0 and {size}, got {digit}")
+
+    def _set(self, i, digit):
+        counts = self._counts
+        used = self._used
+        stride = self._geometry.size + 1
+        conflicts = self._conflicts
+
+        old = self._cells[i]
+        if old:
+            bit = 1 << old
+            for u in self._geometry.cell_units[i]:
+                k = u * stride + old
+                counts[k] -= 1
+                if counts[k]:
+                    conflicts -= 1
+                else:
+                    used[u] ^= bit
+        if digit:
+            bit = 1 << digit
+            for u in self._geometry.cell_units[i]:
+                k = u * stride + digit
+                if counts[k]:
+                    conflicts += 1
+                else:
+                    used[u] |= bit
+                counts[k] += 1
+
+        self._cells[i] = digit
+        self._conflicts = conflicts
+
+
+SOLVED_BOARD = [
+    [5, 3, 4, 6, 7, 8, 9, 1, 2],
+    [6, 7, 2, 1, 9, 5, 3, 4, 8],
+    [1, 9, 8, 3, 4, 2, 5, 6, 7],
+    [8, 5, 9, 7, 6, 1, 4, 2, 3],
+    [4, 2, 6, 8, 5, 3, 7, 9, 1],
+    [7, 1, 3, 9, 2, 4, 8, 5, 6],
+    [9, 6, 1, 5, 3, 7, 2, 8, 4],
+    [2, 8, 7, 4, 1, 9, 6, 3, 5],
+    [3, 4, 5, 2, 8, 6, 1, 7, 9],
+]
+
+
+HARD_PUZZLES = [
+    "1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..",
+    "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..",
+    "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+    "52...6.........7.13...........4..8..6......5...........418.........3..2...87.....",
+]
+
+
+def _with_cell(board, r, c, digit):
+    board = [row.copy() for row in board]
+    board[r][c] = digit
+    return board
+
+
+def test_implementations():
+    """Test the bitmask and set-based validators on valid and conflicting boards."""
+    empty = [[0] * 9 for _ in range(9)]
+    test_cases = [
+        (SOLVED_BOARD, None, "Solved board"),
+        (empty, None, "Empty board"),
+        (_with_cell(empty, 4, 4, 7), None, "Single digit"),
+        (_with_cell(SOLVED_BOARD, 0, 8, 5), (0, 8), "Row conflict"),
+        (_with_cell(_with_cell(empty, 1, 3, 6), 7, 3, 6), (7, 3), "Column conflict"),
+        (_with_cell(_with_cell(empty, 3, 3, 2), 5, 5, 2), (5, 5), "Box conflict"),
+        (_with_cell(_with_cell(empty, 8, 0, 9), 8, 8, 9), (8, 8), "Last row conflict"),
+    ]
+
+    print("Testing Sudoku Board Validators")
+    print("=" * 60)
+
+    for board, expected, description in test_cases:
+        conflict = find_sudoku_conflict(board)
+        valid = verify_sudoku_board(board)
+        valid_sets = verify_sudoku_board_sets(board)
+        correct = conflict == expected and valid == valid_sets == (expected is None)
+        status = "✅" if correct else "❌"
+        print(f"{status} {description:20}: valid={valid}, conflict={conflict}, "
+              f"sets={valid_sets}")
+
+
+def _random_boards(count, blank_fraction=0.5, conflict_fraction=0.5, seed=None):
+    """(count, 9, 9) uint8 boards: relabelled SOLVED_BOARD, cells blanked, some with one bad cell."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    labels = np.argsort(rng.random((count, 9)), axis=1).astype(np.uint8) + 1
+    labels = np.concatenate([np.zeros((count, 1), dtype=np.uint8), labels], axis=1)
+    boards = np.take_along_axis(labels, np.array(SOLVED_BOARD, dtype=np.uint8).reshape(1, 81), axis=1)
+    boards[rng.random((count, 81)) < blank_fraction] = 0
+
+    bad = np.flatnonzero(rng.random(count) < conflict_fraction)
+    boards[bad, rng.integers(0, 81, len(bad))] = rng.integers(1, 10, len(bad))
+    return boards.reshape(count, 9, 9)
+
+
+def test_bulk_implementation():
+    """Check verify_sudoku_boards against find_sudoku_conflict board by board."""
+    print("\n" + "=" * 60)
+    print("BULK VALIDATION")
+    print("=" * 60)
+
+    try:
+        import numpy as np  # noqa: F401
+    except ImportError:
+        print("Skipped (NumPy not installed)")
+        return
+
+    boards = _random_boards(3000, blank_fraction=0.3, seed=1)
+    expected = [find_sudoku_conflict(board) for board in boards.tolist()]
+    mismatches = 0
+    for chunk_size in (1, 7, 1 << 14):
+        valid, conflicts = verify_sudoku_boards(boards, chunk_size)
+        got = [None if ok else tuple(cell) for ok, cell in zip(valid.tolist(), conflicts.tolist())]
+        mismatches += sum(a != b for a, b in zip(got, expected))
+    invalid = sum(conflict is not None for conflict in expected)
+    print(f"{len(boards)} boards ({invalid} invalid) x 3 chunk sizes: {mismatches} mismatches")
+
+    # Out-of-range digits raise like find_sudoku_conflict instead of reading as bits or blanks
+    for digit, dtype in [(12, np.uint8), (16, np.uint8), (-1, np.int64), (265, np.int64)]:
+        bad = boards[:40].astype(dtype)
+        bad[37, 4, 6] = digit
+        try:
+            verify_sudoku_boards(bad, chunk_size=16)
+            message = "accepted"
+        except ValueError as error:
+            message = str(error)
+        expected_message = f"board 37: cell (4, 6) holds {digit}, expected 0-9"
+        print(f"{'✅' if message == expected_message else '❌'} Digit {digit} ({np.dtype(dtype)}): "
+              f"{message}")
+
+
+def bulk_performance_comparison():
+    """Compare verify_sudoku_boards with a Python loop of find_sudoku_conflict, in boards/second."""
+    import time
+
+    print("\n" + "=" * 60)
+    print("BULK VALIDATION PERFORMANCE")
+    print("=" * 60)
+
+    try:
+        import numpy as np  # noqa: F401
+    except ImportError:
+        print("Skipped (NumPy not installed)")
+        return
+
+    for count in [10000, 100000, 1000000]:
+        boards = _random_boards(count, seed=count)
+
+        start_time = time.perf_counter()
+        valid, conflicts = verify_sudoku_boards(boards)
+        bulk_time = time.perf_counter() - start_time
+
+        # The per-board loop is timed on a sample
+        sample = boards[:10000].tolist()
+        start_time = time.perf_counter()
+        expected = [find_sudoku_conflict(board) for board in sample]
+        loop_time = (time.perf_counter() - start_time) / len(sample) * count
+
+        match = all((ok and cell is None) or (not ok and tuple(got) == cell)
+                    for ok, got, cell in zip(valid.tolist(), conflicts.tolist(), expected))
+
+        print(f"\nBoards: {count:,} ({int((~valid).sum()):,} invalid)")
+        print("-" * 40)
+        print(f"{'Python loop':20}: {count / loop_time:12,.0f} boards/s")
+        print(f"{'NumPy bulk':20}: {count / bulk_time:12,.0f} boards/s")
+        print(f"Speedup: {loop_time/bulk_time:.1f}x | Match: {match}")
+
+
+def test_packed_format():
+    """Round-trip boards through the text and packed formats."""
+    import os
+    import random
+    import tempfile
+
+    print("\n" + "=" * 60)
+    print("PACKED BOARD FORMAT")
+    print("=" * 60)
+
+    boards = [SOLVED_BOARD, [[0] * 9 for _ in range(9)]]
+    boards += [[[random.randint(0, 9) for _ in range(9)] for _ in range(9)] for _ in range(200)]
+
+    packed = [pack_board(board) for board in boards]
+    round_trip = all(len(data) == PACKED_BOARD_BYTES and unpack_board(data) == board
+                     for data, board in zip(packed, boards))
+    print(f"{'✅' if round_trip else '❌'} pack_board/unpack_board round trip ({len(boards)} boards)")
+
+    text_line = ''.join(str(d) for row in SOLVED_BOARD for d in row).replace('5', '.')
+    parsed = parse_board_line(text_line)
+    expected = [[0 if d == 5 else d for d in row] for row in SOLVED_BOARD]
+    print(f"{'✅' if parsed == expected else '❌'} parse_board_line with '.' for empty cells")
+
+    tmp = tempfile.mkdtemp()
+    text_path = os.path.join(tmp, "boards.txt")
+    packed_path = os.path.join(tmp, "boards.bin")
+    try:
+        with open(text_path, 'w') as f:
+            for board in boards:
+                f.write(''.join(str(d) for row in board for d in row) + "\n")
+
+        for batch_size in (1, 7, 1 << 16):
+            count = convert_text_boards(text_path, packed_path, batch_size)
+            with open(packed_path, 'rb') as f:
+                data = f.read()
+            ok = count == len(boards) and data == b''.join(packed)
+            print(f"{'✅' if ok else '❌'} convert_text_boards(batch_size={batch_size}): "
+                  f"{count} boards, {len(data)} bytes")
+
+        ok = list(iter_packed_boards(packed_path)) == boards
+        print(f"{'✅' if ok else '❌'} iter_packed_boards matches the source boards")
+
+        expected = [find_sudoku_conflict(board) for board in boards]
+        valid, conflicts = verify_packed_boards(packed_path, chunk_size=16)
+        got = [None if ok else tuple(int(x) for x in cell) for ok, cell in zip(valid, conflicts)]
+        print(f"{'✅' if got == expected else '❌'} verify_packed_boards matches find_sudoku_conflict")
+    finally:
+        for path in (text_path, packed_path):
+            if os.path.exists(path):
+                os.remove(path)
+        os.rmdir(tmp)
+
+
+def packed_performance_comparison():
+    """Compare loading boards from the packed file with parsing the 81-character text."""
+    import os
+    import time
+    import tempfile
+
+    print("\n" + "=" * 60)
+    print("PACKED FORMAT LOAD PERFORMANCE")
+    print("=" * 60)
+
+    try:
+        import numpy as np
+    except ImportError:
+        print("Skipped (NumPy not installed)")
+        return
+
+    for count in [100000, 1000000]:
+        boards = _random_boards(count, seed=count)
+        tmp = tempfile.mkdtemp()
+        text_path = os.path.join(tmp, "boards.txt")
+        packed_path = os.path.join(tmp, "boards.bin")
+        try:
+            lines = (boards.reshape(count, 81) + ord('0')).astype(np.uint8)
+            lines = np.concatenate([lines, np.full((count, 1), ord('\n'), dtype=np.uint8)], axis=1)
+            lines.tofile(text_path)
+
+            start_time = time.perf_counter()
+            convert_text_boards(text_path, packed_path)
+            convert_time = time.perf_counter() - start_time
+
+            # Text -> nested lists, the input verify_sudoku_board takes; timed
+            # on a sample, as it runs at only ~25k boards/s
+            sample = 20000
+            start_time = time.perf_counter()
+            with open(text_path) as f:
+                parsed = [parse_board_line(line) for _, line in zip(range(sample), f)]
+            text_time = (time.perf_counter() - start_time) / sample * count
+
+            # Text -> (N, 9, 9) array, the cheapest way to get boards out of text
+            start_time = time.perf_counter()
+            with open(text_path, 'rb') as f:
+                text_array = (np.frombuffer(f.read(), dtype=np.uint8).reshape(count, 82)[:, :81]
+                              - ord('0')).reshape(count, 9, 9)
+            text_numpy_time = time.perf_counter() - start_time
+
+            # Packed -> (N, 9, 9) array via the memory mapping
+            start_time = time.perf_counter()
+            packed_array = unpack_boards(open_packed_boards(packed_path))
+            packed_time = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            valid, _ = verify_packed_boards(packed_path)
+            verify_time = time.perf_counter() - start_time
+
+            match = (np.array_equal(text_array, packed_array)
+                     and np.array_equal(packed_array[:1000], np.array(parsed[:1000], dtype=np.uint8)))
+
+            print(f"\nBoards: {count:,}")
+            print("-" * 40)
+            print(f"{'Text size':28}: {os.path.getsize(text_path) / count:5.1f} bytes/board")
+            print(f"{'Packed size':28}: {os.path.getsize(packed_path) / count:5.1f} bytes/board")
+            print(f"{'Convert text -> packed':28}: {convert_time*1000:9.2f} ms")
+            print(f"{'Parse text -> nested lists':28}: {text_time*1000:9.2f} ms (extrapolated)")
+            print(f"{'Parse text -> NumPy':28}: {text_numpy_time*1000:9.2f} ms")
+            print(f"{'Load packed (mmap) -> NumPy':28}: {packed_time*1000:9.2f} ms")
+            print(f"{'Load + validate packed':28}: {verify_time*1000:9.2f} ms "
+                  f"({count / verify_time:,.0f} boards/s, {int(valid.sum()):,} valid)")
+            print(f"Load speedup vs nested lists: {text_time/packed_time:.1f}x | Match: {match}")
+        finally:
+            for path in (text_path, packed_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            os.rmdir(tmp)
+
+
+def _shuffled_board(board, rng):
+    """An equivalent board: digits relabelled, rows/columns permuted within and across bands, maybe transposed."""
+    size = len(board)
+    n = int(size ** 0.5)
+    labels = [0] + rng.sample(range(1, size + 1), size)
+
+    def order():
+        bands = rng.sample(range(n), n)
+        return [band * n + i for band in bands for i in rng.sample(range(n), n)]
+
+    rows, cols = order(), order()
+    board = [[labels[board[r][c]] for c in cols] for r in rows]
+    if rng.random() < 0.5:
+        board = [list(col) for col in zip(*board)]
+    return board
+
+
+def _solved_board(n):
+    """A solved n² x n² board from the standard shifted-rows pattern."""
+    size = n * n
+    return [[(n * (r % n) + r // n + c) % size + 1 for c in range(size)] for r in range(size)]
+
+
+def _puzzle(n, blank_fraction, rng):
+    """A shuffled solved board with `blank_fraction` of its cells emptied."""
+    board = _shuffled_board(_solved_board(n), rng)
+    size = len(board)
+    for cell in rng.sample(range(size * size), int(blank_fraction * size * size)):
+        board[cell // size][cell % size] = 0
+    return board
+
+
+def _is_solution(solution, board):
+    return (solution is not None
+            and all(digit for row in solution for digit in row)
+            and verify_sudoku_board_n(solution)
+            and all(board[r][c] in (0, solution[r][c])
+                    for r in range(len(board)) for c in range(len(board))))
+
+
+def test_solver():
+    """Check solve_sudoku on easy, hard, unsolvable and conflicting boards, and the packed batch mode."""
+    import os
+    import random
+    import tempfile
+
+    print("\n" + "=" * 60)
+    print("SOLVER")
+    print("=" * 60)
+
+    example = [[0 if (r * 9 + c) % 2 else SOLVED_BOARD[r][c] for c in range(9)] for r in range(9)]
+    dead_end = [[0] * 9 for _ in range(9)]
+    dead_end[0][:8] = [1, 2, 3, 4, 5, 6, 7, 8]
+    dead_end[1][8] = 9                      # conflict-free, but (0, 8) has no candidate
+
+    test_cases = [
+        (example, True, "Half-filled board"),
+        ([[0] * 9 for _ in range(9)], True, "Empty board"),
+    ]
+    test_cases += [(parse_board_line(puzzle), True, f"Hard puzzle {k + 1}")
+                   for k, puzzle in enumerate(HARD_PUZZLES)]
+    test_cases += [
+        (dead_end, False, "No solution"),
+        (_with_cell(example, 0, 1, 5), False, "Conflicting givens"),
+    ]
+
+    for board, solvable, description in test_cases:
+        original = [row.copy() for row in board]
+        solution = solve_sudoku(board)
+        correct = (_is_solution(solution, board) if solvable else solution is None) and board == original
+        status = "✅" if correct else "❌"
+        print(f"{status} {description:20}: {'solved' if solution else 'no solution'}")
+
+    rng = random.Random(7)
+    boards = [_shuffled_board(board, rng) for board, _, _ in test_cases for _ in range(3)]
+    fd, path = tempfile.mkstemp(suffix=".bin")
+    os.close(fd)
+    try:
+        with open(path, 'wb') as f:
+            f.write(b''.join(pack_board(board) for board in boards))
+        expected = [solve_sudoku(board) is not None for board in boards]
+        for workers in (1, 2):
+            solutions = solve_packed_boards(path, workers=workers, chunk_boards=4)
+            correct = len(solutions) == len(boards) and all(
+                _is_solution(solution, board) if ok else solution is None
+                for solution, board, ok in zip(solutions, boards, expected))
+            print(f"{'✅' if correct else '❌'} solve_packed_boards(workers={workers}): "
+                  f"{len(boards)} shuffled boards")
+    finally:
+        os.remove(path)
+
+
+def solver_performance_comparison():
+    """Boards/second of solve_sudoku on easy and hard sets, in one process and on a process pool."""
+    import os
+    import time
+    import random
+    import tempfile
+
+    print("\n" + "=" * 60)
+    print("SOLVER PERFORMANCE")
+    print("=" * 60)
+
+    rng = random.Random(42)
+    easy = []
+    for _ in range(2000):
+        board = _shuffled_board(SOLVED_BOARD, rng)
+        for cell in rng.sample(range(81), 50):
+            board[cell // 9][cell % 9] = 0
+        easy.append(board)
+    hard = [_shuffled_board(parse_board_line(rng.choice(HARD_PUZZLES)), rng) for _ in range(200)]
+
+    print(f"CPUs available: {os.cpu_count()}")
+    for label, boards in [("Easy (31 givens)", easy), ("Hard (HARD_PUZZLES)", hard)]:
+        fd, path = tempfile.mkstemp(suffix=".bin")
+        os.close(fd)
+        try:
+            with open(path, 'wb') as f:
+                f.write(b''.join(pack_board(board) for board in boards))
+
+            print(f"\n{label}: {len(boards)} boards")
+            print("-" * 40)
+
+            start_time = time.perf_counter()
+            solved = sum(solve_sudoku(board) is not None for board in boards)
+            elapsed = time.perf_counter() - start_time
+            print(f"{'In-process loop':20}: {len(boards) / elapsed:10,.0f} boards/s ({solved} solved)")
+
+            for workers in (1, 8):
+                start_time = time.perf_counter()
+                solutions = solve_packed_boards(path, workers=workers, chunk_boards=32)
+                elapsed = time.perf_counter() - start_time
+                solved = sum(solution is not None for solution in solutions)
+                print(f"{f'Packed, {workers} worker(s)':20}: {len(boards) / elapsed:10,.0f} boards/s "
+                      f"({solved} solved)")
+        finally:
+            os.remove(path)
+
+
+def test_general_sizes():
+    """Check the n² x n² validator and solver on 4x4, 9x9, 16x16 and 25x25 boards."""
+    import random
+
+    print("\n" + "=" * 60)
+    print("GENERAL n² x n² BOARDS")
+    print("=" * 60)
+
+    rng = random.Random(3)
+    for n in (2, 3, 4, 5):
+        size = n * n
+        solved = _shuffled_board(_solved_board(n), rng)
+        conflicting = [row.copy() for row in solved]
+        conflicting[size - 1][size - 1] = conflicting[size - 1][0]
+
+        checks = [
+            verify_sudoku_board_n(solved) and verify_sudoku_board_sets(solved),
+            find_sudoku_conflict_n(conflicting) == (size - 1, size - 1),
+            not verify_sudoku_board_sets(conflicting),
+        ]
+        if n == 3:
+            boards = _random_boards(200, seed=5).tolist() if has_numpy() else []
+            checks.append(all(find_sudoku_conflict_n(board) == find_sudoku_conflict(board)
+                              for board in boards))
+
+        puzzles = [_puzzle(n, 0.45, rng) for _ in range(5)]
+        checks += [_is_solution(solve_sudoku(puzzle), puzzle) for puzzle in puzzles]
+        if n <= 3:
+            checks += [_is_solution(solve_sudoku_brute_force(puzzle), puzzle) for puzzle in puzzles]
+
+        # The public entry points take any size, not only 9x9
+        sparse = [[0] * size for _ in range(size)]
+        sparse[size - 1][0] = sparse[size - 1][size - 1] = size
+        checks += [
+            verify_sudoku_board(solved),
+            find_sudoku_conflict(conflicting) == (size - 1, size - 1),
+            find_sudoku_conflict(sparse) == (size - 1, size - 1) and not verify_sudoku_board(sparse),
+        ]
+
+        status = "✅" if all(checks) else "❌"
+        print(f"{status} n = {n} ({size}x{size}): {sum(checks)}/{len(checks)} checks passed")
+
+    try:
+        find_sudoku_conflict_n([[0] * 5 for _ in range(5)])
+        print("❌ 5x5 board accepted")
+    except ValueError:
+        print("✅ 5x5 board rejected (side is not a square)")
+
+    # Malformed boards raise instead of giving a plausible answer
+    short_row = [row.copy() for row in SOLVED_BOARD]
+    short_row[4] = short_row[4][:8]
+    bad_boards = [short_row, [row + [0] for row in SOLVED_BOARD]]
+    for n, digit in ((3, -1), (3, 10), (2, -2), (2, 5)):
+        board = [[0] * (n * n) for _ in range(n * n)]
+        board[1][1] = digit
+        bad_boards.append(board)
+    rejected = 0
+    for board in bad_boards:
+        try:
+            find_sudoku_conflict(board)
+        except ValueError:
+            rejected += 1
+    print(f"{'✅' if rejected == len(bad_boards) else '❌'} {rejected}/{len(bad_boards)} "
+          f"ragged boards and out-of-range digits rejected")
+
+
+def general_size_performance_comparison():
+    """Validation and solving across box sizes n = 3, 4, 5: bitsets vs sets / naive search."""
+    import time
+    import random
+
+    print("\n" + "=" * 60)
+    print("GENERAL SIZE PERFORMANCE MATRIX")
+    print("=" * 60)
+
+    rng = random.Random(11)
+    print(f"{'n':>2} {'board':>6} | {'validate bitset':>16} {'validate sets':>14} | "
+          f"{'solve bitset':>13} {'solve naive':>12}")
+    print("-" * 75)
+
+    for n in (3, 4, 5):
+        size = n * n
+        solved = [_shuffled_board(_solved_board(n), rng) for _ in range(20)]
+        iterations = max(1, 2000 // (size * size // 81))
+
+        timings = []
+        for func in (verify_sudoku_board_n, verify_sudoku_board_sets):
+            start_time = time.perf_counter()
+            for _ in range(iterations // len(solved) + 1):
+                for board in solved:
+                    func(board)
+            count = (iterations // len(solved) + 1) * len(solved)
+            timings.append((time.perf_counter() - start_time) / count)
+
+        # 45% of the cells blanked. Random 25x25 puzzles turn heavy-tailed
+        # from about 50% blanks: most still solve in milliseconds, but some
+        # take minutes, and those would dominate the mean
+        puzzles = [_puzzle(n, 0.45, rng) for _ in range(20)]
+        start_time = time.perf_counter()
+        solved_ok = all(_is_solution(solve_sudoku(puzzle), puzzle) for puzzle in puzzles)
+        solve_time = (time.perf_counter() - start_time) / len(puzzles)
+
+        # Naive search did not finish a single 25x25 puzzle within minutes
+        naive = "skipped"
+        if n <= 4:
+            start_time = time.perf_counter()
+            naive_ok = all(_is_solution(solve_sudoku_brute_force(puzzle), puzzle) for puzzle in puzzles)
+            naive = f"{(time.perf_counter() - start_time) / len(puzzles) * 1000:9.2f} ms"
+            solved_ok = solved_ok and naive_ok
+
+        print(f"{n:>2} {f'{size}x{size}':>6} | {timings[0]*1e6:13.1f} μs {timings[1]*1e6:11.1f} μs | "
+              f"{solve_time*1000:10.2f} ms {naive:>12} {'✅' if solved_ok else '❌'}")
+
+
+def test_incremental_board():
+    """Check SudokuBoard against full revalidation over random place/clear/undo sequences."""
+    import random
+
+    print("\n" + "=" * 60)
+    print("INCREMENTAL BOARD")
+    print("=" * 60)
+
+    def count_conflicts(board):
+        size = len(board)
+        geometry = sudoku_geometry(int(size ** 0.5))
+        cells = [digit for row in board for digit in row]
+        total = 0
+        for members in geometry.unit_cells:
+            digits = [cells[i] for i in members if cells[i]]
+            total += len(digits) - len(set(digits))
+        return total
+
+    rng = random.Random(9)
+    mismatches = checks = 0
+    for n in (2, 3, 4):
+        size = n * n
+        for _ in range(20):
+            start = _puzzle(n, 0.6, rng)
+            board = SudokuBoard(start)
+            snapshots = [board.to_list()]
+            for _ in range(200):
+                action = rng.random()
+                if action < 0.2 and len(snapshots) > 1:
+                    board.undo()
+                    snapshots.pop()
+                else:
+                    r, c = rng.randrange(size), rng.randrange(size)
+                    digit = 0 if action < 0.4 else rng.randint(1, size)
+                    if board.is_valid() and digit:
+                        moved = board.to_list()
+                        moved[r][c] = digit
+                        checks += 1
+                        if board.can_place(r, c, digit) != verify_sudoku_board_n(moved):
+                            mismatches += 1
+                    board.place(r, c, digit)
+                    snapshots.append(board.to_list())
+
+                current = board.to_list()
+                checks += 1
+                if (current != snapshots[-1]
+                        or board.is_valid() != verify_sudoku_board_n(current)
+                        or board.conflicts != count_conflicts(current)):
+                    mismatches += 1
+
+    print(f"Randomized place/clear/undo checks ({checks}): {mismatches} mismatches")
+
+    board = SudokuBoard(SOLVED_BOARD)
+    board.place(0, 0, 3)
+    print(f"{'✅' if not board.is_valid() and board.conflicts == 3 else '❌'} "
+          f"Overwriting (0, 0) with 3 on the solved board: {board.conflicts} conflicts")
+    board.undo()
+    print(f"{'✅' if board.is_valid() and board.to_list() == SOLVED_BOARD else '❌'} "
+          f"Undo restores the solved board")
+
+    # Off-board cells and bad digits raise instead of landing in another cell
+    bad_calls = [lambda: board.place(0, 20, 5), lambda: board.place(-1, 0, 7),
+                 lambda: board.place(0, 0, 10), lambda: board.place(0, 0, -1),
+                 lambda: board.clear(9, 0), lambda: board.can_place(0, 9, 1),
+                 lambda: board.can_place(0, 0, 10), lambda: board[0, -1],
+                 lambda: SudokuBoard([[10] + row[1:] for row in SOLVED_BOARD])]
+    rejected = 0
+    for call in bad_calls:
+        try:
+            call()
+        except ValueError:
+            rejected += 1
+    intact = board.to_list() == SOLVED_BOARD and board.is_valid()
+    print(f"{'✅' if rejected == len(bad_calls) and intact else '❌'} "
+          f"{rejected}/{len(bad_calls)} out-of-range cells and digits rejected, board unchanged")
+
+
+def incremental_performance_comparison():
+    """Time random place/clear operations on SudokuBoard against full revalidation after each move."""
+    import time
+    import random
+
+    print("\n" + "=" * 60)
+    print("INCREMENTAL BOARD PERFORMANCE")
+    print("=" * 60)
+
+    rng = random.Random(1)
+    operations = 1000000
+    moves = [(rng.randrange(9), rng.randrange(9), rng.randint(0, 9)) for _ in range(operations)]
+    start = [[0 if rng.random() < 0.5 else digit for digit in row] for row in SOLVED_BOARD]
+
+    def incremental(moves, keep_valid):
+        board = SudokuBoard(start)
+        valid = 0
+        for r, c, digit in moves:
+            board.place(r, c, digit)
+            if board.is_valid():
+                valid += 1
+            elif keep_valid:
+                board.undo()
+        return valid
+
+    def full(moves, keep_valid):
+        grid = [row.copy() for row in start]
+        valid = 0
+        for r, c, digit in moves:
+            previous = grid[r][c]
+            grid[r][c] = digit
+            if verify_sudoku_board(grid):
+                valid += 1
+            elif keep_valid:
+                grid[r][c] = previous
+        return valid
+
+    # Full revalidation is timed on a sample of the same moves
+    sample = 50000
+    workloads = [
+        ("Random moves (board soon invalid, validation exits early)", False),
+        ("Search-style: place, check, undo if invalid", True),
+    ]
+    for label, keep_valid in workloads:
+        start_time = time.perf_counter()
+        incremental(moves, keep_valid)
+        incremental_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        valid_full = full(moves[:sample], keep_valid)
+        full_time = (time.perf_counter() - start_time) / sample * operations
+
+        match = incremental(moves[:sample], keep_valid) == valid_full
+
+        print(f"\n{label}: {operations:,} operations")
+        print("-" * 40)
+        print(f"{'SudokuBoard (O(1))':24}: {incremental_time*1000:10.2f} ms "
+              f"({operations / incremental_time:,.0f} ops/s)")
+        print(f"{'verify_sudoku_board':24}: {full_time*1000:10.2f} ms "
+              f"({operations / full_time:,.0f} ops/s, extrapolated)")
+        print(f"Speedup: {full_time/incremental_time:.1f}x | Match on sample: {match}")
+
+
+def performance_comparison():
+    """Compare the single-pass bitmask validator with the set-per-unit one."""
+    import time
+
+    print("\n" + "=" * 60)
+    print("PERFORMANCE COMPARISON")
+    print("=" * 60)
+
+    boards = [
+        ("Solved (valid)", SOLVED_BOARD),
+        ("Example (valid)", [
+            [5, 3, 0, 0, 7, 0, 0, 0, 0],
+            [6, 0, 0, 1, 9, 5, 0, 0, 0],
+            [0, 9, 8, 0, 0, 0, 0, 6, 0],
+            [8, 0, 0, 0, 6, 0, 0, 0, 3],
+            [4, 0, 0, 8, 0, 3, 0, 0, 1],
+            [7, 0, 0, 0, 2, 0, 0, 0, 6],
+            [0, 6, 0, 0, 0, 0, 2, 8, 0],
+            [0, 0, 0, 4, 1, 9, 0, 0, 5],
+            [0, 0, 0, 0, 8, 0, 0, 7, 9],
+        ]),
+        ("Late conflict at (8, 8)", _with_cell(SOLVED_BOARD, 8, 8, 8)),
+        ("Early conflict at (0, 1)", _with_cell(SOLVED_BOARD, 0, 1, 5)),
+    ]
+
+    implementations = [
+        ("Bitmask (1 pass)", verify_sudoku_board),
+        ("Sets (per unit)", verify_sudoku_board_sets),
+    ]
+
+    iterations = 20000
+    for label, board in boards:
+        print(f"\n{label}")
+        print("-" * 40)
+
+        times = {}
+        results = set()
+        for name, func in implementations:
+            start_time = time.perf_counter()
+            for _ in range(iterations):
+                result = func(board)
+            times[name] = (time.perf_counter() - start_time) / iterations
+            results.add(result)
+
+        for name, avg_time in times.items():
+            print(f"{name:20}: {avg_time*1e6:8.2f} μs/board ({1 / avg_time:,.0f} boards/s)")
+        print(f"Speedup: {times['Sets (per unit)'] / times['Bitmask (1 pass)']:.2f}x | "
+              f"Results match: {len(results) == 1}")
+
+
+def register_benchmarks(register):
+    """
+    Benchmarks for benchmark.py. Size is the board side (4, 9, 16, 25):
+    validators get a shuffled solved board (valid, so every cell is checked),
+    solvers a puzzle with 45% of the cells blank. In terms of the side s the
+    validators are O(s²); the solvers declare no complexity (exponential).
+    """
+    def box(size):
+        n = int(size ** 0.5)
+        if n * n != size:
+            raise ValueError(f"board side must be a perfect square, got {size}")
+        return n
+
+    def make_solved(size, rng):
+        return (_shuffled_board(_solved_board(box(size)), rng),)
+
+    def make_puzzle(size, rng):
+        return (_puzzle(box(size), 0.45, rng),)
+
+    sides = [4, 9, 16, 25, 36, 49]
+    register("sudoku_verify.bitmask", verify_sudoku_board, make_solved, [9])
+    register("sudoku_verify.bitmask_n", verify_sudoku_board_n, make_solved, [4, 9, 16, 25],
+             complexity="n^2", scaling_sizes=sides)
+    register("sudoku_verify.sets", verify_sudoku_board_sets, make_solved, [4, 9, 16, 25],
+             complexity="n^2", scaling_sizes=sides)
+    register("sudoku_solve.bitset", solve_sudoku, make_puzzle, [4, 9, 16])
+    register("sudoku_solve.brute_force", solve_sudoku_brute_force, make_puzzle, [4, 9])
+
 
 if __name__ == '__main__':
 
@@ -14,4 +1556,17 @@ if __name__ == '__main__':
     [0, 0, 0, 4, 1, 9, 0, 0, 5],
     [0, 0, 0, 0, 8, 0, 0, 7, 9]
 ]
-    verify_sudoku_board(sudoku_board)
\ No newline at end of file
+    print(f"verify_sudoku_board(sudoku_board) = {verify_sudoku_board(sudoku_board)}")
+
+    test_implementations()
+    performance_comparison()
+    test_bulk_implementation()
+    bulk_performance_comparison()
+    test_packed_format()
+    packed_performance_comparison()
+    test_solver()
+    solver_performance_comparison()
+    test_general_sizes()
+    general_size_performance_comparison()
+    test_incremental_board()
+    incremental_performance_comparison()
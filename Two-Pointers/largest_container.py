@@ -1,3 +1,14 @@
+import os
+import sys
+
+# Shared helpers (buffer_input) live at the repository root
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from buffer_input import as_sequence, exact_int64, numpy_array, wide_array
+
+
 def largest_container_original(heights):
     """
     Original implementation (has logic issues).
@@ -44,7 +55,16 @@ def largest_container_optimal(heights):
     - We always move the pointer with smaller height because:
       - Moving the taller pointer can only decrease the area
       - Moving the shorter pointer might increase the area
+
+    `heights` may be a list or any 1-D numeric buffer (array.array,
+    memoryview, NumPy array). Buffers are never copied or modified: short
+    ones are read in place through buffer_input.as_sequence, long ones go
+    to largest_container_vectorized.
     """
+    values = numpy_array(heights)
+    if values is not None and exact_int64(values, scale=len(values)):
+        return largest_container_vectorized(values)
+    heights = as_sequence(heights)
     if len(heights) < 2:
         return 0
     
@@ -77,6 +97,7 @@ def largest_container_brute_force(heights):
     Time Complexity: O(n²)
     Space Complexity: O(1)
     """
+    heights = as_sequence(heights)
     if len(heights) < 2:
         return 0
     
@@ -93,6 +114,49 @@ def largest_container_brute_force(heights):
     return max_area
 
 
+def largest_container_vectorized(values):
+    """
+    largest_container_skip over a NumPy array.
+
+    The skipping left pointer only ever stops on prefix records (lines
+    taller than everything before them) and the right pointer on suffix
+    records, so both lists are found with np.maximum.accumulate and the
+    two-pointer walk runs over the records alone, usually a few dozen.
+
+    Time Complexity: O(n) vectorized + O(records) in Python
+    Space Complexity: O(n) temporaries
+    """
+    import numpy as np
+
+    values = wide_array(values)
+    n = len(values)
+    if n < 2:
+        return 0
+
+    def records(series):
+        running = np.maximum.accumulate(series)
+        return np.flatnonzero(np.concatenate(([True], series[1:] > running[:-1])))
+
+    left_stops = records(values)
+    right_stops = (n - 1 - records(values[::-1]))
+    lefts, left_heights = left_stops.tolist(), values[left_stops].tolist()
+    rights, right_heights = right_stops.tolist(), values[right_stops].tolist()
+
+    a = b = 0
+    max_area = 0
+    while a < len(lefts) and b < len(rights) and lefts[a] < rights[b]:
+        height = min(left_heights[a], right_heights[b])
+        current_area = (rights[b] - lefts[a]) * height
+        if current_area > max_area:
+            max_area = current_area
+        while a < len(lefts) and left_heights[a] <= height:
+            a += 1
+        while b < len(rights) and right_heights[b] <= height:
+            b += 1
+
+    return max_area
+
+
 def largest_container_with_indices(heights):
     """
     Returns both the maximum area and the indices that produce it.
@@ -100,6 +164,7 @@ def largest_container_with_indices(heights):
     Time Complexity: O(n)
     Space Complexity: O(1)
     """
+    heights = as_sequence(heights)
     if len(heights) < 2:
         return 0, (-1, -1)
     
@@ -128,6 +193,947 @@ def largest_container_with_indices(heights):
     return max_area, best_indices
 
 
+def largest_container_batch(profiles):
+    """
+    Run largest_container_with_indices over many independent height profiles.
+
+    Accepts an (m, n) NumPy array or a list of array('i') (rows may have
+    different lengths). All rows are laid out back to back in one flat buffer
+    with per-row start offsets, so ragged input needs no padding. Each step of
+    the two-pointer scan is then done for every unfinished row at once, and
+    rows whose pointers have met are dropped from the active set.
+
+    Time Complexity: O(total length), in about max(n) vectorized steps
+    Space Complexity: O(total length) for the flat buffer, O(m) otherwise
+
+    Returns:
+        Tuple (areas, indices): areas[k] and indices[k] = (left, right) are
+        what largest_container_with_indices returns for row k. NumPy arrays of
+        shape (m,) and (m, 2); plain lists if NumPy is not installed.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        results = [largest_container_with_indices(row) for row in profiles]
+        return [area for area, _ in results], [indices for _, indices in results]
+
+    if isinstance(profiles, np.ndarray):
+        m, n = profiles.shape
+        flat = np.ascontiguousarray(profiles, dtype=np.int64).ravel()
+        lengths = np.full(m, n, dtype=np.int64)
+        starts = np.arange(m, dtype=np.int64) * n
+    else:
+        m = len(profiles)
+        lengths = np.fromiter((len(row) for row in profiles), dtype=np.int64, count=m)
+        starts = np.zeros(m, dtype=np.int64)
+        np.cumsum(lengths[:-1], out=starts[1:])
+        if m and lengths.sum():
+            flat = np.concatenate([np.asarray(row, dtype=np.int64) for row in profiles])
+        else:
+            flat = np.zeros(0, dtype=np.int64)
+
+    best_area = np.zeros(m, dtype=np.int64)
+    best_left = starts.copy()
+    best_right = starts + lengths - 1
+
+    # Compacted state of the rows that are still scanning
+    rows = np.flatnonzero(lengths >= 2)
+    left = best_left[rows]
+    right = best_right[rows]
+
+    while rows.size:
+        height_left = flat[left]
+        height_right = flat[right]
+        area = np.minimum(height_left, height_right) * (right - left)
+
+        better = area > best_area[rows]
+        if better.any():
+            improved = rows[better]
+            best_area[improved] = area[better]
+            best_left[improved] = left[better]
+            best_right[improved] = right[better]
+
+        # Move the pointer with smaller height
+        move_left = height_left < height_right
+        left = left + move_left
+        right = right - ~move_left
+
+        running = left < right
+        if not running.all():
+            rows = rows[running]
+            left = left[running]
+            right = right[running]
+
+    indices = np.stack([best_left - starts, best_right - starts], axis=1)
+    indices[lengths < 2] = -1
+
+    return best_area, indices
+
+
+def next_taller_indices(heights):
+    """
+    For every line, the nearest strictly taller line on each side.
+
+    Built with one monotonic stack pass per direction. next_right[i] is n and
+    next_left[i] is -1 when there is no taller line. The tables depend only on
+    the heights, so they can be built once and passed to every
+    largest_container_skip call on the same series.
+
+    Time Complexity: O(n)
+    Space Complexity: O(n) - two array('i') tables
+
+    Returns:
+        Tuple (next_right, next_left)
+    """
+    from array import array
+
+    heights = as_sequence(heights)
+    n = len(heights)
+    next_right = array('i', [n]) * n
+    next_left = array('i', [-1]) * n
+
+    stack = []
+    for i in range(n):
+        height = heights[i]
+        while stack and heights[stack[-1]] < height:
+            next_right[stack.pop()] = i
+        stack.append(i)
+
+    stack = []
+    for i in range(n - 1, -1, -1):
+        height = heights[i]
+        while stack and heights[stack[-1]] < height:
+            next_left[stack.pop()] = i
+        stack.append(i)
+
+    return next_right, next_left
+
+
+def largest_container_skip(heights, next_taller=None):
+    """
+    Two-pointer solution that jumps over lines no taller than the current
+    shorter side.
+
+    Once a container with height h has been measured, every line of height
+    <= h between the pointers can only give a narrower container that is no
+    taller, so the moving pointer goes straight to the next strictly taller
+    line. When both ends are equal, both pointers jump. With the tables from
+    next_taller_indices() each jump is a single lookup; without them an inline
+    skip loop walks the dominated lines without computing any areas.
+
+    Time Complexity: O(n) - O(number of jumps) with precomputed tables
+    Space Complexity: O(1)
+    """
+    heights = as_sequence(heights)
+    if len(heights) < 2:
+        return 0
+
+    left = 0
+    right = len(heights) - 1
+    max_area = 0
+
+    if next_taller is not None:
+        next_right, next_left = next_taller
+        while left < right:
+            height_left = heights[left]
+            height_right = heights[right]
+
+            if height_left < height_right:
+                current_area = (right - left) * height_left
+                left = next_right[left]
+            else:
+                current_area = (right - left) * height_right
+                if height_left == height_right:
+                    left = next_right[left]
+                right = next_left[right]
+
+            if current_area > max_area:
+                max_area = current_area
+
+        return max_area
+
+    while left < right:
+        height = min(heights[left], heights[right])
+        current_area = (right - left) * height
+        if current_area > max_area:
+            max_area = current_area
+
+        # Skip every line that cannot beat the current shorter side
+        while left < right and heights[left] <= height:
+            left += 1
+        while left < right and heights[right] <= height:
+            right -= 1
+
+    return max_area
+
+
+def _largest_container_skip_iterations(heights):
+    """Number of areas largest_container_skip evaluates (largest_container_optimal always does n - 1)."""
+    if len(heights) < 2:
+        return 0
+
+    left = 0
+    right = len(heights) - 1
+    iterations = 0
+
+    while left < right:
+        iterations += 1
+        height = min(heights[left], heights[right])
+        while left < right and heights[left] <= height:
+            left += 1
+        while left < right and heights[right] <= height:
+            right -= 1
+
+    return iterations
+
+
+def write_heights_file(path, heights, typecode='i'):
+    """Write heights as a flat native-endian binary array (the input format of largest_container_file)."""
+    from array import array
+
+    with open(path, 'wb') as f:
+        array(typecode, heights).tofile(f)
+
+
+def largest_container_file(path, typecode='i', block_size=1 << 16):
+    """
+    largest_container_with_indices over a binary file of heights, without
+    loading the file.
+
+    The file is memory-mapped and read through a memoryview cast to
+    `typecode`. Each pointer works on its own block of `block_size` values
+    copied out of the mapping; when a pointer leaves its block, the next block
+    in its direction is read, the pages it has finished with are dropped from
+    the mapping (MADV_DONTNEED) and the block after that is prefetched
+    (MADV_WILLNEED). Resident memory therefore stays at about two blocks no
+    matter how large the file is.
+
+    Time Complexity: O(n)
+    Space Complexity: O(block_size)
+
+    Returns:
+        Same (area, (left, right)) as largest_container_with_indices
+    """
+    import mmap
+    import os
+    from array import array
+
+    itemsize = array(typecode).itemsize
+
+    with open(path, 'rb') as f:
+        n = os.fstat(f.fileno()).st_size // itemsize
+        if n < 2:
+            return 0, (-1, -1)
+
+        with mmap.mmap(f.fileno(), n * itemsize, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm).cast(typecode)
+            try:
+                return _largest_container_blocks(mm, view, n, itemsize, block_size)
+            finally:
+                view.release()
+
+
+def _madvise_range(mm, option, start, stop, itemsize, inward):
+    """madvise() over the pages of values [start, stop); a no-op where madvise is unavailable."""
+    import mmap
+
+    if option is None:
+        return
+    page = mmap.PAGESIZE
+    start, stop = start * itemsize, stop * itemsize
+    if inward:
+        # Only pages entirely inside the range, so no page still in use is dropped
+        start = -(-start // page) * page
+        stop = stop // page * page
+    else:
+        start = start // page * page
+        stop = min(-(-stop // page) * page, len(mm))
+    if stop > start:
+        mm.madvise(option, start, stop - start)
+
+
+def _largest_container_blocks(mm, view, n, itemsize, block_size):
+    import mmap
+
+    dontneed = getattr(mmap, 'MADV_DONTNEED', None)
+    willneed = getattr(mmap, 'MADV_WILLNEED', None)
+    if not hasattr(mm, 'madvise'):
+        dontneed = willneed = None
+
+    left = 0
+    right = n - 1
+    max_area = 0
+    best_indices = (0, n - 1)
+
+    left_start = 0
+    left_block = view[0:min(block_size, n)].tolist()
+    right_start = max(0, n - block_size)
+    right_block = view[right_start:n].tolist()
+
+    while left < right:
+        # Refill whichever side has run off the end of its block
+        left_stop = left_start + len(left_block)
+        if left >= left_stop:
+            _madvise_range(mm, dontneed, left_start, left_stop, itemsize, True)
+            left_start = left
+            left_stop = min(left + block_size, n)
+            left_block = view[left_start:left_stop].tolist()
+            _madvise_range(mm, willneed, left_stop, min(left_stop + block_size, n),
+                           itemsize, False)
+
+        if right < right_start:
+            _madvise_range(mm, dontneed, right_start, right_start + len(right_block),
+                           itemsize, True)
+            right_stop = right + 1
+            right_start = max(0, right_stop - block_size)
+            right_block = view[right_start:right_stop].tolist()
+            _madvise_range(mm, willneed, max(0, right_start - block_size), right_start,
+                           itemsize, False)
+
+        while left < right and left < left_stop and right >= right_start:
+            # Calculate current area
+            height_left = left_block[left - left_start]
+            height_right = right_block[right - right_start]
+            current_area = (right - left) * min(height_left, height_right)
+
+            # Update maximum area and indices
+            if current_area > max_area:
+                max_area = current_area
+                best_indices = (left, right)
+
+            # Move the pointer with smaller height
+            if height_left < height_right:
+                left += 1
+            else:
+                right -= 1
+
+    return max_area, best_indices
+
+
+class _MaxSegmentTree:
+    """Array-backed max segment tree with point updates and "first/last index above t" searches."""
+
+    def __init__(self, heights):
+        size = 1
+        while size < max(1, len(heights)):
+            size *= 2
+        tree = [float('-inf')] * (2 * size)
+        tree[size:size + len(heights)] = heights
+        for node in range(size - 1, 0, -1):
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+        self.size = size
+        self.tree = tree
+
+    def update(self, index, value):
+        """Set heights[index] = value in O(log n)."""
+        tree = self.tree
+        node = index + self.size
+        tree[node] = value
+        node //= 2
+        while node:
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+            node //= 2
+
+    def first_index(self, lo, hi, threshold, strict=False):
+        """Smallest i in [lo, hi] with heights[i] >= threshold (> if strict), or -1."""
+        return self._search(lo, hi, threshold, strict, False)
+
+    def last_index(self, lo, hi, threshold, strict=False):
+        """Largest i in [lo, hi] with heights[i] >= threshold (> if strict), or -1."""
+        return self._search(lo, hi, threshold, strict, True)
+
+    def _search(self, lo, hi, threshold, strict, from_right):
+        if lo > hi:
+            return -1
+
+        tree = self.tree
+        size = self.size
+
+        # Bottom-up cover of [lo, hi]: left-edge nodes come out in increasing
+        # position order, right-edge nodes in decreasing order.
+        left_nodes = []
+        right_nodes = []
+        lo += size
+        hi += size + 1
+        while lo < hi:
+            if lo & 1:
+                left_nodes.append(lo)
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                right_nodes.append(hi)
+            lo //= 2
+            hi //= 2
+
+        if from_right:
+            nodes = right_nodes + left_nodes[::-1]
+        else:
+            nodes = left_nodes + right_nodes[::-1]
+
+        for node in nodes:
+            value = tree[node]
+            if value > threshold or (value == threshold and not strict):
+                # Descend to the first (or last) qualifying leaf
+                while node < size:
+                    first, second = 2 * node, 2 * node + 1
+                    if from_right:
+                        first, second = second, first
+                    value = tree[first]
+                    if value > threshold or (value == threshold and not strict):
+                        node = first
+                    else:
+                        node = second
+                return node - size
+
+        return -1
+
+
+def largest_containers_topk(heights, k, non_overlapping=False):
+    """
+    The k largest containers, in decreasing order of area.
+
+    Every pair (i, j) is charged to its shorter line (the left one on ties),
+    so its area is heights[shorter] * width. For a fixed shorter line the
+    areas only shrink as the partner moves inward, which gives 2n sorted
+    streams: partners to the right (height >= own) and to the left (height >
+    own), farthest first. A heap merges the streams. The farthest partners
+    come from prefix/suffix maxima with bisect; each later step is one
+    descent in a max segment tree.
+
+    With non_overlapping=True containers are chosen greedily: each one is the
+    largest that shares no line range with those already chosen. Streams of
+    lines covered by a chosen container are dropped, and the others are
+    clipped to the gap they sit in.
+
+    Time Complexity: O(n + k log n) typical (a popped candidate may need to be
+                     re-clipped after later choices in non-overlapping mode)
+    Space Complexity: O(n)
+
+    Returns:
+        List of up to k (area, (left, right)) tuples, ties broken by
+        (left, right). Heights are expected to be non-negative.
+    """
+    import heapq
+    from bisect import bisect_left, bisect_right
+    from itertools import accumulate
+
+    n = len(heights)
+    if n < 2 or k <= 0:
+        return []
+
+    # Farthest taller partner on each side from running maxima
+    prefix_max = list(accumulate(heights, max))
+    suffix_max_reversed = list(accumulate(reversed(heights), max))
+
+    heap = []
+    for i in range(n):
+        height = heights[i]
+        j = bisect_right(prefix_max, height)
+        if j < i:
+            heap.append((-height * (i - j), j, i, i, j))
+        # Zero-height lines have area 0 with every partner, so their right
+        # stream runs nearest-first to keep the (left, right) tie order
+        j = n - 1 - bisect_left(suffix_max_reversed, height) if height else i + 1
+        if i < j < n:
+            heap.append((-height * (j - i), i, j, i, j))
+    heapq.heapify(heap)
+
+    tree = None
+    chosen = []          # Sorted, disjoint (left, right) intervals
+    results = []
+
+    while heap and len(results) < k:
+        neg_area, left, right, i, j = heapq.heappop(heap)
+        height = heights[i]
+        lo, hi = 0, n - 1
+
+        if non_overlapping and chosen:
+            # Find the gap between chosen intervals that line i sits in
+            pos = bisect_right(chosen, (i, n))
+            if pos and chosen[pos - 1][1] >= i:
+                continue        # Line i is already inside a chosen container
+            if pos:
+                lo = chosen[pos - 1][1] + 1
+            if pos < len(chosen):
+                hi = chosen[pos][0] - 1
+
+        if lo <= j <= hi:
+            results.append((-neg_area, (left, right)))
+            if non_overlapping:
+                chosen.insert(bisect_right(chosen, (left, right)), (left, right))
+                continue
+        elif non_overlapping:
+            # Partner lies outside the gap: clip the stream to it instead
+            if tree is None:
+                tree = _MaxSegmentTree(heights)
+            if j > i and not height:
+                continue
+            if j > i:
+                j = tree.last_index(i + 1, hi, height)
+                if j != -1:
+                    heapq.heappush(heap, (-height * (j - i), i, j, i, j))
+            else:
+                j = tree.first_index(lo, i - 1, height, strict=True)
+                if j != -1:
+                    heapq.heappush(heap, (-height * (i - j), j, i, i, j))
+            continue
+
+        # Advance the stream to the next partner inward
+        if tree is None:
+            tree = _MaxSegmentTree(heights)
+        if j > i and not height:
+            if j + 1 < n:
+                heapq.heappush(heap, (0, i, j + 1, i, j + 1))
+        elif j > i:
+            j = tree.last_index(i + 1, j - 1, height)
+            if j != -1:
+                heapq.heappush(heap, (-height * (j - i), i, j, i, j))
+        else:
+            j = tree.first_index(j + 1, i - 1, height, strict=True)
+            if j != -1:
+                heapq.heappush(heap, (-height * (i - j), j, i, i, j))
+
+    return results
+
+
+def largest_containers_topk_brute_force(heights, k, non_overlapping=False):
+    """
+    Top-k containers by enumerating and sorting every pair, for comparison.
+
+    Time Complexity: O(n² log n)
+    Space Complexity: O(n²)
+    """
+    n = len(heights)
+    pairs = sorted(((-(j - i) * min(heights[i], heights[j]), i, j)
+                    for i in range(n) for j in range(i + 1, n)))
+
+    results = []
+    for neg_area, i, j in pairs:
+        if len(results) == k:
+            break
+        if non_overlapping and any(not (j < left or i > right) for _, (left, right) in results):
+            continue
+        results.append((-neg_area, (i, j)))
+
+    return results
+
+
+class ContainerRangeQuery:
+    """
+    Largest container inside heights[left:right] for many windows of one series.
+
+    The next-taller tables from next_taller_indices() are built once over the
+    full array. Inside any window the skip-ahead two-pointer scan only stops
+    at lines taller than everything between them and the window edge (the
+    running maxima from each end), and the tables jump between those lines
+    directly, so a query never touches the rest of the window. On random
+    data a window has O(log w) such lines. The bound is not sublinear in the
+    worst case: in a monotone or single-peaked window every line is a running
+    maximum and a query makes r - l jumps. The best pair of a window is not
+    determined by the best pairs of its blocks, so a sparse table or block
+    decomposition of precomputed answers does not apply.
+
+    Time Complexity: O(n) build; per query O(running maxima from both window
+                     edges) - O(log w) on random data, O(r - l) worst case
+    Space Complexity: O(n)
+
+    Usage:
+        ranges = ContainerRangeQuery(heights)
+        ranges.query(l, r)              # == largest_container_optimal(heights[l:r])
+        ranges.query_batch([(l1, r1), (l2, r2)])
+    """
+
+    def __init__(self, heights):
+        self._heights = list(heights)
+        self._next_right, self._next_left = next_taller_indices(self._heights)
+
+    def __len__(self):
+        return len(self._heights)
+
+    def query(self, left, right):
+        """
+        Maximum area using two lines of heights[left:right] (slice bounds).
+
+        Time Complexity: O(running maxima in the window), O(r - l) worst case
+        """
+        left, right, _ = slice(left, right).indices(len(self._heights))
+        return self._query(left, right - 1)
+
+    def query_batch(self, windows):
+        """
+        Answer many (left, right) windows.
+
+        Returns:
+            List of areas in window order
+        """
+        n = len(self._heights)
+        query = self._query
+        results = []
+        for left, right in windows:
+            left, right, _ = slice(left, right).indices(n)
+            results.append(query(left, right - 1))
+        return results
+
+    def _query(self, left, right):
+        heights = self._heights
+        next_right = self._next_right
+        next_left = self._next_left
+        max_area = 0
+
+        while left < right:
+            height_left = heights[left]
+            height_right = heights[right]
+
+            if height_left < height_right:
+                current_area = (right - left) * height_left
+                left = next_right[left]
+            else:
+                current_area = (right - left) * height_right
+                if height_left == height_right:
+                    left = next_right[left]
+                right = next_left[right]
+
+            if current_area > max_area:
+                max_area = current_area
+
+        return max_area
+
+
+class DynamicContainer:
+    """
+    Largest container of a height series that changes a few lines at a time.
+
+    Heights are kept in a max segment tree. max_area() runs the skip-ahead
+    two-pointer scan (see largest_container_skip) with two changes:
+
+    - It starts from the area of the previous best pair under the current
+      heights. A few point updates rarely move the answer far, so this lower
+      bound is usually close to the final one.
+    - Each next line is found with a tree search that skips every node whose
+      tallest line cannot beat the bound even at the widest width still left,
+      i.e. max height * distance to the other pointer <= best. Runs of taller
+      lines that sit too close to the other pointer are skipped in one search
+      rather than visited one by one.
+
+    The answer is cached until the next update.
+
+    Time Complexity: O(log n) update; max_area() is O(log n) per line the scan
+                     still has to visit - a handful after small updates,
+                     O(n log n) in the worst case
+    Space Complexity: O(n)
+
+    Usage:
+        container = DynamicContainer(heights)
+        container.update(i, h)
+        container.max_area()            # == largest_container_optimal(current heights)
+    """
+
+    def __init__(self, heights):
+        self._heights = list(heights)
+        self._tree = _MaxSegmentTree(self._heights)
+        self._max_area = None
+        self._best_pair = None
+
+    def __len__(self):
+        return len(self._heights)
+
+    def __getitem__(self, index):
+        return self._heights[index]
+
+    def update(self, index, height):
+        """Set the height of line `index`."""
+        if index < 0:
+            index += len(self._heights)
+        self._heights[index] = height
+        self._tree.update(index, height)
+        self._max_area = None
+
+    def max_area(self):
+        """Largest container of the current heights."""
+        if self._max_area is not None:
+            return self._max_area
+
+        heights = self._heights
+        left = 0
+        right = len(heights) - 1
+        max_area = 0
+        best_pair = self._best_pair
+        if best_pair is not None:
+            i, j = best_pair
+            max_area = (j - i) * min(heights[i], heights[j])
+
+        while left < right:
+            height_left = heights[left]
+            height_right = heights[right]
+            height = min(height_left, height_right)
+            current_area = (right - left) * height
+            if current_area > max_area:
+                max_area = current_area
+                best_pair = (left, right)
+
+            # Jump over every line that cannot beat the current shorter side
+            # or, paired with the other pointer, the best area so far
+            if height_left <= height:
+                left = self._first_candidate(left + 1, right - 1, height, right, max_area)
+                if left == -1:
+                    break
+            if height_right <= height:
+                right = self._last_candidate(left + 1, right - 1, height, left, max_area)
+                if right == -1:
+                    break
+
+        self._max_area = max_area
+        self._best_pair = best_pair
+        return max_area
+
+    def _first_candidate(self, lo, hi, threshold, right, best):
+        """Smallest x in [lo, hi] with heights[x] > threshold and heights[x] * (right - x) > best, or -1."""
+        tree = self._tree.tree
+        stack = [(1, 0, self._tree.size - 1)]
+        while stack:
+            node, node_lo, node_hi = stack.pop()
+            if node_hi < lo or node_lo > hi:
+                continue
+            value = tree[node]
+            if value <= threshold or value * (right - max(node_lo, lo)) <= best:
+                continue
+            if node_lo == node_hi:
+                return node_lo
+            mid = (node_lo + node_hi) // 2
+            stack.append((2 * node + 1, mid + 1, node_hi))
+            stack.append((2 * node, node_lo, mid))
+        return -1
+
+    def _last_candidate(self, lo, hi, threshold, left, best):
+        """Largest y in [lo, hi] with heights[y] > threshold and heights[y] * (y - left) > best, or -1."""
+        tree = self._tree.tree
+        stack = [(1, 0, self._tree.size - 1)]
+        while stack:
+            node, node_lo, node_hi = stack.pop()
+            if node_hi < lo or node_lo > hi:
+                continue
+            value = tree[node]
+            if value <= threshold or value * (min(node_hi, hi) - left) <= best:
+                continue
+            if node_lo == node_hi:
+                return node_lo
+            mid = (node_lo + node_hi) // 2
+            stack.append((2 * node, node_lo, mid))
+            stack.append((2 * node + 1, mid + 1, node_hi))
+        return -1
+
+
+def trapped_water(heights):
+    """
+    Total rainwater trapped between the lines (the same height series
+    largest_container works on, read as an elevation map of unit-width bars).
+
+    Two pointers move inward from the ends, keeping the tallest bar seen on
+    each side. The side with the lower running maximum is the one whose water
+    level is already known: every bar it passes holds (its maximum - height).
+    Long integer buffers (e.g. NumPy arrays) go to trapped_water_batch instead.
+
+    Time Complexity: O(n)
+    Space Complexity: O(1)
+    """
+    values = numpy_array(heights)
+    if values is not None and values.dtype.kind == "i" and exact_int64(values, scale=len(values)):
+        return trapped_water_batch(values)
+    heights = as_sequence(heights)
+    left = 0
+    right = len(heights) - 1
+    left_max = right_max = 0
+    water = 0
+
+    while left < right:
+        height_left = heights[left]
+        height_right = heights[right]
+        if height_left < height_right:
+            if height_left > left_max:
+                left_max = height_left
+            else:
+                water += left_max - height_left
+            left += 1
+        else:
+            if height_right > right_max:
+                right_max = height_right
+            else:
+                water += right_max - height_right
+            right -= 1
+
+    return water
+
+
+def trapped_water_brute_force(heights):
+    """
+    Trapped water from the tallest bar on each side of every bar.
+
+    Time Complexity: O(n²)
+    Space Complexity: O(1)
+    """
+    heights = as_sequence(heights)
+    water = 0
+    for i, height in enumerate(heights):
+        level = min(max(heights[:i + 1]), max(heights[i:]))
+        water += level - height
+    return water
+
+
+def trapped_water_batch(profiles, chunk_rows=None):
+    """
+    trapped_water for every row of an (m, n) array (or a single 1-D series).
+
+    The water level over each bar is min(prefix max, suffix max), both taken
+    with np.maximum.accumulate along the rows, so every row is handled in a
+    few vectorized passes. Rows are processed `chunk_rows` at a time to bound
+    the temporaries at about four int64 copies of a chunk; by default a chunk
+    holds roughly 1M values. Integer heights are computed in int64 and
+    floating ones in float64 (see buffer_input.wide_array).
+
+    Time Complexity: O(m * n)
+    Space Complexity: O(chunk_rows * n)
+
+    Returns:
+        NumPy int64 (float64 for floating heights) array of shape (m,), or a
+        plain number for 1-D input; plain lists/numbers if NumPy is not
+        installed.
+
+    Raises:
+        ValueError: for uint64 heights beyond the int64 range
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        if profiles and not isinstance(profiles[0], (list, tuple)):
+            return trapped_water(profiles)
+        return [trapped_water(row) for row in profiles]
+
+    profiles = np.asarray(profiles)
+    if profiles.ndim == 1:
+        return trapped_water_batch(profiles[np.newaxis], chunk_rows)[0].item()
+
+    m, n = profiles.shape
+    if chunk_rows is None:
+        chunk_rows = max(1, (1 << 20) // max(1, n))
+
+    water = np.zeros(m, dtype=np.float64 if profiles.dtype.kind == "f" else np.int64)
+    for start in range(0, m, chunk_rows):
+        chunk = wide_array(profiles[start:start + chunk_rows])
+        level = np.maximum.accumulate(chunk, axis=1)
+        suffix = np.maximum.accumulate(chunk[:, ::-1], axis=1)[:, ::-1]
+        np.minimum(level, suffix, out=level)
+        level -= chunk
+        water[start:start + chunk_rows] = level.sum(axis=1)
+
+    return water
+
+
+def trapped_water_file(path, typecode='i', block_size=1 << 16):
+    """
+    trapped_water over a binary file of heights (see write_heights_file),
+    streaming it through a memory mapping.
+
+    Three sequential passes of `block_size` values each: one to find the
+    tallest bar, then one forward up to it (the level is the running prefix
+    max) and one backward down to it (the running suffix max). Blocks are
+    NumPy views straight into the mapping when NumPy is installed, and pages
+    already processed are dropped with MADV_DONTNEED, so resident memory
+    stays at about one block. Float typecodes ('f', 'd') give float water.
+
+    Time Complexity: O(n)
+    Space Complexity: O(block_size)
+
+    Raises:
+        ValueError: for typecode 'Q' heights beyond the int64 range
+    """
+    import mmap
+    import os
+    from array import array
+
+    itemsize = array(typecode).itemsize
+
+    with open(path, 'rb') as f:
+        n = os.fstat(f.fileno()).st_size // itemsize
+        if n < 3:
+            return 0
+
+        with mmap.mmap(f.fileno(), n * itemsize, access=mmap.ACCESS_READ) as mm:
+            try:
+                import numpy as np
+            except ImportError:
+                view = memoryview(mm).cast(typecode)
+                try:
+                    return _trapped_water_blocks(mm, view, n, itemsize, block_size, None)
+                finally:
+                    view.release()
+            # Views into the mapping die with the helper's frame, before mm closes
+            return _trapped_water_blocks(mm, np.frombuffer(mm, dtype=typecode, count=n),
+                                         n, itemsize, block_size, np)
+
+
+def _trapped_water_blocks(mm, values, n, itemsize, block_size, np):
+    import mmap
+
+    dontneed = getattr(mmap, 'MADV_DONTNEED', None)
+    if not hasattr(mm, 'madvise'):
+        dontneed = None
+
+    def read(start, stop, reverse=False):
+        if reverse:
+            chunk = values[stop - 1:start - 1 if start else None:-1]
+        else:
+            chunk = values[start:stop]
+        return chunk if np is not None else chunk.tolist()
+
+    # Pass 1: position of the (first) tallest bar
+    peak, peak_height = 0, None
+    for start in range(0, n, block_size):
+        chunk = read(start, min(start + block_size, n))
+        if np is not None:
+            k = int(chunk.argmax())
+            height = chunk[k].item()
+        else:
+            height = max(chunk)
+            k = chunk.index(height)
+        if peak_height is None or height > peak_height:
+            peak, peak_height = start + k, height
+
+    water = 0
+
+    # Pass 2: bars left of the peak, level = prefix max
+    level = 0
+    for start in range(0, peak, block_size):
+        stop = min(start + block_size, peak)
+        water, level = _trapped_water_run(read(start, stop), level, water, np)
+        _madvise_range(mm, dontneed, start, stop, itemsize, True)
+
+    # Pass 3: bars right of the peak, level = suffix max
+    level = 0
+    for stop in range(n, peak + 1, -block_size):
+        start = max(stop - block_size, peak + 1)
+        water, level = _trapped_water_run(read(start, stop, reverse=True), level, water, np)
+        _madvise_range(mm, dontneed, start, stop, itemsize, True)
+
+    return water
+
+
+def _trapped_water_run(chunk, level, water, np):
+    """Add the water over `chunk` given the running max `level` before it; returns (water, level)."""
+    if np is not None:
+        chunk = wide_array(chunk)
+        levels = np.maximum.accumulate(chunk)
+        np.maximum(levels, level, out=levels)
+        water += levels.sum().item() - chunk.sum().item()
+        return water, levels[-1].item()
+
+    for height in chunk:
+        if height > level:
+            level = height
+        else:
+            water += level - height
+    return water, level
+
+
 # Alias for the optimal solution
 largest_container = largest_container_optimal
 
@@ -152,6 +1158,8 @@ def test_implementations():
         ("Brute Force", largest_container_brute_force),
         ("Optimal", largest_container_optimal),
         ("With Indices", lambda x: largest_container_with_indices(x)[0]),
+        ("Skip", largest_container_skip),
+        ("Skip + Tables", lambda x: largest_container_skip(x, next_taller_indices(x))),
     ]
     
     print("Testing Container With Most Water Implementations")
@@ -164,7 +1172,7 @@ def test_implementations():
         all_correct = True
         for name, func in implementations:
             try:
-                result = func(heights.copy())
+                result = func(heights)
                 status = "✅" if result == expected else "❌"
                 print(f"  {status} {name:15}: {result}")
                 if result != expected:
@@ -221,14 +1229,14 @@ def performance_comparison():
             
             # Warm up
             for _ in range(5):
-                func(heights.copy())
+                func(heights)
             
             # Measure performance
             start_time = time.perf_counter()
             iterations = 1000 if size <= 100 else 100 if size <= 500 else 10
             
             for _ in range(iterations):
-                result = func(heights.copy())
+                result = func(heights)
             
             end_time = time.perf_counter()
             avg_time = (end_time - start_time) / iterations
@@ -248,6 +1256,629 @@ def performance_comparison():
                 print(f"\nSpeedup: {speedup:.1f}x faster with optimal solution")
 
 
+def test_batch_implementation():
+    """Check largest_container_batch against per-row largest_container_with_indices."""
+    import random
+    from array import array
+
+    print("\n" + "=" * 60)
+    print("BATCH IMPLEMENTATION")
+    print("=" * 60)
+
+    # Ragged input, including rows too short to hold a container
+    profiles = [array('i', [random.randint(0, 20) for _ in range(random.randint(0, 30))])
+                for _ in range(500)]
+    profiles += [array('i'), array('i', [5]), array('i', [0, 0]), array('i', [3, 3, 3])]
+
+    areas, indices = largest_container_batch(profiles)
+    mismatches = 0
+    for k, row in enumerate(profiles):
+        area, best = largest_container_with_indices(row)
+        if area != areas[k] or best != tuple(int(i) for i in indices[k]):
+            mismatches += 1
+    print(f"Ragged array('i') rows ({len(profiles)}): {mismatches} mismatches")
+
+    try:
+        import numpy as np
+    except ImportError:
+        print("(m, n) NumPy input: Skipped (NumPy not installed)")
+        return
+
+    matrix = np.random.randint(1, 1000, size=(500, 40))
+    areas, indices = largest_container_batch(matrix)
+    mismatches = 0
+    for k, row in enumerate(matrix.tolist()):
+        area, best = largest_container_with_indices(row)
+        if area != areas[k] or best != tuple(indices[k].tolist()):
+            mismatches += 1
+    print(f"(m, n) NumPy rows {matrix.shape}: {mismatches} mismatches")
+
+
+def batch_performance_comparison():
+    """Compare largest_container_batch with a Python loop over the rows."""
+    import time
+
+    print("\n" + "=" * 60)
+    print("BATCH PERFORMANCE COMPARISON")
+    print("=" * 60)
+
+    try:
+        import numpy as np
+    except ImportError:
+        print("Skipped (NumPy not installed)")
+        return
+
+    for m, n in [(1000, 100), (10000, 100), (100000, 100), (10000, 1000)]:
+        matrix = np.random.randint(1, 1000, size=(m, n))
+        rows = matrix.tolist()
+
+        start_time = time.perf_counter()
+        areas, indices = largest_container_batch(matrix)
+        batch_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        results = [largest_container_with_indices(row) for row in rows]
+        loop_time = time.perf_counter() - start_time
+
+        match = all(area == areas[k] and best == tuple(indices[k].tolist())
+                    for k, (area, best) in enumerate(results))
+
+        print(f"\nProfiles: {m} x {n}")
+        print("-" * 40)
+        print(f"{'Python loop':20}: {loop_time*1000:.2f} ms")
+        print(f"{'Batch (NumPy)':20}: {batch_time*1000:.2f} ms")
+        print(f"Speedup: {loop_time/batch_time:.1f}x | Match: {match}")
+
+
+def test_file_implementation():
+    """Check largest_container_file against largest_container_with_indices."""
+    import os
+    import random
+    import tempfile
+
+    print("\n" + "=" * 60)
+    print("FILE-BACKED IMPLEMENTATION")
+    print("=" * 60)
+
+    cases = [[], [5], [2, 1], [1, 8, 6, 2, 5, 4, 8, 3, 7]]
+    cases += [[random.randint(0, 1000) for _ in range(random.randint(2, 5000))]
+              for _ in range(20)]
+
+    fd, path = tempfile.mkstemp(suffix=".bin")
+    os.close(fd)
+    mismatches = 0
+    try:
+        for heights in cases:
+            write_heights_file(path, heights)
+            expected = largest_container_with_indices(heights)
+            # Tiny blocks force many refills and cross-block pointer meetings
+            for block_size in (1, 3, 64, 1 << 16):
+                if largest_container_file(path, block_size=block_size) != expected:
+                    mismatches += 1
+    finally:
+        os.remove(path)
+
+    print(f"{len(cases)} files x 4 block sizes: {mismatches} mismatches")
+
+
+def _measure_file_variant(mode, path):
+    """Run one variant in a fresh process and report (result, seconds, peak RSS increase in KB)."""
+    import resource
+    import time
+    from array import array
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start_time = time.perf_counter()
+    if mode == "load":
+        heights = array('i')
+        with open(path, 'rb') as f:
+            heights.frombytes(f.read())
+        result = largest_container_with_indices(heights.tolist())
+    else:
+        result = largest_container_file(path)
+    elapsed = time.perf_counter() - start_time
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return result, elapsed, peak - baseline
+
+
+def file_performance_comparison():
+    """
+    Compare largest_container_file with loading the whole file first.
+
+    Each variant runs in a freshly spawned process so its peak RSS is its own.
+    On a 10M-value int32 file (40 MB) both variants ran at about 0.006 GB/s,
+    the mapped one ~20% faster since it never builds the full list. Loading
+    first peaked at ~300 MB extra RSS (the list of boxed ints), the mapped
+    scan at under 5 MB: the scan is interpreter-bound, so the mapping mainly
+    removes the memory cost.
+    """
+    import os
+    import random
+    import tempfile
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    print("\n" + "=" * 60)
+    print("FILE-BACKED PERFORMANCE COMPARISON")
+    print("=" * 60)
+
+    try:
+        import resource  # noqa: F401 - peak RSS is only available on Unix
+    except ImportError:
+        print("Skipped (resource module not available)")
+        return
+
+    context = multiprocessing.get_context("spawn")
+
+    for size in [1000000, 10000000]:
+        fd, path = tempfile.mkstemp(suffix=".bin")
+        os.close(fd)
+        try:
+            write_heights_file(path, (random.randint(1, 1000) for _ in range(size)))
+            file_bytes = os.path.getsize(path)
+
+            print(f"\nHeights: {size} int32 values ({file_bytes / 1e6:.0f} MB)")
+            print("-" * 40)
+
+            results = {}
+            for label, mode in [("Load + scan", "load"), ("Memory-mapped", "mmap")]:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    result, elapsed, peak_kb = pool.submit(_measure_file_variant, mode, path).result()
+                results[label] = result
+                print(f"{label:15}: {elapsed*1000:9.2f} ms | "
+                      f"{file_bytes / elapsed / 1e9:.3f} GB/s | "
+                      f"peak RSS +{peak_kb / 1024:.1f} MB -> {result}")
+
+            print(f"Results match: {len(set(results.values())) == 1}")
+        finally:
+            os.remove(path)
+
+
+def skip_performance_comparison():
+    """Compare iterations and time of largest_container_skip with largest_container_optimal."""
+    import time
+    import random
+
+    print("\n" + "=" * 60)
+    print("SKIP-AHEAD PERFORMANCE COMPARISON")
+    print("=" * 60)
+
+    size = 100000
+    inputs = [
+        ("Random", [random.randint(1, 1000) for _ in range(size)]),
+        ("Ascending", list(range(1, size + 1))),
+        ("Sawtooth", [i % 100 + 1 for i in range(size)]),
+        ("Noisy ramp", [i // 10 + random.randint(0, 50) for i in range(size)]),
+    ]
+
+    for label, heights in inputs:
+        print(f"\n{label} (n = {size})")
+        print("-" * 40)
+
+        start_time = time.perf_counter()
+        tables = next_taller_indices(heights)
+        table_time = time.perf_counter() - start_time
+
+        implementations = [
+            ("Optimal", largest_container_optimal),
+            ("Skip (inline)", largest_container_skip),
+            ("Skip (tables)", lambda h: largest_container_skip(h, tables)),
+        ]
+
+        times = {}
+        results = set()
+        for name, func in implementations:
+            for _ in range(2):
+                func(heights)
+
+            iterations = 10
+            start_time = time.perf_counter()
+            for _ in range(iterations):
+                result = func(heights)
+            times[name] = (time.perf_counter() - start_time) / iterations
+            results.add(result)
+
+        print(f"Area evaluations: Optimal {size - 1}, "
+              f"Skip {_largest_container_skip_iterations(heights)}")
+        for name, avg_time in times.items():
+            speedup = times["Optimal"] / avg_time
+            print(f"{name:15}: {avg_time*1000:8.3f} ms/call ({speedup:.2f}x)")
+        print(f"Table build (once per series): {table_time*1000:.3f} ms")
+        print(f"Results match: {len(results) == 1}")
+
+
+def test_topk_implementation():
+    """Check largest_containers_topk against enumerating every pair."""
+    import random
+
+    print("\n" + "=" * 60)
+    print("TOP-K CONTAINERS")
+    print("=" * 60)
+
+    heights = [1, 8, 6, 2, 5, 4, 8, 3, 7]
+    for non_overlapping in (False, True):
+        result = largest_containers_topk(heights, 3, non_overlapping)
+        expected = largest_containers_topk_brute_force(heights, 3, non_overlapping)
+        status = "✅" if result == expected else "❌"
+        print(f"  {status} {heights}, k=3, non_overlapping={non_overlapping}: {result}")
+
+    mismatches = 0
+    for _ in range(500):
+        heights = [random.choice([0, 1, 2, 3, 5, 8]) for _ in range(random.randint(0, 30))]
+        k = random.randint(1, 50)
+        for non_overlapping in (False, True):
+            if (largest_containers_topk(heights, k, non_overlapping)
+                    != largest_containers_topk_brute_force(heights, k, non_overlapping)):
+                mismatches += 1
+    print(f"\nRandomized cross-check (1000 cases): {mismatches} mismatches")
+
+
+def topk_performance_comparison():
+    """Time largest_containers_topk at n = 10^5 and brute force on smaller n."""
+    import time
+    import random
+
+    print("\n" + "=" * 60)
+    print("TOP-K PERFORMANCE COMPARISON")
+    print("=" * 60)
+
+    for size in [300, 1000, 100000]:
+        heights = [random.randint(1, 1000) for _ in range(size)]
+        print(f"\nArray size: {size}")
+        print("-" * 40)
+
+        for k in [10, 100, 1000]:
+            for non_overlapping in (False, True):
+                label = f"k={k:<5}{' non-overlapping' if non_overlapping else ''}"
+
+                start_time = time.perf_counter()
+                result = largest_containers_topk(heights, k, non_overlapping)
+                topk_time = time.perf_counter() - start_time
+
+                if size > 1000:
+                    print(f"{label:22} Heap: {topk_time*1000:9.2f} ms | Brute Force: skipped")
+                    continue
+
+                start_time = time.perf_counter()
+                expected = largest_containers_topk_brute_force(heights, k, non_overlapping)
+                brute_time = time.perf_counter() - start_time
+
+                print(f"{label:22} Heap: {topk_time*1000:9.2f} ms | "
+                      f"Brute Force: {brute_time*1000:9.2f} ms | "
+                      f"Speedup: {brute_time/topk_time:.1f}x | Match: {result == expected}")
+
+
+def test_range_query_implementation():
+    """Check ContainerRangeQuery against slicing plus largest_container_optimal."""
+    import random
+
+    print("\n" + "=" * 60)
+    print("RANGE QUERIES")
+    print("=" * 60)
+
+    mismatches = 0
+    for _ in range(50):
+        heights = [random.randint(0, 10) for _ in range(random.randint(0, 60))]
+        ranges = ContainerRangeQuery(heights)
+        windows = [(random.randint(-5, len(heights)), random.randint(0, len(heights) + 5))
+                   for _ in range(40)]
+        results = ranges.query_batch(windows)
+        for (left, right), result in zip(windows, results):
+            if result != largest_container_optimal(heights[left:right]):
+                mismatches += 1
+            if result != ranges.query(left, right):
+                mismatches += 1
+    print(f"Randomized cross-check (2000 windows): {mismatches} mismatches")
+
+
+def range_query_performance_comparison():
+    """Compare ContainerRangeQuery with slice-and-scan on 10^5 windows, and by width on worst-case series."""
+    import time
+    import random
+
+    print("\n" + "=" * 60)
+    print("RANGE QUERY PERFORMANCE COMPARISON")
+    print("=" * 60)
+
+    size = 100000
+    inputs = [
+        ("Random", [random.randint(1, 1000) for _ in range(size)], 100000),
+        ("Noisy ramp", [i // 10 + random.randint(0, 50) for i in range(size)], 100000),
+    ]
+
+    for label, heights, num_queries in inputs:
+        print(f"\n{label} (n = {size})")
+        print("-" * 40)
+
+        windows = []
+        for _ in range(num_queries):
+            left = random.randint(0, size - 2)
+            windows.append((left, random.randint(left + 2, size)))
+
+        start_time = time.perf_counter()
+        ranges = ContainerRangeQuery(heights)
+        build_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        results = ranges.query_batch(windows)
+        query_time = (time.perf_counter() - start_time) / num_queries
+
+        # Slice-and-scan costs O(r - l) per window, so only a sample is timed
+        sample = windows[:100]
+        start_time = time.perf_counter()
+        expected = [largest_container_optimal(heights[left:right]) for left, right in sample]
+        scan_time = (time.perf_counter() - start_time) / len(sample)
+
+        print(f"Build: {build_time*1000:.2f} ms")
+        print(f"{'Range query':20}: {query_time*1e6:10.2f} μs/query ({num_queries} queries)")
+        print(f"{'Slice + scan':20}: {scan_time*1e6:10.2f} μs/query ({len(sample)} sampled)")
+        print(f"Speedup: {scan_time/query_time:.1f}x | "
+              f"Match: {results[:len(sample)] == expected}")
+
+    # Every line is a running maximum, so the query cost grows with r - l
+    worst_cases = [
+        ("Ascending", list(range(1, size + 1))),
+        ("Single peak", [min(i, size - i) + 1 for i in range(size)]),
+    ]
+    widths = [100, 1000, 10000, 100000]
+    for label, heights in worst_cases:
+        print(f"\n{label} - worst case (n = {size})")
+        print("-" * 40)
+        print(f"{'width':>7} | {'range query':>13} {'slice + scan':>13} | speedup")
+        ranges = ContainerRangeQuery(heights)
+        for width in widths:
+            windows = []
+            for _ in range(100):
+                left = random.randint(0, size - width)
+                windows.append((left, left + width))
+
+            start_time = time.perf_counter()
+            results = ranges.query_batch(windows)
+            query_time = (time.perf_counter() - start_time) / len(windows)
+
+            sample = windows[:10]
+            start_time = time.perf_counter()
+            expected = [largest_container_optimal(heights[left:right]) for left, right in sample]
+            scan_time = (time.perf_counter() - start_time) / len(sample)
+
+            match = "" if results[:len(sample)] == expected else " ❌ mismatch"
+            print(f"{width:>7} | {query_time*1e6:10.1f} μs {scan_time*1e6:10.1f} μs | "
+                  f"{scan_time/query_time:6.1f}x{match}")
+
+
+def test_dynamic_implementation():
+    """Check DynamicContainer against largest_container_brute_force under random updates."""
+    import random
+
+    print("\n" + "=" * 60)
+    print("DYNAMIC UPDATES")
+    print("=" * 60)
+
+    mismatches = 0
+    checks = 0
+    for _ in range(100):
+        heights = [random.randint(0, 10) for _ in range(random.randint(0, 40))]
+        container = DynamicContainer(heights)
+        for _ in range(30):
+            if heights and random.random() < 0.8:
+                index = random.randrange(len(heights))
+                heights[index] = random.randint(0, 10)
+                container.update(index, heights[index])
+            checks += 1
+            if container.max_area() != largest_container_brute_force(heights):
+                mismatches += 1
+    print(f"Randomized update/query checks ({checks}): {mismatches} mismatches")
+
+
+def dynamic_performance_comparison():
+    """Compare DynamicContainer update-plus-query throughput with full recompute."""
+    import time
+    import random
+
+    print("\n" + "=" * 60)
+    print("DYNAMIC UPDATE PERFORMANCE COMPARISON")
+    print("=" * 60)
+
+    size = 100000
+    inputs = [
+        ("Random", [random.randint(1, 1000) for _ in range(size)]),
+        ("Noisy ramp", [i // 10 + random.randint(0, 50) for i in range(size)]),
+        ("Ascending", list(range(1, size + 1))),
+    ]
+
+    for label, heights in inputs:
+        print(f"\n{label} (n = {size})")
+        print("-" * 40)
+
+        updates = []
+        for _ in range(1000):
+            index = random.randrange(size)
+            updates.append((index, max(0, heights[index] + random.randint(-5, 5))))
+
+        container = DynamicContainer(heights)
+        start_time = time.perf_counter()
+        results = []
+        for index, height in updates:
+            container.update(index, height)
+            results.append(container.max_area())
+        dynamic_time = (time.perf_counter() - start_time) / len(updates)
+
+        # Full recompute is O(n) per update, so only a prefix is timed
+        current = heights.copy()
+        sample = 20
+        start_time = time.perf_counter()
+        expected = []
+        for index, height in updates[:sample]:
+            current[index] = height
+            expected.append(largest_container_optimal(current))
+        recompute_time = (time.perf_counter() - start_time) / sample
+
+        print(f"{'Dynamic':20}: {dynamic_time*1e6:10.2f} μs/update+query "
+              f"({1 / dynamic_time:,.0f} ops/s)")
+        print(f"{'Full recompute':20}: {recompute_time*1e6:10.2f} μs/update+query "
+              f"({1 / recompute_time:,.0f} ops/s)")
+        print(f"Speedup: {recompute_time/dynamic_time:.1f}x | "
+              f"Match: {results[:sample] == expected}")
+
+
+def test_trapped_water_implementation():
+    """Check trapped_water, trapped_water_batch and trapped_water_file against the brute force."""
+    import os
+    import random
+    import tempfile
+
+    print("\n" + "=" * 60)
+    print("TRAPPED WATER")
+    print("=" * 60)
+
+    cases = [
+        ([], 0),
+        ([5], 0),
+        ([2, 1], 0),
+        ([0, 1, 0, 2, 1, 0, 1, 3, 2, 1, 2, 1], 6),
+        ([4, 2, 0, 3, 2, 5], 9),
+        ([3, 3, 3], 0),
+        ([5, 1, 5, 1, 5], 8),
+    ]
+    for heights, expected in cases:
+        result = trapped_water(heights)
+        status = "✅" if result == expected else "❌"
+        print(f"{status} trapped_water({heights}) = {result} (expected {expected})")
+
+    random_cases = [[random.randint(0, 50) for _ in range(random.randint(0, 300))]
+                    for _ in range(200)]
+    mismatches = sum(trapped_water(heights) != trapped_water_brute_force(heights)
+                     for heights in random_cases)
+    print(f"Randomized two-pointer checks ({len(random_cases)}): {mismatches} mismatches")
+
+    try:
+        import numpy as np
+    except ImportError:
+        print("Batch checks skipped (NumPy not installed)")
+    else:
+        mismatches = 0
+        for _ in range(20):
+            matrix = np.random.randint(0, 50, size=(random.randint(1, 50), random.randint(1, 80)))
+            expected = [trapped_water(row) for row in matrix.tolist()]
+            for chunk_rows in (None, 1, 7):
+                if trapped_water_batch(matrix, chunk_rows).tolist() != expected:
+                    mismatches += 1
+        print(f"Randomized batch checks (60): {mismatches} mismatches")
+
+        # Floating heights keep their fractions; uint64 beyond int64 is rejected
+        floats = [[1.5, 0, 1.5], [2.25, 0.5, 1.0, 3.0]]
+        expected = [trapped_water_brute_force(row) for row in floats]
+        results = [trapped_water_batch(np.array(row)) for row in floats]
+        results += trapped_water_batch(np.array([[1.5, 0, 1.5, 0.0]]), 1).tolist()
+        expected.append(1.5)
+        status = "✅" if results == expected else "❌"
+        print(f"{status} Float batch rows: {results} (expected {expected})")
+        try:
+            trapped_water_batch(np.array([[2 ** 63 + 5, 0, 2 ** 63 + 5]], dtype=np.uint64))
+            rejected = False
+        except ValueError:
+            rejected = True
+        print(f"{'✅' if rejected else '❌'} uint64 heights beyond int64 rejected")
+
+    fd, path = tempfile.mkstemp(suffix=".bin")
+    os.close(fd)
+    mismatches = 0
+    try:
+        for heights in [heights for heights, _ in cases] + random_cases[:20]:
+            write_heights_file(path, heights)
+            for block_size in (1, 3, 64, 1 << 16):
+                if trapped_water_file(path, block_size=block_size) != trapped_water(heights):
+                    mismatches += 1
+    finally:
+        os.remove(path)
+    print(f"File-backed checks ({len(cases) + 20} files x 4 block sizes): {mismatches} mismatches")
+
+    fd, path = tempfile.mkstemp(suffix=".bin")
+    os.close(fd)
+    try:
+        write_heights_file(path, [1.5, 0, 1.5, 0.25, 1.0], typecode='d')
+        result = trapped_water_file(path, typecode='d', block_size=2)
+    finally:
+        os.remove(path)
+    print(f"{'✅' if result == 2.25 else '❌'} Float file (typecode 'd'): {result} (expected 2.25)")
+
+
+def trapped_water_performance_comparison():
+    """Compare the two-pointer, NumPy batch and memory-mapped trapped-water variants."""
+    import os
+    import time
+    import random
+    import tempfile
+
+    print("\n" + "=" * 60)
+    print("TRAPPED WATER PERFORMANCE COMPARISON")
+    print("=" * 60)
+
+    try:
+        import numpy as np
+    except ImportError:
+        print("Skipped (NumPy not installed)")
+        return
+
+    for size in [10000, 1000000]:
+        heights = [random.randint(0, 1000) for _ in range(size)]
+        array_heights = np.array(heights)
+
+        start_time = time.perf_counter()
+        expected = trapped_water(heights)
+        python_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        result = trapped_water_batch(array_heights)
+        numpy_time = time.perf_counter() - start_time
+
+        print(f"\nSingle series (n = {size})")
+        print("-" * 40)
+        print(f"{'Two-pointer':20}: {python_time*1000:9.2f} ms")
+        print(f"{'NumPy accumulate':20}: {numpy_time*1000:9.2f} ms")
+        print(f"Speedup: {python_time/numpy_time:.1f}x | Match: {result == expected}")
+
+    for m, n in [(10000, 100), (1000, 10000)]:
+        matrix = np.random.randint(0, 1000, size=(m, n))
+        rows = matrix.tolist()
+
+        start_time = time.perf_counter()
+        expected = [trapped_water(row) for row in rows]
+        loop_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        result = trapped_water_batch(matrix)
+        batch_time = time.perf_counter() - start_time
+
+        print(f"\nProfiles: {m} x {n}")
+        print("-" * 40)
+        print(f"{'Python loop':20}: {loop_time*1000:9.2f} ms")
+        print(f"{'Batch (NumPy)':20}: {batch_time*1000:9.2f} ms")
+        print(f"Speedup: {loop_time/batch_time:.1f}x | Match: {result.tolist() == expected}")
+
+    size = 10000000
+    fd, path = tempfile.mkstemp(suffix=".bin")
+    os.close(fd)
+    try:
+        heights = np.random.randint(0, 1000, size=size).astype(np.int32)
+        heights.tofile(path)
+        file_bytes = os.path.getsize(path)
+        expected = trapped_water_batch(heights)
+        del heights
+
+        start_time = time.perf_counter()
+        result = trapped_water_file(path)
+        file_time = time.perf_counter() - start_time
+
+        print(f"\nMemory-mapped file (n = {size}, {file_bytes / 1e6:.0f} MB)")
+        print("-" * 40)
+        print(f"{'Streamed':20}: {file_time*1000:9.2f} ms | "
+              f"{file_bytes / file_time / 1e9:.2f} GB/s | Match: {result == expected}")
+    finally:
+        os.remove(path)
+
+
 def complexity_analysis():
     """Analyze and explain the complexity of different approaches."""
     print("\n" + "=" * 60)
@@ -346,6 +1977,25 @@ def visual_example():
     print(f"\nFinal answer: {max_area}")
 
 
+def register_benchmarks(register):
+    """Benchmarks for benchmark.py: random heights in [0, 10000)."""
+    def make_input(size, rng):
+        return ([rng.randrange(10000) for _ in range(size)],)
+
+    sizes = [1000, 10000, 100000]
+    counters = {"areas": ("loop", "left < right"), "pointer_moves": ("moves", ("left", "right"))}
+    register("largest_container.optimal", largest_container_optimal, make_input, sizes,
+             complexity="n", counters=counters)
+    register("largest_container.skip", largest_container_skip, make_input, sizes,
+             complexity="n", counters=counters)
+    register("largest_container.brute_force", largest_container_brute_force, make_input, [100, 1000],
+             complexity="n^2", counters={"areas": ("loop", "range(i + 1, n)")})
+    register("trapped_water.two_pointer", trapped_water, make_input, sizes,
+             complexity="n", counters={"pointer_moves": ("moves", ("left", "right"))})
+    register("trapped_water.brute_force", trapped_water_brute_force, make_input, [100, 1000],
+             complexity="n^2")
+
+
 if __name__ == '__main__':
     # Original test
     print("Original test case:")
@@ -355,5 +2005,18 @@ if __name__ == '__main__':
     # Comprehensive testing
     test_implementations()
     performance_comparison()
+    test_batch_implementation()
+    batch_performance_comparison()
+    test_file_implementation()
+    file_performance_comparison()
+    skip_performance_comparison()
+    test_topk_implementation()
+    topk_performance_comparison()
+    test_range_query_implementation()
+    range_query_performance_comparison()
+    test_dynamic_implementation()
+    dynamic_performance_comparison()
+    test_trapped_water_implementation()
+    trapped_water_performance_comparison()
     complexity_analysis()
     visual_example()
\ No newline at end of file
@@ -1,4 +1,19 @@
+import os
+import sys
+
+# Shared helpers (buffer_input) live at the repository root
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from buffer_input import as_sequence, exact_int64, numpy_array, wide_array
+
+
 def pair_sum_sorted(lst, sum):
+    values = numpy_array(lst)
+    if values is not None and exact_int64(values, sum):
+        return pair_sum_sorted_vectorized(values, sum)
+    lst = as_sequence(lst)
     if len(lst) > 1:
         i = 0
         j = len(lst) - 1
@@ -13,6 +28,42 @@ def pair_sum_sorted(lst, sum):
     return []
 
 
+def register_benchmarks(register):
+    """Benchmarks for benchmark.py: worst case, the right pointer walks the whole list."""
+    def make_input(size, rng):
+        return sorted(rng.randrange(10 * size) for _ in range(size)), -1
+
+    register("pair_sum_sorted.two_pointer", pair_sum_sorted, make_input, [1000, 10000, 100000],
+             complexity="n", counters={"pointer_moves": ("moves", ("i", "j"))})
+
+
+def pair_sum_sorted_vectorized(values, sum):
+    """
+    pair_sum_sorted over a sorted NumPy array, with the same answer.
+
+    The two pointers never step past a valid pair, so they stop at the
+    smallest i that has a partner, paired with that partner's last
+    occurrence: one searchsorted per element finds both.
+
+    Time Complexity: O(n log n), vectorized
+    Space Complexity: O(n)
+    """
+    import numpy as np
+
+    values = wide_array(values)
+    n = len(values)
+    if n < 2:
+        return []
+    complements = sum - values
+    last = np.searchsorted(values, complements, side="right") - 1
+    last_clipped = np.maximum(last, 0)
+    valid = (last > np.arange(n)) & (values[last_clipped] == complements)
+    if not valid.any():
+        return []
+    i = int(valid.argmax())
+    return [i, int(last[i])]
+
+
 if __name__ == "__main__":
     print(pair_sum_sorted([-5, -2, 3, 4, 6], 7))
 
@@ -1,3 +1,14 @@
+import os
+import sys
+
+# Shared helpers (buffer_input) live at the repository root
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from buffer_input import as_bytes
+
+
 def palindrome_original(word):
     """
     Original implementation with list comprehension.
@@ -76,8 +87,807 @@ def palindrome_regex(word):
     return cleaned == cleaned[::-1]
 
 
+# bytes.translate tables: lowercase ASCII, drop everything that is not [a-zA-Z0-9]
+_BYTES_LOWER = bytes(range(256)).lower()
+_BYTES_NOT_ALNUM = bytes(c for c in range(256) if not bytes([c]).isalnum())
+
+
+def palindrome_bytes(data):
+    """
+    Palindrome check for bytes-like text (bytes, bytearray, memoryview, mmap).
+
+    One bytes.translate pass lowercases and drops non-alphanumerics in C,
+    about 15x faster than the regex on the same text. bytes and bytearray
+    are translated directly; other buffers are first copied with a single
+    memcpy. The caller's data is never modified. Bytes are ASCII, so
+    letters and digits count and everything else, including bytes >= 128,
+    is skipped (the same rule as bytes.isalnum()).
+
+    Time Complexity: O(n)
+    Space Complexity: O(n) - the cleaned copy
+    """
+    if not isinstance(data, (bytes, bytearray)):
+        view = as_bytes(data)
+        data = bytes(view if view is not None else memoryview(data))
+    cleaned = data.translate(_BYTES_LOWER, _BYTES_NOT_ALNUM)
+    return cleaned == cleaned[::-1]
+
+
+def normalize_with_offsets(word):
+    """
+    Normalize a string the same way as palindrome_optimized and keep a map
+    back to the original string.
+
+    Only alphanumeric characters are kept and they are lowercased. offsets[k]
+    is the index in `word` of the character that produced cleaned[k].
+
+    Time Complexity: O(n)
+    Space Complexity: O(n) - cleaned string plus an array('i') of offsets
+
+    Returns:
+        Tuple (cleaned, offsets)
+    """
+    from array import array
+
+    offsets = array('i', [i for i, char in enumerate(word) if char.isalnum()])
+    cleaned = ''.join([word[i].lower() for i in offsets])
+
+    if len(cleaned) != len(offsets):
+        # Some characters lowercase to more than one character (e.g. 'İ'),
+        # so every produced character has to point back at its source.
+        expanded = array('i')
+        for i in offsets:
+            expanded.extend([i] * len(word[i].lower()))
+        offsets = expanded
+
+    return cleaned, offsets
+
+
+def manacher(word):
+    """
+    Manacher's algorithm: palindrome radius around every center.
+
+    The string is normalized like palindrome_optimized. For the m normalized
+    characters there are 2m + 1 centers: even c sit between characters and
+    odd c sit on cleaned[c // 2]. radii[c] is the length of the longest
+    normalized palindrome around center c, which covers cleaned[lo:hi] with
+    lo = (c - radii[c]) // 2 and hi = (c + radii[c]) // 2, i.e. the original
+    span word[offsets[lo]:offsets[hi - 1] + 1].
+
+    Time Complexity: O(n) - the right edge of the rightmost palindrome only
+                     ever moves forward
+    Space Complexity: O(n) - radii kept in a compact array('i')
+
+    Returns:
+        Tuple (radii, offsets)
+    """
+    from array import array
+
+    cleaned, offsets = normalize_with_offsets(word)
+
+    # '#' separators turn even palindromes into odd ones; '^' and '$' stop the
+    # expansion without bounds checks. None of them survive normalization.
+    t = '^#' + '#'.join(cleaned) + '#$'
+    radii = array('i', [0]) * (len(t) - 2)
+
+    center = right = 0
+    for i in range(1, len(t) - 1):
+        if i < right:
+            r = radii[2 * center - i - 1]
+            if r > right - i:
+                r = right - i
+        else:
+            r = 0
+
+        # Expand beyond the mirrored radius
+        while t[i + r + 1] == t[i - r - 1]:
+            r += 1
+
+        radii[i - 1] = r
+        if i + r > right:
+            center, right = i, i + r
+
+    return radii, offsets
+
+
+def longest_palindromic_substring(word):
+    """
+    Longest palindromic substring (normalized) using Manacher's algorithm.
+
+    Time Complexity: O(n)
+    Space Complexity: O(n)
+
+    Returns:
+        Tuple (start, end) such that word[start:end] runs from the first to
+        the last alphanumeric character of the leftmost longest palindrome,
+        or (0, 0) if the string has no alphanumeric characters
+    """
+    radii, offsets = manacher(word)
+    if not offsets:
+        return 0, 0
+
+    best = max(radii)
+    center = radii.index(best)
+    lo = (center - best) // 2
+    hi = (center + best) // 2
+
+    return offsets[lo], offsets[hi - 1] + 1
+
+
+def longest_palindromic_substring_expand(word):
+    """
+    Expand-around-center approach for comparison.
+
+    Time Complexity: O(n²)
+    Space Complexity: O(n) - normalized copy of the string
+    """
+    cleaned, offsets = normalize_with_offsets(word)
+    if not offsets:
+        return 0, 0
+
+    n = len(cleaned)
+    best_lo, best_hi = 0, 1
+
+    for center in range(2 * n - 1):
+        lo = center // 2
+        hi = lo + center % 2
+
+        while lo >= 0 and hi < n and cleaned[lo] == cleaned[hi]:
+            lo -= 1
+            hi += 1
+
+        if hi - lo - 1 > best_hi - best_lo:
+            best_lo, best_hi = lo + 1, hi
+
+    return offsets[best_lo], offsets[best_hi - 1] + 1
+
+
+class PalindromeIndex:
+    """
+    Answers "is word[l:r] a palindrome?" in O(1) after one O(n) pass.
+
+    The string is normalized once (like palindrome_optimized) and forward and
+    reverse polynomial hash prefixes are kept for two independent prime
+    moduli in array('Q') storage. A range is reported as a palindrome when its
+    forward and reverse hashes agree under both moduli; with random bases the
+    chance of a false positive is about n / 2^60 per query.
+
+    Time Complexity: O(n) build, O(1) per query
+    Space Complexity: O(n) - six array('Q') prefixes plus an array('i') rank
+
+    Usage:
+        index = PalindromeIndex(document)
+        index.is_palindrome(l, r)       # same answer as palindrome_optimized(document[l:r])
+        index.query_batch([(l1, r1), (l2, r2)])
+    """
+
+    MOD1 = (1 << 61) - 1
+    MOD2 = 10 ** 18 + 9
+
+    def __init__(self, word):
+        from array import array
+        from itertools import accumulate
+        import random
+
+        cleaned, offsets = normalize_with_offsets(word)
+        m = len(cleaned)
+        mod1, mod2 = self.MOD1, self.MOD2
+        base1 = random.randrange(1 << 20, mod1 - 1)
+        base2 = random.randrange(1 << 20, mod2 - 1)
+
+        # rank[i] = number of normalized characters produced by word[:i], so
+        # an original range [l, r) maps to the normalized range [rank[l], rank[r])
+        counts = array('i', [0]) * (len(word) + 1)
+        for off in offsets:
+            counts[off + 1] += 1
+        self._rank = array('i', accumulate(counts))
+
+        codes = [ord(char) for char in cleaned]
+        forward1 = array('Q', [0]) * (m + 1)
+        forward2 = array('Q', [0]) * (m + 1)
+        reverse1 = array('Q', [0]) * (m + 1)
+        reverse2 = array('Q', [0]) * (m + 1)
+        power1 = array('Q', [1]) * (m + 1)
+        power2 = array('Q', [1]) * (m + 1)
+
+        f1 = f2 = r1 = r2 = 0
+        p1 = p2 = 1
+        for k in range(m):
+            code = codes[k]
+            f1 = (f1 * base1 + code) % mod1
+            f2 = (f2 * base2 + code) % mod2
+            code = codes[m - 1 - k]
+            r1 = (r1 * base1 + code) % mod1
+            r2 = (r2 * base2 + code) % mod2
+            p1 = p1 * base1 % mod1
+            p2 = p2 * base2 % mod2
+            forward1[k + 1] = f1
+            forward2[k + 1] = f2
+            reverse1[k + 1] = r1
+            reverse2[k + 1] = r2
+            power1[k + 1] = p1
+            power2[k + 1] = p2
+
+        self._length = len(word)
+        self._size = m
+        self._forward = (forward1, forward2)
+        self._reverse = (reverse1, reverse2)
+        self._power = (power1, power2)
+
+    def __len__(self):
+        return self._length
+
+    def is_palindrome(self, left, right):
+        """
+        Check whether word[left:right] is a palindrome after normalization.
+
+        Offsets are clamped like slice bounds (negative offsets count from the
+        end).
+
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        left, right, _ = slice(left, right).indices(self._length)
+        if right <= left:
+            return True
+
+        a = self._rank[left]
+        b = self._rank[right]
+        width = b - a
+        if width < 2:
+            return True
+
+        m = self._size
+        forward1, forward2 = self._forward
+        reverse1, reverse2 = self._reverse
+        power1, power2 = self._power
+
+        # cleaned[a:b] reversed is reversed_cleaned[m - b:m - a]
+        mod = self.MOD1
+        if ((forward1[b] - forward1[a] * power1[width]) % mod
+                != (reverse1[m - a] - reverse1[m - b] * power1[width]) % mod):
+            return False
+
+        mod = self.MOD2
+        return ((forward2[b] - forward2[a] * power2[width]) % mod
+                == (reverse2[m - a] - reverse2[m - b] * power2[width]) % mod)
+
+    def query_batch(self, queries):
+        """
+        Answer many (left, right) range queries.
+
+        Time Complexity: O(q)
+        Space Complexity: O(q) - one bool per query
+
+        Returns:
+            List of booleans in query order
+        """
+        is_palindrome = self.is_palindrome
+        return [is_palindrome(left, right) for left, right in queries]
+
+
+class PalindromicTree:
+    """
+    Palindromic tree (eertree) over the normalized text.
+
+    Every node is one distinct palindrome. Node data lives in parallel arrays
+    (length, suffix link, occurrences, end position) and all edges share one
+    dict keyed by node * 0x110000 + code point, so no per-node containers are
+    allocated. Characters are normalized like palindrome_optimized as they are
+    appended, which makes the tree usable on a stream.
+
+    Time Complexity: O(n) amortized build for a fixed alphabet
+    Space Complexity: O(n) - at most n + 2 nodes
+
+    Usage:
+        tree = PalindromicTree("abacaba")
+        tree.extend(" more text")
+        len(tree)                       # number of distinct palindromes
+        dict(tree.items())              # palindrome -> occurrence count
+    """
+
+    _ALPHABET = 0x110000
+
+    def __init__(self, word=""):
+        from array import array
+
+        # Node 0 is the imaginary root of length -1, node 1 the empty string
+        self._length = array('i', [-1, 0])
+        self._link = array('i', [0, 0])
+        self._occurrences = array('q', [0, 0])
+        self._end = array('i', [0, 0])
+        self._edges = {}
+        self._text = array('I')
+        self._last = 1
+        self._counts = None
+
+        self.extend(word)
+
+    def __len__(self):
+        """Number of distinct non-empty palindromic substrings."""
+        return len(self._length) - 2
+
+    def append(self, char):
+        """
+        Append one character of the stream.
+
+        Non-alphanumeric characters are skipped and the rest are lowercased.
+
+        Time Complexity: O(1) amortized
+        """
+        if not char.isalnum():
+            return
+        for lowered in char.lower():
+            self._add(ord(lowered))
+
+    def extend(self, word):
+        """Append every character of `word`."""
+        for char in word:
+            if char.isalnum():
+                for lowered in char.lower():
+                    self._add(ord(lowered))
+
+    def _add(self, code):
+        text = self._text
+        length = self._length
+        link = self._link
+        edges = self._edges
+        alphabet = self._ALPHABET
+
+        pos = len(text)
+        text.append(code)
+        self._counts = None
+
+        # Longest suffix palindrome that can be extended by `code` on both sides
+        cur = self._last
+        while True:
+            before = pos - 1 - length[cur]
+            if before >= 0 and text[before] == code:
+                break
+            cur = link[cur]
+
+        key = cur * alphabet + code
+        node = edges.get(key)
+        if node is not None:
+            self._last = node
+            self._occurrences[node] += 1
+            return
+
+        node_length = length[cur] + 2
+        if node_length == 1:
+            suffix = 1
+        else:
+            suffix = link[cur]
+            while True:
+                before = pos - 1 - length[suffix]
+                if before >= 0 and text[before] == code:
+                    break
+                suffix = link[suffix]
+            suffix = edges[suffix * alphabet + code]
+
+        node = len(length)
+        length.append(node_length)
+        link.append(suffix)
+        self._occurrences.append(1)
+        self._end.append(pos)
+        edges[key] = node
+        self._last = node
+
+    def _occurrence_counts(self):
+        # Each append only credits the longest suffix palindrome; push those
+        # counts down the suffix links. A link always points at an older node,
+        # so one reverse sweep is enough.
+        if self._counts is None:
+            counts = self._occurrences[:]
+            link = self._link
+            for node in range(len(counts) - 1, 1, -1):
+                counts[link[node]] += counts[node]
+            self._counts = counts
+        return self._counts
+
+    def total_occurrences(self):
+        """
+        Number of palindromic substrings counted with multiplicity.
+
+        Time Complexity: O(n) after an append, O(1) while the tree is unchanged
+        """
+        counts = self._occurrence_counts()
+        return sum(counts) - counts[0] - counts[1]
+
+    def __iter__(self):
+        """Iterate over the distinct palindromes in creation order."""
+        for palindrome, _ in self.items():
+            yield palindrome
+
+    def items(self):
+        """
+        Iterate over (palindrome, occurrence count) pairs in creation order.
+
+        Time Complexity: O(total length of the distinct palindromes)
+        """
+        counts = self._occurrence_counts()
+        text = self._text
+        length = self._length
+        end = self._end
+
+        for node in range(2, len(length)):
+            stop = end[node] + 1
+            palindrome = ''.join(map(chr, text[stop - length[node]:stop]))
+            yield palindrome, counts[node]
+
+
+def distinct_palindromes_brute_force(word):
+    """
+    Count every palindromic substring of the normalized string by checking
+    all substrings, for comparison with PalindromicTree.
+
+    Time Complexity: O(n³)
+    Space Complexity: O(n²) - distinct substrings kept in the result
+
+    Returns:
+        Dict mapping palindrome -> occurrence count
+    """
+    cleaned = ''.join(char.lower() for char in word if char.isalnum())
+    counts = {}
+
+    for i in range(len(cleaned)):
+        for j in range(i + 1, len(cleaned) + 1):
+            sub = cleaned[i:j]
+            if sub == sub[::-1]:
+                counts[sub] = counts.get(sub, 0) + 1
+
+    return counts
+
+
+def k_deletion_palindrome_branching(word, k):
+    """
+    Check whether deleting at most k characters makes `word` a palindrome,
+    using the two-pointer skip logic of palindrome_optimized.
+
+    Matching ends are always kept (keeping them never needs more deletions),
+    so the search only branches on a mismatch: delete the left or the right
+    character. Failed (left, right) states are memoized with the largest
+    budget that failed, so each state is explored at most once per budget.
+
+    Time Complexity: O(n) for k = 0, O(n·k) states at worst, far fewer on
+                     near-palindromes
+    Space Complexity: O(k) recursion depth plus the failure memo
+
+    Returns:
+        Sorted list of at most k original indices to delete, or None
+    """
+    failed = {}
+
+    def solve(left, right, budget):
+        while left < right:
+            while left < right and not word[left].isalnum():
+                left += 1
+            while left < right and not word[right].isalnum():
+                right -= 1
+            if left >= right:
+                break
+
+            if word[left].lower() == word[right].lower():
+                left += 1
+                right -= 1
+                continue
+
+            if budget == 0 or failed.get((left, right), -1) >= budget:
+                return None
+
+            rest = solve(left + 1, right, budget - 1)
+            if rest is not None:
+                rest.append(left)
+                return rest
+
+            rest = solve(left, right - 1, budget - 1)
+            if rest is not None:
+                rest.append(right)
+                return rest
+
+            failed[(left, right)] = budget
+            return None
+
+        return []
+
+    deletions = solve(0, len(word) - 1, k)
+    return None if deletions is None else sorted(deletions)
+
+
+def k_deletion_palindrome_banded(word, k):
+    """
+    Minimum-deletion check restricted to a band of width 2k + 1.
+
+    E[i][j] is the number of deletions needed to match the first i normalized
+    characters against the last j ones read backwards. Since E[i][j] >= |i - j|,
+    only cells with |i - j| <= k can stay within budget. The word is a
+    k-deletion palindrome when some cell where the two sides meet
+    (i + j == m, or i + j == m - 1 with a kept middle character) has E <= k.
+    Values are kept in two rolling rows; one byte per band cell records the
+    move for recovering the deleted indices.
+
+    Time Complexity: O(n·k)
+    Space Complexity: O(k) for the DP rows, O(n·k) bytes for the traceback
+
+    Returns:
+        Sorted list of at most k original indices to delete (a minimum set),
+        or None
+    """
+    from array import array
+
+    cleaned, offsets = normalize_with_offsets(word)
+    m = len(cleaned)
+    width = 2 * k + 1
+    infinity = k + 1
+
+    # Band index d = j - i + k; moves: 0 = match, 1 = delete left, 2 = delete right
+    prev = array('i', [infinity]) * (width + 2)
+    moves = bytearray()
+    best = (infinity, 0, 0)
+
+    i = 0
+    while True:
+        low = max(0, i - k)
+        high = min(m - i, i + k)
+        if low > high:
+            break
+
+        cur = array('i', [infinity]) * (width + 2)
+        row_moves = bytearray(width)
+
+        for j in range(low, high + 1):
+            d = j - i + k
+            if i == 0 and j == 0:
+                value, move = 0, 0
+            else:
+                value, move = infinity, 0
+                if i > 0 and j > 0 and cleaned[i - 1] == cleaned[m - j]:
+                    value = prev[d]
+                if i > 0 and prev[d + 1] + 1 < value:
+                    value, move = prev[d + 1] + 1, 1
+                if j > 0 and cur[d - 1] + 1 < value:
+                    value, move = cur[d - 1] + 1, 2
+                if value > infinity:
+                    value = infinity
+
+            cur[d] = value
+            row_moves[d] = move
+
+            if i + j >= m - 1 and value < best[0]:
+                best = (value, i, j)
+
+        moves += row_moves
+        prev = cur
+        i += 1
+
+    if best[0] > k:
+        return None
+
+    _, i, j = best
+    deletions = []
+    while i > 0 or j > 0:
+        move = moves[i * width + j - i + k]
+        if i > 0 and j > 0 and move == 0:
+            i -= 1
+            j -= 1
+        elif i > 0 and (move == 1 or j == 0):
+            deletions.append(offsets[i - 1])
+            i -= 1
+        else:
+            deletions.append(offsets[m - j])
+            j -= 1
+
+    return sorted(set(deletions))
+
+
+K_DELETION_BRANCHING_MAX_K = 16
+
+
+def k_deletion_palindrome(word, k):
+    """
+    Indices to delete so that `word` becomes a palindrome, if at most k are needed.
+
+    Small budgets use the branching two-pointer search, which usually touches
+    each character once; larger budgets use the banded O(n·k) DP, whose cost
+    does not depend on how the mismatches are arranged.
+
+    Returns:
+        Sorted list of at most k original indices to delete, or None
+    """
+    if k <= K_DELETION_BRANCHING_MAX_K:
+        return k_deletion_palindrome_branching(word, k)
+    return k_deletion_palindrome_banded(word, k)
+
+
+def k_deletion_palindrome_brute_force(word, k):
+    """
+    Try every set of at most k deletions, for testing the fast variants.
+
+    Time Complexity: O(n^(k+1))
+    Space Complexity: O(n)
+
+    Returns:
+        Size of the smallest deletion set that works, or None
+    """
+    from itertools import combinations
+
+    candidates = [i for i, char in enumerate(word) if char.isalnum()]
+    for size in range(k + 1):
+        for deleted in combinations(candidates, size):
+            removed = set(deleted)
+            rest = ''.join(char for i, char in enumerate(word) if i not in removed)
+            if palindrome_optimized(rest):
+                return size
+    return None
+
+
+DISPATCH_CACHE_PATH = "~/.cache/advanced-python/palindrome_dispatch.json"
+DISPATCH_PROBE_PAIRS = 4
+
+# Used until this machine has been calibrated. Regex wins from a few dozen
+# characters on typical CPython builds; 64 leaves a margin either way.
+DEFAULT_DISPATCH_THRESHOLDS = {"regex_min_length": 64}
+
+_dispatch_thresholds = None
+
+
+def _dispatch_machine_key():
+    """Calibration results are only valid for the machine and interpreter that produced them."""
+    import platform
+    return "|".join([platform.node(), platform.machine(),
+                     platform.python_implementation(), platform.python_version()])
+
+
+def _read_dispatch_cache(path):
+    import json
+
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_palindrome_dispatch(cache_path=DISPATCH_CACHE_PATH):
+    """
+    Thresholds for palindrome_dispatch without timing anything: this
+    machine's cached calibration if there is one, DEFAULT_DISPATCH_THRESHOLDS
+    otherwise. Never writes to disk.
+    """
+    import os
+
+    global _dispatch_thresholds
+
+    cache = _read_dispatch_cache(os.path.expanduser(cache_path))
+    _dispatch_thresholds = cache.get(_dispatch_machine_key(), DEFAULT_DISPATCH_THRESHOLDS)
+    return _dispatch_thresholds
+
+
+def calibrate_palindrome_dispatch(cache_path=DISPATCH_CACHE_PATH, force=False):
+    """
+    Find the input length above which palindrome_regex beats
+    palindrome_optimized on this machine, and cache it on disk.
+
+    Both are timed on true ASCII palindromes (the case where the two-pointer
+    scan has to walk the whole string) of doubling length. The threshold is
+    the shortest length from which regex wins at every longer length, or None
+    if it never does. Results are stored per machine key in a JSON file;
+    a failure to write the cache only costs a recalibration next time.
+
+    Returns:
+        Dict with 'regex_min_length'
+    """
+    import json
+    import os
+    import random
+    import time
+
+    global _dispatch_thresholds
+
+    path = os.path.expanduser(cache_path)
+    key = _dispatch_machine_key()
+
+    cache = _read_dispatch_cache(path)
+    if not force and key in cache:
+        _dispatch_thresholds = cache[key]
+        return _dispatch_thresholds
+
+    def best_time(func, word):
+        loops = 1
+        while True:
+            start_time = time.perf_counter()
+            for _ in range(loops):
+                func(word)
+            elapsed = time.perf_counter() - start_time
+            if elapsed > 0.002:
+                break
+            loops *= 2
+        timings = [elapsed]
+        for _ in range(2):
+            start_time = time.perf_counter()
+            for _ in range(loops):
+                func(word)
+            timings.append(time.perf_counter() - start_time)
+        return min(timings) / loops
+
+    rng = random.Random(0)
+    regex_min_length = None
+    for length in [2 ** k for k in range(3, 14)]:
+        half = ''.join(rng.choice("abcXYZ019 ,!") for _ in range(length // 2))
+        word = half + half[::-1]
+        if best_time(palindrome_regex, word) < best_time(palindrome_optimized, word):
+            if regex_min_length is None:
+                regex_min_length = length
+        else:
+            regex_min_length = None
+
+    thresholds = {"regex_min_length": regex_min_length}
+    cache[key] = thresholds
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(cache, f, indent=2)
+    except OSError:
+        pass
+
+    _dispatch_thresholds = thresholds
+    return thresholds
+
+
+def palindrome_dispatch(word):
+    """
+    Pick the fastest implementation for this input.
+
+    - Bytes-like input goes to palindrome_bytes, which reads it in place.
+    - Non-ASCII input always goes to palindrome_optimized: the regex only
+      keeps [a-zA-Z0-9], which differs from str.isalnum() outside ASCII.
+    - Short input goes to palindrome_optimized, which has no setup cost.
+    - Long ASCII input first compares a few outer alphanumeric pairs. Most
+      non-palindromes fail there, which is where palindrome_optimized is
+      hundreds of times faster. Input that survives the probe is most likely
+      a palindrome that needs a full scan, where palindrome_regex is faster.
+
+    The length threshold is the cached result of calibrate_palindrome_dispatch()
+    for this machine, or DEFAULT_DISPATCH_THRESHOLDS if it was never run; the
+    first call only reads the cache, it does not calibrate.
+
+    Time Complexity: O(n)
+    Space Complexity: O(1) for the two-pointer path, O(n) for the regex path
+    """
+    if not isinstance(word, str):
+        return palindrome_bytes(word)
+
+    thresholds = _dispatch_thresholds or load_palindrome_dispatch()
+    regex_min_length = thresholds["regex_min_length"]
+
+    n = len(word)
+    if regex_min_length is None or n < regex_min_length or not word.isascii():
+        return palindrome_optimized(word)
+
+    left = 0
+    right = n - 1
+    pairs = DISPATCH_PROBE_PAIRS
+
+    while pairs and left < right:
+        while left < right and not word[left].isalnum():
+            left += 1
+        while left < right and not word[right].isalnum():
+            right -= 1
+
+        if word[left].lower() != word[right].lower():
+            return False
+
+        left += 1
+        right -= 1
+        pairs -= 1
+
+    if left >= right:
+        return True
+    return palindrome_regex(word)
+
+
 # Alias for backward compatibility
-palindrome = palindrome_optimized
+palindrome = palindrome_dispatch
 
 
 def test_palindrome_implementations():
@@ -102,7 +912,8 @@ def test_palindrome_implementations():
         ("Original", palindrome_original),
         ("Optimized", palindrome_optimized),
         ("Pythonic", palindrome_pythonic),
-        ("Regex", palindrome_regex)
+        ("Regex", palindrome_regex),
+        ("Dispatch", palindrome_dispatch),
     ]
     
     print("Testing Palindrome Implementations")
@@ -130,18 +941,36 @@ def test_palindrome_implementations():
         if all_match:
             print("  🎉 All implementations agree!")
 
+    # Without a cached calibration the dispatch uses the built-in default and
+    # leaves the disk alone; timing only happens on an explicit calibrate call
+    import os
+    import tempfile
+
+    global _dispatch_thresholds
+    saved = _dispatch_thresholds
+    with tempfile.TemporaryDirectory() as tmp:
+        missing = os.path.join(tmp, "dispatch.json")
+        thresholds = load_palindrome_dispatch(missing)
+        ok = thresholds == DEFAULT_DISPATCH_THRESHOLDS and not os.path.exists(missing)
+    _dispatch_thresholds = saved
+    print(f"\n{'✅' if ok else '❌'} Uncalibrated dispatch uses the default threshold "
+          f"without writing a cache")
+
+
+# Test data of varying sizes, shared by the performance comparisons
+PERFORMANCE_TEST_STRINGS = [
+    "A man a plan a canal Panama" * 10,          # ~270 chars
+    "race a car! " * 50,                         # ~600 chars  
+    "Was it a car or a cat I saw? " * 100,       # ~3000 chars
+    "12321abcde" * 500,                          # ~5000 chars
+]
+
 
 def performance_comparison():
     """Compare performance of different palindrome implementations."""
     import time
     
-    # Test data of varying sizes
-    test_strings = [
-        "A man a plan a canal Panama" * 10,          # ~270 chars
-        "race a car! " * 50,                         # ~600 chars  
-        "Was it a car or a cat I saw? " * 100,       # ~3000 chars
-        "12321abcde" * 500,                          # ~5000 chars
-    ]
+    test_strings = PERFORMANCE_TEST_STRINGS
     
     implementations = [
         ("Original", palindrome_original),
@@ -190,38 +1019,436 @@ def performance_comparison():
                 print(f"{name} vs Original: {speedup:.2f}x {'faster' if speedup > 1 else 'slower'}")
 
 
+def dispatch_performance_comparison():
+    """Compare palindrome_dispatch with every single implementation on the shared corpus."""
+    import time
+
+    implementations = [
+        ("Original", palindrome_original),
+        ("Optimized", palindrome_optimized),
+        ("Pythonic", palindrome_pythonic),
+        ("Regex", palindrome_regex),
+        ("Dispatch", palindrome_dispatch),
+    ]
+
+    thresholds = calibrate_palindrome_dispatch()
+
+    print("\n" + "=" * 60)
+    print("DISPATCH PERFORMANCE COMPARISON")
+    print("=" * 60)
+    print(f"Calibrated thresholds: {thresholds}")
+
+    totals = {name: 0.0 for name, _ in implementations}
+
+    for i, test_string in enumerate(PERFORMANCE_TEST_STRINGS):
+        print(f"\nTest String {i+1} (Length: {len(test_string)} chars)")
+        print("-" * 40)
+
+        times = {}
+        for name, func in implementations:
+            for _ in range(10):
+                func(test_string)
+
+            # Best of 5 rounds to keep scheduler noise out of the comparison
+            rounds = []
+            for _ in range(5):
+                start_time = time.perf_counter()
+                for _ in range(200):
+                    result = func(test_string)
+                rounds.append((time.perf_counter() - start_time) / 200)
+
+            times[name] = min(rounds)
+            totals[name] += times[name]
+            print(f"{name:12}: {times[name]*1000000:.2f} μs/call -> {result}")
+
+        best_single = min((t, n) for n, t in times.items() if n != "Dispatch")
+        print(f"\nBest single: {best_single[1]} ({best_single[0]*1000000:.2f} μs), "
+              f"Dispatch: {times['Dispatch']*1000000:.2f} μs "
+              f"({best_single[0] / times['Dispatch']:.2f}x)")
+
+    print("\nWhole corpus (sum of per-string averages):")
+    for name, total in totals.items():
+        print(f"  {name:12}: {total*1000000:.2f} μs")
+
+
 def memory_analysis():
-    """Analyze memory usage of different implementations."""
-    import sys
-    
-    test_string = "A man a plan a canal Panama! " * 100  # ~3000 chars
-    
+    """Measure the peak memory each implementation allocates with tracemalloc."""
+    import tracemalloc
+
     print("\n" + "=" * 60)
     print("MEMORY ANALYSIS")
     print("=" * 60)
-    
-    def get_size_mb(obj):
-        return sys.getsizeof(obj) / 1024 / 1024
-    
-    print(f"Input string size: {get_size_mb(test_string):.4f} MB")
-    print(f"Input string length: {len(test_string)} characters")
-    
-    # Original implementation memory usage
-    print(f"\nOriginal Implementation:")
-    lst = [w for w in test_string if w.isalnum()]
-    print(f"  Filtered list size: {get_size_mb(lst):.4f} MB")
-    print(f"  Filtered list length: {len(lst)} characters")
-    print(f"  Memory overhead: {get_size_mb(lst) / get_size_mb(test_string):.2f}x")
-    
-    # Pythonic implementation memory usage  
-    print(f"\nPythonic Implementation:")
-    cleaned = ''.join(char.lower() for char in test_string if char.isalnum())
-    print(f"  Cleaned string size: {get_size_mb(cleaned):.4f} MB")
-    print(f"  Reversed string size: {get_size_mb(cleaned[::-1]):.4f} MB")
-    print(f"  Total memory overhead: {(get_size_mb(cleaned) * 2) / get_size_mb(test_string):.2f}x")
-    
-    print(f"\nOptimized Implementation:")
-    print(f"  Additional memory: ~0 MB (O(1) space complexity)")
+
+    implementations = [
+        ("Original", palindrome_original),
+        ("Optimized", palindrome_optimized),
+        ("Pythonic", palindrome_pythonic),
+        ("Regex", palindrome_regex),
+    ]
+
+    for repeats in (100, 1000, 10000):
+        test_string = "A man a plan a canal Panama! " * repeats
+        print(f"\nInput: {len(test_string):,} characters "
+              f"({len(test_string.encode()) / 1024:.1f} KB as ASCII)")
+        print("-" * 40)
+        for name, func in implementations:
+            # Warm up first so the regex cache is not charged to the call
+            func(test_string)
+            tracemalloc.start()
+            try:
+                start_bytes = tracemalloc.get_traced_memory()[0]
+                func(test_string)
+                peak_bytes = tracemalloc.get_traced_memory()[1] - start_bytes
+            finally:
+                tracemalloc.stop()
+            print(f"{name:12}: peak {peak_bytes / 1024:10.1f} KB "
+                  f"({peak_bytes / len(test_string):6.2f} bytes/char)")
+
+
+def test_longest_palindrome():
+    """Test Manacher against expand-around-center and palindrome_optimized."""
+    import random
+
+    test_cases = [
+        ("", ""),
+        ("!!", ""),
+        ("a", "a"),
+        ("ab", "a"),
+        ("babad", "bab"),
+        ("cbbd", "bb"),
+        ("xx A man, a plan, a canal: Panama! yy", "A man, a plan, a canal: Panama"),
+        ("race a car", "a ca"),
+        ("No 'x' in Nixon.", "No 'x' in Nixon"),
+        ("abc12321", "12321"),
+    ]
+
+    print("\n" + "=" * 60)
+    print("LONGEST PALINDROMIC SUBSTRING")
+    print("=" * 60)
+
+    for i, (test_input, expected) in enumerate(test_cases):
+        start, end = longest_palindromic_substring(test_input)
+        expand = longest_palindromic_substring_expand(test_input)
+        result = test_input[start:end]
+        status = "✅" if result == expected and expand == (start, end) else "❌"
+        print(f"  {status} Test Case {i+1}: '{test_input}' -> '{result}'")
+
+    # Randomized cross-check on a small alphabet so palindromes are common
+    mismatches = 0
+    for _ in range(300):
+        word = ''.join(random.choice("aAb ,1") for _ in range(random.randint(0, 40)))
+        start, end = longest_palindromic_substring(word)
+        if (start, end) != longest_palindromic_substring_expand(word):
+            mismatches += 1
+        elif not palindrome_optimized(word[start:end]):
+            mismatches += 1
+    print(f"\nRandomized cross-check (300 strings): {mismatches} mismatches")
+
+
+def longest_palindrome_performance():
+    """Compare Manacher O(n) with expand-around-center O(n²)."""
+    import time
+    import random
+
+    print("\n" + "=" * 60)
+    print("LONGEST PALINDROME PERFORMANCE")
+    print("=" * 60)
+
+    sizes = [1000, 10000, 100000, 1000000]
+
+    for size in sizes:
+        print(f"\nString length: {size}")
+        print("-" * 40)
+
+        inputs = [
+            ("Random", ''.join(random.choice("ab, ") for _ in range(size))),
+            ("Repeated", "a" * size),
+        ]
+
+        for label, word in inputs:
+            start_time = time.perf_counter()
+            result = longest_palindromic_substring(word)
+            manacher_time = time.perf_counter() - start_time
+
+            # Expand-around-center is quadratic on repetitive input
+            if size > 10000 or (label == "Repeated" and size > 1000):
+                print(f"{label:9} Manacher: {manacher_time*1000:9.2f} ms | "
+                      f"Expand: skipped (too slow) -> length {result[1] - result[0]}")
+                continue
+
+            start_time = time.perf_counter()
+            expand_result = longest_palindromic_substring_expand(word)
+            expand_time = time.perf_counter() - start_time
+
+            print(f"{label:9} Manacher: {manacher_time*1000:9.2f} ms | "
+                  f"Expand: {expand_time*1000:9.2f} ms | "
+                  f"Speedup: {expand_time/manacher_time:.2f}x | "
+                  f"Match: {result == expand_result}")
+
+
+def test_palindrome_index():
+    """Cross-check PalindromeIndex range queries against palindrome_optimized."""
+    import random
+
+    print("\n" + "=" * 60)
+    print("PALINDROME RANGE-QUERY INDEX")
+    print("=" * 60)
+
+    document = "a dog! a panic in a pagoda. race a car, No 'x' in Nixon"
+    index = PalindromeIndex(document)
+    test_cases = [(0, 27), (0, 5), (28, 38), (40, 55), (3, 3), (-15, None)]
+
+    for left, right in test_cases:
+        expected = palindrome_optimized(document[left:right])
+        result = index.is_palindrome(left, right)
+        status = "✅" if result == expected else "❌"
+        print(f"  {status} [{left}:{right}] '{document[left:right]}' -> {result}")
+
+    mismatches = 0
+    for _ in range(20):
+        word = ''.join(random.choice("aAb .1") for _ in range(random.randint(0, 60)))
+        index = PalindromeIndex(word)
+        queries = [(random.randint(0, len(word)), random.randint(0, len(word)))
+                   for _ in range(50)]
+        results = index.query_batch(queries)
+        for (left, right), result in zip(queries, results):
+            if result != palindrome_optimized(word[left:right]):
+                mismatches += 1
+    print(f"\nRandomized cross-check (1000 queries): {mismatches} mismatches")
+
+
+def palindrome_index_performance():
+    """Compare PalindromeIndex queries with slicing plus palindrome_optimized."""
+    import time
+    import random
+
+    print("\n" + "=" * 60)
+    print("PALINDROME INDEX PERFORMANCE")
+    print("=" * 60)
+
+    # A palindromic document makes every window comparison run to the middle,
+    # which is the case where slicing plus scanning hurts the most.
+    half = ''.join(random.choice("ab, ") for _ in range(50000))
+    document = half + half[::-1]
+    num_queries = 100000
+
+    start_time = time.perf_counter()
+    index = PalindromeIndex(document)
+    build_time = time.perf_counter() - start_time
+    print(f"Document length: {len(document)} chars, build: {build_time*1000:.2f} ms")
+
+    for window in [10, 100, 1000]:
+        queries = []
+        for _ in range(num_queries):
+            center = random.randint(window, len(document) - window)
+            # Half the queries are centered on the document's mirror point
+            if random.random() < 0.5:
+                center = len(half)
+            queries.append((center - window // 2, center + window // 2))
+
+        start_time = time.perf_counter()
+        results = index.query_batch(queries)
+        index_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        expected = [palindrome_optimized(document[left:right]) for left, right in queries]
+        slice_time = time.perf_counter() - start_time
+
+        print(f"\nWindow {window:5}: {num_queries} queries")
+        print(f"  Index:         {index_time / num_queries * 1e6:8.3f} μs/query")
+        print(f"  Slice + scan:  {slice_time / num_queries * 1e6:8.3f} μs/query")
+        print(f"  Speedup: {slice_time / index_time:.2f}x | Match: {results == expected}")
+
+
+def test_palindromic_tree():
+    """Cross-check PalindromicTree against the brute-force substring count."""
+    import random
+
+    print("\n" + "=" * 60)
+    print("PALINDROMIC TREE (EERTREE)")
+    print("=" * 60)
+
+    test_cases = ["", "a", "aaa", "abacaba", "Madam, I'm Adam", "a dog! a panic in a pagoda."]
+
+    for i, test_input in enumerate(test_cases):
+        tree = PalindromicTree(test_input)
+        expected = distinct_palindromes_brute_force(test_input)
+        result = dict(tree.items())
+        status = "✅" if result == expected else "❌"
+        print(f"  {status} Test Case {i+1}: '{test_input}' -> {len(tree)} distinct, "
+              f"{tree.total_occurrences()} total")
+
+    # Streaming appends must give the same tree as a single build
+    mismatches = 0
+    for _ in range(200):
+        word = ''.join(random.choice("abA .") for _ in range(random.randint(0, 40)))
+        tree = PalindromicTree()
+        for char in word:
+            tree.append(char)
+            tree.total_occurrences()  # Query between appends
+        if dict(tree.items()) != distinct_palindromes_brute_force(word):
+            mismatches += 1
+    print(f"\nRandomized streaming cross-check (200 strings): {mismatches} mismatches")
+
+
+def palindromic_tree_performance():
+    """Compare the eertree build with the O(n³) substring enumeration."""
+    import time
+    import random
+
+    print("\n" + "=" * 60)
+    print("PALINDROMIC TREE PERFORMANCE")
+    print("=" * 60)
+
+    for size in [100, 300, 1000, 100000, 1000000]:
+        word = ''.join(random.choice("abc") for _ in range(size))
+
+        start_time = time.perf_counter()
+        tree = PalindromicTree(word)
+        total = tree.total_occurrences()
+        tree_time = time.perf_counter() - start_time
+
+        print(f"\nString length: {size}")
+        print("-" * 40)
+        print(f"Eertree:     {tree_time*1000:10.2f} ms -> {len(tree)} distinct, {total} total")
+
+        if size > 1000:
+            print("Brute Force: Skipped (too slow)")
+            continue
+
+        start_time = time.perf_counter()
+        expected = distinct_palindromes_brute_force(word)
+        brute_time = time.perf_counter() - start_time
+
+        print(f"Brute Force: {brute_time*1000:10.2f} ms -> {len(expected)} distinct")
+        print(f"Speedup: {brute_time/tree_time:.2f}x | Match: {dict(tree.items()) == expected}")
+
+
+def test_k_deletion_palindrome():
+    """Check the k-deletion variants against exhaustive search."""
+    import random
+
+    print("\n" + "=" * 60)
+    print("K-DELETION NEAR-PALINDROME")
+    print("=" * 60)
+
+    # Expected size of a minimum deletion set, or None if k is not enough
+    test_cases = [
+        ("", 0, 0),
+        ("abca", 1, 1),
+        ("abc", 1, None),
+        ("race a car", 1, 1),
+        ("A man, a plxan, a canal: Panama", 1, 1),
+        ("ID 12x3-3z21 DI", 2, 2),
+        ("ID 12x3-3z21 DI", 1, None),
+    ]
+
+    implementations = [
+        ("Branching", k_deletion_palindrome_branching),
+        ("Banded", k_deletion_palindrome_banded),
+    ]
+
+    def removes_to_palindrome(word, deletions):
+        removed = set(deletions)
+        return palindrome_optimized(''.join(c for j, c in enumerate(word) if j not in removed))
+
+    for i, (test_input, k, expected) in enumerate(test_cases):
+        print(f"\nTest Case {i+1}: '{test_input}', k={k} -> Expected deletions: {expected}")
+        for name, func in implementations:
+            result = func(test_input, k)
+            if result is None:
+                correct = expected is None
+            else:
+                correct = (expected is not None and len(result) <= k
+                           and removes_to_palindrome(test_input, result))
+            status = "✅" if correct else "❌"
+            print(f"  {status} {name:10}: {result}")
+
+    mismatches = 0
+    for _ in range(300):
+        word = ''.join(random.choice("abcA -") for _ in range(random.randint(0, 12)))
+        k = random.randint(0, 3)
+        expected = k_deletion_palindrome_brute_force(word, k)
+        for _, func in implementations:
+            result = func(word, k)
+            if (result is None) != (expected is None):
+                mismatches += 1
+            elif result is not None and (len(result) > k or not removes_to_palindrome(word, result)):
+                mismatches += 1
+        banded = k_deletion_palindrome_banded(word, k)
+        if banded is not None and len(banded) != expected:
+            mismatches += 1  # The banded DP must find a minimum deletion set
+    print(f"\nRandomized cross-check vs brute force (300 cases): {mismatches} mismatches")
+
+
+def k_deletion_performance():
+    """
+    Compare the branching search and the banded DP for k = 1..16, plus two
+    larger budgets that show where the banded DP's O(n·k) bound takes over.
+    """
+    import time
+    import random
+
+    print("\n" + "=" * 60)
+    print("K-DELETION PERFORMANCE")
+    print("=" * 60)
+
+    size = 2000
+    half = ''.join(random.choice("abcdefgh") for _ in range(size // 2))
+    base = half + half[::-1]
+
+    print(f"Palindrome of {size} chars with k random insertions (feasible) "
+          f"and k + 1 insertions (usually infeasible)")
+    print(f"\n{'k':>3} | {'Branching':>12} {'Banded':>12} | "
+          f"{'Branching':>12} {'Banded':>12}")
+    print(f"{'':>3} | {'feasible (ms)':>25} | {'infeasible (ms)':>25}")
+    print("-" * 60)
+
+    for k in list(range(1, 17)) + [32, 64]:
+        row = []
+        for extra in (0, 1):
+            word = list(base)
+            for _ in range(k + extra):
+                word.insert(random.randint(0, len(word)), random.choice("xyz"))
+            word = ''.join(word)
+
+            for func in (k_deletion_palindrome_branching, k_deletion_palindrome_banded):
+                start_time = time.perf_counter()
+                func(word, k)
+                row.append((time.perf_counter() - start_time) * 1000)
+
+        print(f"{k:>3} | {row[0]:12.2f} {row[1]:12.2f} | {row[2]:12.2f} {row[3]:12.2f}")
+
+
+def register_benchmarks(register):
+    """Benchmarks for benchmark.py: punctuated palindromes (full scan) and random two-letter text."""
+    def make_palindrome(size, rng):
+        half = rng.choices("abcdefgh ,.!AB", k=size // 2)
+        return (''.join(half) + ''.join(reversed(half)),)
+
+    def make_text(size, rng):
+        return (''.join(rng.choices("ab", k=size)),)
+
+    sizes = [1000, 10000, 100000]
+    counters = {"isalnum_calls": ("calls", "isalnum"), "lower_calls": ("calls", "lower")}
+    register("palindrome.original", palindrome_original, make_palindrome, sizes, complexity="n",
+             counters=counters)
+    register("palindrome.optimized", palindrome_optimized, make_palindrome, sizes, complexity="n",
+             counters=counters)
+    register("palindrome.pythonic", palindrome_pythonic, make_palindrome, sizes, complexity="n",
+             counters=counters)
+    register("palindrome.regex", palindrome_regex, make_palindrome, sizes, complexity="n")
+    def make_calibrated_palindrome(size, rng):
+        # Benchmarks time the calibrated dispatch; input setup is not timed
+        calibrate_palindrome_dispatch()
+        return make_palindrome(size, rng)
+
+    register("palindrome.dispatch", palindrome_dispatch, make_calibrated_palindrome, sizes,
+             complexity="n")
+    register("longest_palindrome.manacher", longest_palindromic_substring, make_text, sizes,
+             complexity="n")
+    register("longest_palindrome.expand", longest_palindromic_substring_expand, make_text,
+             [1000, 10000], complexity="n^2")
 
 
 if __name__ == "__main__":
@@ -232,7 +1459,16 @@ if __name__ == "__main__":
     # Run comprehensive tests
     test_palindrome_implementations()
     performance_comparison()
+    dispatch_performance_comparison()
     memory_analysis()
+    test_longest_palindrome()
+    longest_palindrome_performance()
+    test_palindrome_index()
+    palindrome_index_performance()
+    test_palindromic_tree()
+    palindromic_tree_performance()
+    test_k_deletion_palindrome()
+    k_deletion_performance()
 
 '''
 Original test case:
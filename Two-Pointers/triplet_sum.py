@@ -1,21 +1,36 @@
+import os
+import sys
+
+# Shared helpers (buffer_input) live at the repository root
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from buffer_input import as_sequence, exact_int64, numpy_array, wide_array
+
+
 def triplet_sum(lst):
     """
     Find all unique triplets in the array that sum to zero.
     
     Time Complexity: O(n²)
-    Space Complexity: O(1) auxiliary space
+    Space Complexity: O(n) for the sorted copy
     
     Args:
-        lst: List of integers
+        lst: List of integers, or any 1-D numeric buffer; it is not modified,
+             and long buffers go to triplet_sum_vectorized
     
     Returns:
         List of triplets that sum to zero
     """
+    values = numpy_array(lst)
+    if values is not None and exact_int64(values):
+        return triplet_sum_vectorized(values)
     if len(lst) < 3:
         return []
     
     triplets = []
-    lst.sort()  # O(n log n)
+    lst = sorted(as_sequence(lst))  # O(n log n), leaves the caller's data alone
     
     for i in range(len(lst) - 2):  # Fix the first element
         # Skip positive numbers as first element (optimization)
@@ -59,13 +74,16 @@ def triplet_sum_optimized(lst):
     Alternative implementation with additional optimizations.
     
     Time Complexity: O(n²)
-    Space Complexity: O(1) auxiliary space
+    Space Complexity: O(n) for the sorted copy
     """
+    values = numpy_array(lst)
+    if values is not None and exact_int64(values):
+        return triplet_sum_vectorized(values)
     if len(lst) < 3:
         return []
     
     triplets = []
-    lst.sort()
+    lst = sorted(as_sequence(lst))
     
     for i in range(len(lst) - 2):
         # Early termination: if smallest element > 0, no triplet can sum to 0
@@ -109,6 +127,68 @@ def triplet_sum_optimized(lst):
     return triplets
 
 
+def triplet_sum_vectorized(values, block_size=1 << 20):
+    """
+    triplet_sum over a NumPy array, with the same triplets in the same order.
+
+    Works on the u distinct values and their counts. Every (a, x) pair with
+    a <= 0 and x >= a is paired with y = -a - x, a block of first values at a
+    time (about `block_size` pairs); a triplet is kept when y >= x exists and
+    each value occurs as often as the triplet uses it. y is looked up by
+    direct indexing into a count table when the values are integers in a
+    compact range, by searchsorted otherwise. Row-major order over (a, x) is
+    the order triplet_sum emits them in.
+
+    Time Complexity: O(u² log u), vectorized
+    Space Complexity: O(block_size)
+    """
+    import numpy as np
+
+    values = wide_array(values)
+    if len(values) < 3:
+        return []
+    distinct, counts = np.unique(values, return_counts=True)
+    u = len(distinct)
+    non_positive = int(np.searchsorted(distinct, 0, side="right"))
+    rows_per_block = max(1, block_size // u)
+    columns = np.arange(u)
+    triplets = []
+
+    low = int(distinct[0])
+    span = int(distinct[-1]) - low + 1
+    table = None
+    if distinct.dtype.kind in "iu" and span <= 4 * u + 1024:
+        distinct = distinct.astype(np.int64)
+        table = np.zeros(span, dtype=np.int64)
+        table[distinct - low] = counts
+
+    for start in range(0, non_positive, rows_per_block):
+        rows = np.arange(start, min(start + rows_per_block, non_positive))
+        a = distinct[rows][:, None]
+        x = distinct[None, :]
+        y = -a - x
+        keep = (columns[None, :] >= rows[:, None]) & (y >= x)
+        if table is not None:
+            offset = y - low
+            inside = (offset >= 0) & (offset < span)
+            keep &= inside
+            keep &= table[np.where(inside, offset, 0)] > 0
+        else:
+            y_index = np.minimum(np.searchsorted(distinct, y), u - 1)
+            keep &= distinct[y_index] == y
+        # Occurrences each triplet needs of a, x and y
+        need_a = 1 + (x == a) + (y == a)
+        need_x = 1 + (y == x)
+        keep &= (need_a <= counts[rows][:, None]) & ((x == a) | (need_x <= counts[None, :]))
+        row_hits, column_hits = np.nonzero(keep)
+        a_values = distinct[rows[row_hits]].tolist()
+        x_values = distinct[column_hits].tolist()
+        y_values = y[row_hits, column_hits].tolist()
+        triplets.extend(map(list, zip(a_values, x_values, y_values)))
+
+    return triplets
+
+
 def test_triplet_implementations():
     """Test both implementations with various test cases."""
     test_cases = [
@@ -128,8 +208,8 @@ def test_triplet_implementations():
     for i, test_case in enumerate(test_cases):
         print(f"\nTest Case {i+1}: {test_case}")
         
-        result1 = triplet_sum(test_case.copy())
-        result2 = triplet_sum_optimized(test_case.copy())
+        result1 = triplet_sum(test_case)
+        result2 = triplet_sum_optimized(test_case)
         
         print(f"Standard:  {result1}")
         print(f"Optimized: {result2}")
@@ -157,12 +237,12 @@ def performance_comparison():
         
         # Test standard implementation
         start_time = time.time()
-        result1 = triplet_sum(test_data.copy())
+        result1 = triplet_sum(test_data)
         time1 = time.time() - start_time
         
         # Test optimized implementation  
         start_time = time.time()
-        result2 = triplet_sum_optimized(test_data.copy())
+        result2 = triplet_sum_optimized(test_data)
         time2 = time.time() - start_time
         
         print(f"Standard implementation:  {time1:.6f}s ({len(result1)} triplets)")
@@ -171,6 +251,25 @@ def performance_comparison():
         print(f"Results match: {set(map(tuple, result1)) == set(map(tuple, result2))}")
 
 
+def register_benchmarks(register):
+    """Benchmarks for benchmark.py: random ints in [-n, n], so many triplets and duplicates."""
+    def make_input(size, rng):
+        return ([rng.randint(-size, size) for _ in range(size)],)
+
+    counters = {
+        "two_pointer_steps": ("loop", "left < right"),
+        "pointer_moves": ("moves", ("left", "right")),
+        "first_duplicate_skips": ("branch", "i > 0 and lst[i] == lst[i - 1]"),
+        "left_duplicate_skips": ("loop", "left < right and lst[left] == lst[left + 1]"),
+        "right_duplicate_skips": ("loop", "left < right and lst[right] == lst[right - 1]"),
+    }
+
+    register("triplet_sum.standard", triplet_sum, make_input, [100, 300, 1000],
+             complexity="n^2", counters=counters)
+    register("triplet_sum.optimized", triplet_sum_optimized, make_input, [100, 300, 1000],
+             complexity="n^2", counters=counters)
+
+
 if __name__ == "__main__":
     test_triplet_implementations()
     performance_comparison()
@@ -185,7 +284,7 @@ if __name__ == "__main__":
 - **Time Complexity**: O(n²)
   - O(n log n) for sorting
   - O(n²) for the main algorithm (n iterations × n two-pointer traversal)
-- **Space Complexity**: O(1) auxiliary space (excluding output)
+- **Space Complexity**: O(n) for the sorted copy (excluding output); the caller's list is not modified
 
 ## Key Improvements
 
@@ -251,7 +350,7 @@ if lst[i] + lst[-2] + lst[-1] < 0:
 
 ### Strengths
 - **Optimal Time Complexity**: O(n²) is the best possible for this problem
-- **Space Efficient**: O(1) auxiliary space
+- **Space Efficient**: O(n) auxiliary space, only the sorted copy
 - **Handles Duplicates**: Ensures unique triplets only
 - **Robust**: Works correctly for all edge cases
 
@@ -0,0 +1,777 @@
+"""
+Unified benchmark harness for the algorithm modules.
+
+Every module defines `register_benchmarks(register)` and calls `register`
+once per implementation. This script loads the modules by file path (their
+directories are not packages), collects the registrations, and times them
+all the same way:
+
+- inputs come from make_input(size, rng), with rng seeded from
+  (--seed, benchmark name, size), so every run and every machine times the
+  same data;
+- each benchmark is warmed up, then timed for --repeat rounds with
+  time.perf_counter_ns; each round runs as many calls as fit in
+  --min-time so short calls are not dominated by timer resolution;
+- per-call times are summarised as median and interquartile range;
+- with --memory, each (benchmark, size) also runs once in a fresh child
+  process, which records the peak RSS increase of the call and then,
+  under tracemalloc, its peak traced allocation and the blocks still held
+  by its result;
+- with --counters, one extra call per (benchmark, size) runs through an
+  instrumented copy of the implementation (see instrument.py) and records
+  the operation counts the module declared, e.g. pointer moves or dict
+  probes; the timed code is never instrumented;
+- `scaling` times each benchmark over a geometric series of sizes, fits
+  the log-log slope with a 95% confidence interval and flags benchmarks
+  that grow faster than their declared complexity.
+
+Usage:
+    python benchmark.py list
+    python benchmark.py run [--filter palindrome] [--sizes 1000,10000] [--format json -o out.json]
+    python benchmark.py run --memory [--filter pair_sum]
+    python benchmark.py run --counters --no-timing [--filter triplet]
+    python benchmark.py run --baseline baseline.json --threshold 0.10
+    python benchmark.py compare baseline.json current.json --threshold 0.10
+    python benchmark.py scaling [--filter triplet] [--points 6] [--format markdown]
+
+`run --baseline` and `compare` exit with status 1 if any benchmark's median
+(or the --metric chosen, e.g. peak_bytes) grew past the baseline by more
+than the threshold. `scaling` exits with status 1 if any benchmark is
+flagged.
+"""
+
+import argparse
+import copy
+import csv
+import gc
+import importlib.util
+import io
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from fnmatch import fnmatch
+
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+MODULES = [
+    "HashMaps-Sets/pair_sum_unsorted.py",
+    "HashMaps-Sets/verify_sudoku_board.py",
+    "Two-Pointers/pair_sum_sorted.py",
+    "Two-Pointers/triplet_sum.py",
+    "Two-Pointers/palindrome.py",
+    "Two-Pointers/largest_container.py",
+]
+
+TIME_FIELDS = ["median_ns", "iqr_ns", "q1_ns", "q3_ns", "min_ns", "repeats", "number"]
+MEMORY_FIELDS = ["peak_bytes", "retained_bytes", "retained_blocks", "peak_rss_bytes"]
+RESULT_FIELDS = ["benchmark", "group", "size"] + TIME_FIELDS + MEMORY_FIELDS + ["counters"]
+
+
+class Benchmark:
+    """One registered implementation: func(*make_input(size, rng)) is what gets timed."""
+
+    def __init__(self, name, func, make_input, sizes, group, copy_input, complexity,
+                 scaling_sizes, counters):
+        self.name = name
+        self.func = func
+        self.make_input = make_input
+        self.sizes = list(sizes)
+        self.group = group
+        self.copy_input = copy_input
+        self.complexity = complexity
+        self.scaling_sizes = list(scaling_sizes) if scaling_sizes else None
+        self.counters = counters
+
+
+class BenchmarkRegistry:
+    """Benchmarks by name, in registration order."""
+
+    def __init__(self):
+        self.benchmarks = {}
+
+    def register(self, name, func, make_input, sizes, group=None, copy_input=False,
+                 complexity=None, scaling_sizes=None, counters=None):
+        """
+        Add a benchmark.
+
+        Args:
+            name: unique dotted name, e.g. "pair_sum.optimized"
+            func: the implementation; called as func(*args)
+            make_input: make_input(size, rng) -> tuple of args
+            sizes: default input sizes
+            group: benchmarks solving the same problem share a group
+                   (defaults to the name up to the last dot)
+            copy_input: shallow-copy every arg before each call, untimed, for
+                        implementations that modify their input
+            complexity: declared time complexity in the size, e.g. "n",
+                        "n log n", "n^2"; checked by `scaling`
+            scaling_sizes: sizes `scaling` uses instead of a geometric series,
+                           for inputs that only come in some sizes
+            counters: {counter name: rule} for instrument.instrument(),
+                      recorded by `run --counters`
+        """
+        if name in self.benchmarks:
+            raise ValueError(f"benchmark {name!r} registered twice")
+        if complexity is not None:
+            parse_complexity(complexity)
+        group = group or name.rsplit(".", 1)[0]
+        self.benchmarks[name] = Benchmark(name, func, make_input, sizes, group, copy_input,
+                                          complexity, scaling_sizes, counters)
+
+    def select(self, pattern=None):
+        """Benchmarks whose name matches the glob `pattern` (substring match without wildcards)."""
+        if not pattern:
+            return list(self.benchmarks.values())
+        if not any(ch in pattern for ch in "*?["):
+            pattern = f"*{pattern}*"
+        return [b for b in self.benchmarks.values() if fnmatch(b.name, pattern)]
+
+
+def load_registry(modules=MODULES):
+    """Import every module by path and let it register its benchmarks."""
+    registry = BenchmarkRegistry()
+    for relative_path in modules:
+        path = os.path.join(ROOT, relative_path)
+        name = os.path.splitext(os.path.basename(path))[0]
+        module = sys.modules.get(name)
+        if module is None or getattr(module, "__file__", None) != path:
+            spec = importlib.util.spec_from_file_location(name, path)
+            module = importlib.util.module_from_spec(spec)
+            # Registered before exec so process pools can pickle its functions
+            sys.modules[name] = module
+            spec.loader.exec_module(module)
+        module.register_benchmarks(registry.register)
+    return registry
+
+
+def input_rng(seed, name, size):
+    """Random generator for one (benchmark, size), independent of run order and PYTHONHASHSEED."""
+    return random.Random(f"{seed}/{name}/{size}")
+
+
+def time_benchmark(benchmark, size, seed=0, repeat=7, warmup=1, min_time=0.05):
+    """
+    Time one benchmark at one size.
+
+    Returns:
+        Result dict with the RESULT_FIELDS keys; times are nanoseconds per call
+    """
+    args = benchmark.make_input(size, input_rng(seed, benchmark.name, size))
+    func = benchmark.func
+    perf_counter_ns = time.perf_counter_ns
+
+    def run(number):
+        if benchmark.copy_input:
+            batches = [[copy.copy(arg) for arg in args] for _ in range(number)]
+            start = perf_counter_ns()
+            for call_args in batches:
+                func(*call_args)
+            return perf_counter_ns() - start
+        start = perf_counter_ns()
+        for _ in range(number):
+            func(*args)
+        return perf_counter_ns() - start
+
+    for _ in range(warmup):
+        run(1)
+
+    # Calls per round: grow until one round takes at least min_time
+    number = 1
+    while True:
+        elapsed = run(number)
+        if elapsed >= min_time * 1e9 or number >= 1 << 20:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time * 1e9 / elapsed) + 1))
+
+    samples = sorted(run(number) / number for _ in range(repeat))
+    if len(samples) >= 2:
+        q1, _, q3 = statistics.quantiles(samples, n=4, method="inclusive")
+    else:
+        q1 = q3 = samples[0]
+
+    return {
+        "benchmark": benchmark.name,
+        "group": benchmark.group,
+        "size": size,
+        "median_ns": statistics.median(samples),
+        "iqr_ns": q3 - q1,
+        "q1_ns": q1,
+        "q3_ns": q3,
+        "min_ns": samples[0],
+        "repeats": repeat,
+        "number": number,
+    }
+
+
+def _rss_reader():
+    """
+    (reset, read) for the peak RSS in bytes.
+
+    Linux can reset the high-water mark (writing 5 to /proc/self/clear_refs),
+    so read() - baseline is the peak of exactly the measured call. Elsewhere
+    ru_maxrss only grows, so in the fresh child the difference is a lower
+    bound. None when neither is available (Windows).
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+
+        def reset():
+            with open("/proc/self/clear_refs", "w") as f:
+                f.write("5")
+
+        def read():
+            with open("/proc/self/status") as f:
+                for line in f:
+                    if line.startswith("VmHWM:"):
+                        return int(line.split()[1]) * 1024
+            return None
+
+        return reset, read
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+    scale = 1 if sys.platform == "darwin" else 1024
+    return (lambda: None), (lambda: resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale)
+
+
+def measure_memory(benchmark, size, seed=0):
+    """
+    Memory used by one call, measured in this process; use memory_benchmark
+    to get a clean process.
+
+    A warmup call runs first so one-time costs (imports, caches, calibration)
+    are not charged to the implementation. Peak RSS is taken without
+    tracemalloc running, because its own bookkeeping would inflate RSS.
+
+    Returns:
+        Dict with the MEMORY_FIELDS keys:
+            peak_bytes: peak traced allocation during the call
+            retained_bytes / retained_blocks: traced memory still held when
+                the call returned, i.e. by its result
+            peak_rss_bytes: peak resident set size increase, or None
+    """
+    import tracemalloc
+
+    args = benchmark.make_input(size, input_rng(seed, benchmark.name, size))
+    func = benchmark.func
+
+    def fresh_args():
+        return [copy.copy(arg) for arg in args] if benchmark.copy_input else args
+
+    func(*fresh_args())
+    gc.collect()
+
+    peak_rss = None
+    rss = _rss_reader()
+    if rss is not None:
+        reset, read = rss
+        call_args = fresh_args()
+        gc.collect()
+        reset()
+        before = read()
+        result = func(*call_args)
+        peak_rss = max(0, read() - before)
+        del result, call_args
+        gc.collect()
+
+    call_args = fresh_args()
+    tracemalloc.start()
+    try:
+        start_snapshot = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        result = func(*call_args)
+        current, peak = tracemalloc.get_traced_memory()
+        end_snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    # The first snapshot is itself traced memory; leave tracemalloc's own allocations out
+    own_traces = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    retained = end_snapshot.filter_traces(own_traces).compare_to(
+        start_snapshot.filter_traces(own_traces), "filename")
+    del result
+
+    return {
+        "peak_bytes": peak - start_bytes,
+        "retained_bytes": max(0, current - start_bytes),
+        "retained_blocks": max(0, sum(stat.count_diff for stat in retained)),
+        "peak_rss_bytes": peak_rss,
+    }
+
+
+def _memory_worker(name, size, seed):
+    registry = load_registry()
+    return measure_memory(registry.benchmarks[name], size, seed)
+
+
+def memory_benchmark(benchmark, size, seed=0):
+    """measure_memory in a fresh child process, so earlier runs do not skew heap or RSS."""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(_memory_worker, benchmark.name, size, seed).result()
+
+
+def count_operations(benchmark, size, seed=0):
+    """
+    Operation counts of one call, from an instrumented copy of the
+    implementation; None if the benchmark declares no counters.
+    """
+    if not benchmark.counters:
+        return None
+    from instrument import instrument
+
+    args = benchmark.make_input(size, input_rng(seed, benchmark.name, size))
+    if benchmark.copy_input:
+        args = [copy.copy(arg) for arg in args]
+    _, counts = instrument(benchmark.func, benchmark.counters)(*args)
+    return counts
+
+
+def run_benchmarks(benchmarks, sizes=None, seed=0, repeat=7, warmup=1, min_time=0.05,
+                   progress=None, memory=False, timing=True, counters=False):
+    """
+    Time every benchmark at its default sizes (or `sizes`), and measure its
+    memory if `memory` and its operation counts if `counters`; list of
+    result dicts.
+    """
+    results = []
+    for benchmark in benchmarks:
+        for size in sizes or benchmark.sizes:
+            result = {"benchmark": benchmark.name, "group": benchmark.group, "size": size}
+            if timing:
+                result.update(time_benchmark(benchmark, size, seed, repeat, warmup, min_time))
+            if memory:
+                result.update(memory_benchmark(benchmark, size, seed))
+            if counters:
+                result["counters"] = count_operations(benchmark, size, seed)
+            results.append(result)
+            if progress:
+                progress(result)
+    return results
+
+
+# Two-sided 95% Student t quantiles by degrees of freedom; larger df use 1.96
+T_975 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306,
+         9: 2.262, 10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086, 30: 2.042, 60: 2.000}
+
+
+def t_quantile_975(df):
+    """The table entry for the largest df not above `df` (slightly conservative between entries)."""
+    return T_975[max(k for k in T_975 if k <= df)] if df <= 60 else 1.96
+
+
+def parse_complexity(text):
+    """
+    "1", "log n", "n", "n log n", "n^2", "n²", "n^2 log n", ... -> (power of n, power of log n).
+    """
+    superscripts = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹", "0123456789")
+    terms = text.replace("O(", "").rstrip(")").translate(superscripts).replace("·", " ").split()
+    power = log_power = 0.0
+    i = 0
+    while i < len(terms):
+        term = terms[i]
+        if term == "1":
+            pass
+        elif term.startswith("log") and i + 1 < len(terms) and terms[i + 1] == "n":
+            log_power += float(term[4:] or 1) if term.startswith("log^") else 1
+            i += 1
+        elif term.startswith("n"):
+            exponent = term[1:].lstrip("^")
+            power += float(exponent) if exponent else 1
+        else:
+            raise ValueError(f"cannot parse complexity {text!r}")
+        i += 1
+    return power, log_power
+
+
+def expected_slope(complexity, sizes):
+    """
+    Log-log slope of n^a log^b n between the smallest and largest size.
+
+    The log factor is not a constant slope: over [lo, hi] it adds
+    b * (ln ln hi - ln ln lo) / (ln hi - ln lo).
+    """
+    power, log_power = parse_complexity(complexity)
+    lo, hi = min(sizes), max(sizes)
+    if log_power and lo > 1 and hi > lo:
+        power += log_power * (math.log(math.log(hi)) - math.log(math.log(lo))) / (
+            math.log(hi) - math.log(lo))
+    return power
+
+
+def fit_loglog(sizes, times):
+    """
+    Least-squares fit of log(time) = slope * log(size) + c.
+
+    Returns:
+        (slope, ci_low, ci_high, r_squared); the interval is 95% and only
+        exists with three or more sizes (otherwise it is (slope, slope))
+    """
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(t) for t in times]
+    k = len(xs)
+    mean_x = sum(xs) / k
+    mean_y = sum(ys) / k
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    slope = sxy / sxx
+    intercept = mean_y - slope * mean_x
+    residual = sum((y - slope * x - intercept) ** 2 for x, y in zip(xs, ys))
+    total = sum((y - mean_y) ** 2 for y in ys)
+    r_squared = 1 - residual / total if total else 1.0
+    if k < 3:
+        return slope, slope, slope, r_squared
+    half_width = t_quantile_975(k - 2) * math.sqrt(residual / (k - 2) / sxx)
+    return slope, slope - half_width, slope + half_width, r_squared
+
+
+def geometric_sizes(lo, hi, points):
+    """`points` integer sizes from lo to hi, evenly spaced on a log scale."""
+    if points < 2 or hi <= lo:
+        return [lo]
+    ratio = (hi / lo) ** (1 / (points - 1))
+    return sorted({round(lo * ratio ** i) for i in range(points)})
+
+
+def scaling_benchmark(benchmark, points=6, seed=0, repeat=5, warmup=1, min_time=0.02,
+                      tolerance=0.15):
+    """
+    Time `benchmark` over a geometric series spanning its registered sizes
+    (or its scaling_sizes) and fit the growth exponent.
+
+    A benchmark is flagged when even the low end of the 95% interval exceeds
+    the declared complexity's slope by more than `tolerance`, so noise alone
+    does not flag it. Constant per-call overhead flattens the curve at small
+    sizes, which can only hide growth, never invent it.
+
+    Returns:
+        Dict with the fit, the declared and expected slope, the verdict
+        ("ok", "FLAGGED", or "undeclared") and the per-size results
+    """
+    sizes = benchmark.scaling_sizes or geometric_sizes(min(benchmark.sizes),
+                                                       max(benchmark.sizes), points)
+    results = [time_benchmark(benchmark, size, seed, repeat, warmup, min_time) for size in sizes]
+    fit = {"benchmark": benchmark.name, "group": benchmark.group,
+           "complexity": benchmark.complexity, "sizes": sizes,
+           "slope": None, "ci_low": None, "ci_high": None, "r_squared": None,
+           "expected_slope": None, "verdict": "undeclared", "results": results}
+    if len(sizes) >= 2:
+        slope, ci_low, ci_high, r_squared = fit_loglog(sizes, [r["median_ns"] for r in results])
+        fit.update(slope=slope, ci_low=ci_low, ci_high=ci_high, r_squared=r_squared)
+        if benchmark.complexity:
+            expected = expected_slope(benchmark.complexity, sizes)
+            fit["expected_slope"] = expected
+            fit["verdict"] = "FLAGGED" if ci_low > expected + tolerance else "ok"
+    return fit
+
+
+def format_scaling(fits, markdown=False):
+    """Scaling fits as a plain table, or as a markdown table for the complexity docs."""
+    header = ["Implementation", "Declared", "Measured slope", "95% CI", "R²", "Sizes", "Verdict"]
+    rows = []
+    for fit in fits:
+        declared = f"O({fit['complexity']})" if fit["complexity"] else "-"
+        if fit["slope"] is None:
+            measured = interval = r_squared = "-"
+        else:
+            expected = f" (expect {fit['expected_slope']:.2f})" if fit["expected_slope"] is not None else ""
+            measured = f"{fit['slope']:.2f}{expected}"
+            interval = f"[{fit['ci_low']:.2f}, {fit['ci_high']:.2f}]"
+            r_squared = f"{fit['r_squared']:.3f}"
+        verdict = {"ok": "✅ ok", "FLAGGED": "❌ exceeds declared"}.get(fit["verdict"], "-")
+        sizes = f"{fit['sizes'][0]}–{fit['sizes'][-1]} ({len(fit['sizes'])} sizes)"
+        rows.append([fit["benchmark"], declared, measured, interval, r_squared, sizes, verdict])
+
+    if markdown:
+        lines = ["| " + " | ".join(header) + " |",
+                 "|" + "|".join(["---"] * len(header)) + "|"]
+        lines += ["| " + " | ".join(f"`{row[0]}`" if i == 0 else cell
+                                    for i, cell in enumerate(row)) + " |" for row in rows]
+        return "\n".join(lines)
+
+    widths = [max(len(str(row[i])) for row in [header] + rows) for i in range(len(header))]
+    lines = ["  ".join(str(cell).ljust(width) for cell, width in zip(header, widths)),
+             "-" * (sum(widths) + 2 * (len(widths) - 1))]
+    lines += ["  ".join(str(cell).ljust(width) for cell, width in zip(row, widths)) for row in rows]
+    return "\n".join(lines)
+
+
+def make_report(results, seed, fits=None):
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+    if fits is not None:
+        report["fits"] = [{key: value for key, value in fit.items() if key != "results"}
+                          for fit in fits]
+    return report
+
+
+def format_time(ns):
+    if ns is None:
+        return "-"
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("μs", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.3f} {unit}"
+    return f"{ns:.1f} ns"
+
+
+def format_bytes(size):
+    if size is None:
+        return "-"
+    for unit, scale in (("GB", 1 << 30), ("MB", 1 << 20), ("KB", 1 << 10)):
+        if size >= scale:
+            return f"{size / scale:.1f} {unit}"
+    return f"{size} B"
+
+
+def format_value(metric, value):
+    return format_bytes(value) if metric.endswith("_bytes") else format_time(value)
+
+
+def format_counters(counts):
+    if not counts:
+        return "-"
+    return ", ".join(f"{name}={count:,}" for name, count in counts.items())
+
+
+def format_table(results):
+    timing = any("median_ns" in r for r in results)
+    memory = any("peak_bytes" in r for r in results)
+    counters = any("counters" in r for r in results)
+    header = f"{'benchmark':40} {'size':>8}"
+    if timing:
+        header += f" {'median':>12} {'IQR':>12} {'calls':>8}"
+    if memory:
+        header += f" {'peak alloc':>11} {'retained':>10} {'blocks':>8} {'peak RSS':>10}"
+    if counters:
+        header += "  counters"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        line = f"{r['benchmark']:40} {r['size']:>8}"
+        if timing:
+            line += (f" {format_time(r.get('median_ns')):>12} {format_time(r.get('iqr_ns')):>12}"
+                     f" {r.get('number', '-'):>8}")
+        if memory:
+            line += (f" {format_bytes(r.get('peak_bytes')):>11}"
+                     f" {format_bytes(r.get('retained_bytes')):>10}"
+                     f" {r.get('retained_blocks', '-'):>8}"
+                     f" {format_bytes(r.get('peak_rss_bytes')):>10}")
+        if counters:
+            line += f"  {format_counters(r.get('counters'))}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def format_csv(results):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=RESULT_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    for result in results:
+        if result.get("counters") is not None:
+            result = dict(result, counters=json.dumps(result["counters"]))
+        writer.writerow(result)
+    return out.getvalue()
+
+
+def load_results(path):
+    """Results from a JSON report or CSV file written by `run`."""
+    with open(path, newline="") as f:
+        if path.endswith(".csv"):
+            rows = list(csv.DictReader(f))
+            for row in rows:
+                row["size"] = int(row["size"])
+                for key in TIME_FIELDS + MEMORY_FIELDS:
+                    if key in row:
+                        row[key] = float(row[key]) if row[key] else None
+                if "counters" in row:
+                    row["counters"] = json.loads(row["counters"]) if row["counters"] else None
+            return rows
+        return json.load(f)["results"]
+
+
+def compare_results(baseline, current, threshold, metric="median_ns"):
+    """
+    Match results by (benchmark, size) and flag regressions in `metric`.
+
+    Returns:
+        List of (benchmark, size, baseline_value, current_value, ratio, regressed)
+        for every pair measured in both
+    """
+    base = {(r["benchmark"], r["size"]): r.get(metric) for r in baseline}
+    rows = []
+    for r in current:
+        key = (r["benchmark"], r["size"])
+        value = r.get(metric)
+        if base.get(key) and value is not None:
+            ratio = value / base[key]
+            rows.append((key[0], key[1], base[key], value, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def print_comparison(rows, threshold, metric="median_ns", file=None):
+    file = file or sys.stdout
+    print(f"{'benchmark':40} {'size':>8} {'baseline':>12} {'current':>12} {'change':>8}", file=file)
+    print("-" * 84, file=file)
+    for name, size, base_value, current_value, ratio, regressed in rows:
+        flag = "  ❌ REGRESSION" if regressed else ""
+        print(f"{name:40} {size:>8} {format_value(metric, base_value):>12} "
+              f"{format_value(metric, current_value):>12} {(ratio - 1) * 100:+7.1f}%{flag}", file=file)
+    regressions = sum(row[5] for row in rows)
+    print(f"\n{len(rows)} compared on {metric}, {regressions} worse than baseline by more than "
+          f"{threshold * 100:.0f}%", file=file)
+    return regressions
+
+
+def write_output(text, path=None):
+    if path:
+        with open(path, "w", newline="") as f:
+            f.write(text if text.endswith("\n") else text + "\n")
+    else:
+        print(text)
+
+
+def parse_sizes(text):
+    return [int(size) for size in text.split(",") if size.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="list registered benchmarks")
+
+    run = commands.add_parser("run", help="time benchmarks")
+    run.add_argument("--filter", help="glob or substring of benchmark names")
+    run.add_argument("--sizes", type=parse_sizes, help="comma-separated sizes (default: per benchmark)")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--repeat", type=int, default=7)
+    run.add_argument("--warmup", type=int, default=1)
+    run.add_argument("--min-time", type=float, default=0.05, help="seconds per timed round")
+    run.add_argument("--memory", action="store_true",
+                     help="also measure peak allocation and peak RSS in a fresh process")
+    run.add_argument("--counters", action="store_true",
+                     help="also record operation counts from an instrumented call")
+    run.add_argument("--no-timing", dest="timing", action="store_false",
+                     help="skip timing (with --memory or --counters)")
+    run.add_argument("--format", choices=["table", "json", "csv"], default="table")
+    run.add_argument("-o", "--output", help="write the report here instead of stdout")
+    run.add_argument("--baseline", help="JSON/CSV results to compare against")
+    run.add_argument("--threshold", type=float, default=0.10,
+                     help="allowed increase vs baseline, as a fraction (default 0.10)")
+    run.add_argument("--metric", choices=["median_ns"] + MEMORY_FIELDS, default="median_ns",
+                     help="result field compared against the baseline")
+
+    compare = commands.add_parser("compare", help="compare two saved result files")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.10)
+    compare.add_argument("--metric", choices=["median_ns"] + MEMORY_FIELDS, default="median_ns")
+
+    scaling = commands.add_parser("scaling", help="fit growth exponents against declared complexity")
+    scaling.add_argument("--filter", help="glob or substring of benchmark names")
+    scaling.add_argument("--points", type=int, default=6, help="sizes per geometric series")
+    scaling.add_argument("--seed", type=int, default=0)
+    scaling.add_argument("--repeat", type=int, default=5)
+    scaling.add_argument("--warmup", type=int, default=1)
+    scaling.add_argument("--min-time", type=float, default=0.02, help="seconds per timed round")
+    scaling.add_argument("--tolerance", type=float, default=0.15,
+                         help="allowed slope above the declared complexity (default 0.15)")
+    scaling.add_argument("--all", action="store_true",
+                         help="include benchmarks without a declared complexity")
+    scaling.add_argument("--format", choices=["table", "markdown", "json"], default="table")
+    scaling.add_argument("-o", "--output", help="write the report here instead of stdout")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        rows = compare_results(load_results(args.baseline), load_results(args.current),
+                               args.threshold, args.metric)
+        return 1 if print_comparison(rows, args.threshold, args.metric) else 0
+
+    registry = load_registry()
+
+    if args.command == "list":
+        for benchmark in registry.select():
+            sizes = ",".join(str(size) for size in benchmark.sizes)
+            complexity = f"O({benchmark.complexity})" if benchmark.complexity else "-"
+            print(f"{benchmark.name:40} {benchmark.group:24} {complexity:10} sizes={sizes}")
+        return 0
+
+    if args.command == "scaling":
+        benchmarks = [b for b in registry.select(args.filter) if args.all or b.complexity]
+        if not benchmarks:
+            parser.error(f"no benchmark with a declared complexity matches {args.filter!r}")
+        fits = []
+        for benchmark in benchmarks:
+            fit = scaling_benchmark(benchmark, args.points, args.seed, args.repeat, args.warmup,
+                                    args.min_time, args.tolerance)
+            fits.append(fit)
+            slope = "-" if fit["slope"] is None else f"{fit['slope']:.2f}"
+            print(f"  {benchmark.name}: slope {slope} ({fit['verdict']})", file=sys.stderr)
+
+        if args.format == "json":
+            results = [result for fit in fits for result in fit["results"]]
+            text = json.dumps(make_report(results, args.seed, fits), indent=2)
+        else:
+            text = format_scaling(fits, markdown=args.format == "markdown")
+        write_output(text, args.output)
+        return 1 if any(fit["verdict"] == "FLAGGED" for fit in fits) else 0
+
+    benchmarks = registry.select(args.filter)
+    if not benchmarks:
+        parser.error(f"no benchmark matches {args.filter!r}")
+
+    if not (args.timing or args.memory or args.counters):
+        parser.error("--no-timing needs --memory or --counters")
+
+    def progress(result):
+        measured = [format_time(result[key]) for key in ("median_ns",) if key in result]
+        measured += [f"peak {format_bytes(result[key])}" for key in ("peak_bytes",) if key in result]
+        measured += [format_counters(result[key]) for key in ("counters",) if key in result]
+        print(f"  {result['benchmark']} [{result['size']}]: {', '.join(measured)}", file=sys.stderr)
+
+    results = run_benchmarks(benchmarks, args.sizes, args.seed, args.repeat, args.warmup,
+                             args.min_time, progress, args.memory, args.timing, args.counters)
+
+    if args.format == "json":
+        text = json.dumps(make_report(results, args.seed), indent=2)
+    elif args.format == "csv":
+        text = format_csv(results)
+    else:
+        text = format_table(results)
+    write_output(text, args.output)
+
+    if args.baseline:
+        rows = compare_results(load_results(args.baseline), results, args.threshold, args.metric)
+        # Keep stdout parseable when the JSON/CSV report is written there
+        file = sys.stderr if not args.output else sys.stdout
+        print(file=file)
+        if print_comparison(rows, args.threshold, args.metric, file):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
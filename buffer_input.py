@@ -0,0 +1,350 @@
+"""
+Common input adapter for the sequence algorithms (pair sum, triplet sum,
+container / trapped water, palindrome).
+
+The implementations are written against Python lists: they index `lst[i]`
+and expect Python ints back. Other inputs are adapted without copying:
+
+- list, tuple, range, str and array.array pass through unchanged; they
+  already index to Python objects at full speed.
+- Any other buffer-protocol object (memoryview, bytes, bytearray, NumPy
+  arrays, mmap slices viewed as ints) becomes a read-only 1-D memoryview in
+  its own format. Indexing it gives plain Python ints/floats, instead of
+  NumPy scalars that are slow to box and wrap around on int64 overflow.
+- numpy_array() gives a read-only zero-copy ndarray over the same buffer,
+  for the implementations that have a vectorized backend. Lists are never
+  routed there, because converting a list is itself a full copy. The
+  backends compute in int64 or float64: narrower dtypes (bool, uint8,
+  int32, float32, ...) are widened with one copy, so `tgt - values` cannot
+  wrap around in uint8, and exact_int64() sends inputs whose int64
+  arithmetic could overflow back to the exact Python-int path.
+
+Nothing here writes to the caller's data: views are read-only, and the
+algorithms that need to sort take a sorted copy.
+"""
+
+from array import array
+from functools import lru_cache
+
+
+# Inputs at least this long go to a vectorized backend when one exists
+VECTOR_MIN_LENGTH = 1024
+
+# memoryview formats that index to Python numbers
+NUMERIC_FORMATS = frozenset("bBhHiIlLqQnNfde?")
+
+_PASS_THROUGH = (list, tuple, range, str, array)
+
+
+def as_sequence(data):
+    """
+    Indexable 1-D sequence over `data` that yields Python numbers, without copying.
+
+    Time Complexity: O(1)
+    Space Complexity: O(1)
+
+    Raises:
+        ValueError: for multi-dimensional buffers
+        TypeError: for buffers of a non-numeric format (e.g. NumPy strings)
+    """
+    if isinstance(data, _PASS_THROUGH):
+        return data
+    try:
+        view = memoryview(data)
+    except TypeError:
+        return data
+    if view.ndim != 1:
+        raise ValueError(f"expected a 1-D buffer, got {view.ndim} dimensions")
+    fmt = view.format.lstrip("@")
+    if fmt not in NUMERIC_FORMATS:
+        # Non-native byte order (">q", "<d" on some builds) cannot be indexed
+        # by memoryview; NumPy can still convert it
+        if hasattr(data, "tolist") and fmt[:1] in "<>=!" and fmt[1:] in NUMERIC_FORMATS:
+            return data.tolist()
+        raise TypeError(f"unsupported buffer format {view.format!r}")
+    return view.toreadonly()
+
+
+# int64 sums and differences of values below this bound cannot overflow
+EXACT_INT_BOUND = 1 << 62
+
+
+def wide_array(values):
+    """
+    `values` as an int64 or float64 ndarray: unchanged if it already is one,
+    otherwise widened with one copy.
+
+    Raises:
+        ValueError: for uint64 values that do not fit in int64
+    """
+    import numpy as np
+
+    values = np.asarray(values)
+    if values.dtype in (np.int64, np.float64):
+        return values
+    if values.dtype.kind == "f":
+        return values.astype(np.float64)
+    if values.dtype == np.uint64 and len(values) and values.max() > np.iinfo(np.int64).max:
+        raise ValueError("uint64 values beyond the int64 range")
+    return values.astype(np.int64)
+
+
+def exact_int64(values, *scalars, scale=1):
+    """
+    True if int64 arithmetic on `values` and `scalars` (sums, differences,
+    and products with factors up to `scale`) matches Python ints. Always
+    True for float64, which rounds the same way Python floats do.
+    """
+    if values.dtype.kind == "f":
+        return True
+    bound = EXACT_INT_BOUND // max(1, scale)
+    if any(isinstance(x, int) and not -bound < x < bound for x in scalars):
+        return False
+    return not len(values) or (-bound < int(values.min()) and int(values.max()) < bound)
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """The numpy module, or None if it is not installed; the import is tried once."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def has_numpy():
+    """
+    True if NumPy is installed. A failed import is not cached by Python and
+    costs a full sys.path search each time, so the answer is looked up once.
+    """
+    return _numpy() is not None
+
+
+def numpy_array(data, min_length=VECTOR_MIN_LENGTH):
+    """
+    Read-only ndarray over a numeric 1-D buffer of at least `min_length`
+    items, in int64 or float64 (see wide_array; zero-copy when the buffer
+    already is one), or None: for lists and other plain sequences, short
+    inputs, uint64 values beyond int64, or when NumPy is not installed.
+    """
+    if isinstance(data, (list, tuple, range, str)):
+        return None
+    try:
+        view = memoryview(data)
+    except TypeError:
+        return None
+    if view.ndim != 1 or len(view) < min_length:
+        return None
+    np = _numpy()
+    if np is None:
+        return None
+    values = np.asarray(data) if isinstance(data, np.ndarray) else np.asarray(view)
+    if values.dtype.kind not in "biuf":
+        return None
+    try:
+        wide = wide_array(values)
+    except ValueError:
+        return None
+    values = wide.view() if wide is values else wide
+    values.flags.writeable = False
+    return values
+
+
+def as_bytes(text):
+    """Read-only byte view of a bytes-like text, or None for str (and non-buffers)."""
+    if isinstance(text, str):
+        return None
+    try:
+        view = memoryview(text)
+    except TypeError:
+        return None
+    if view.ndim != 1 or view.itemsize != 1:
+        raise TypeError(f"expected text or single-byte data, got format {view.format!r}")
+    return view.cast("B").toreadonly() if view.c_contiguous else None
+
+
+def _load_modules():
+    from benchmark import load_registry
+
+    return load_registry(["HashMaps-Sets/pair_sum_unsorted.py", "Two-Pointers/pair_sum_sorted.py",
+                          "Two-Pointers/triplet_sum.py", "Two-Pointers/largest_container.py",
+                          "Two-Pointers/palindrome.py"])
+
+
+# NumPy dtypes exercised by the tests, wherever the values fit
+NUMPY_TEST_DTYPES = ("int64", "int32", "int16", "uint8", "uint32", "uint64", "float64", "float32")
+
+
+def _input_kinds(values, dtypes=NUMPY_TEST_DTYPES):
+    """
+    (label, converted input) for list, array.array, memoryview and, if
+    installed, NumPy arrays of each dtype in `dtypes` that holds `values` exactly.
+    """
+    kinds = [("list", values), ("array.array", array("q", values)),
+             ("memoryview", memoryview(array("q", values)))]
+    try:
+        import numpy as np
+    except ImportError:
+        return kinds
+    for dtype in dtypes:
+        info = np.finfo(dtype) if np.dtype(dtype).kind == "f" else np.iinfo(dtype)
+        if all(info.min <= v <= info.max for v in values):
+            converted = np.array(values, dtype=dtype)
+            if converted.tolist() == values:
+                kinds.append((f"numpy {dtype}", converted))
+    return kinds
+
+
+def test_buffer_inputs():
+    """Every adapted entry point gives the list answer for every input kind, without mutating it."""
+    import random
+    import sys
+
+    print("\n" + "=" * 60)
+    print("BUFFER-PROTOCOL INPUTS")
+    print("=" * 60)
+
+    registry = _load_modules()
+    modules = {name: sys.modules[name] for name in
+               ("pair_sum_unsorted", "pair_sum_sorted", "triplet_sum", "largest_container",
+                "palindrome")}
+    rng = random.Random(3)
+
+    def freeze(result):
+        return [tuple(item) if isinstance(item, list) else item for item in result] \
+            if isinstance(result, list) else result
+
+    for length in (0, 1, 5, 50, 3000):
+        values = [rng.randint(-length, length) for _ in range(length)]
+        target = values[1] + values[-1] if length > 1 else 0
+        heights = [abs(v) for v in values]
+        cases = [
+            ("pair_sum_optimized", modules["pair_sum_unsorted"].pair_sum_optimized, values, (target,)),
+            ("pair_sum_all_pairs", modules["pair_sum_unsorted"].pair_sum_all_pairs, values, (target,)),
+            ("pair_sum_sorted", modules["pair_sum_sorted"].pair_sum_sorted, sorted(values), (target,)),
+            ("triplet_sum", modules["triplet_sum"].triplet_sum, values[:400], ()),
+            ("triplet_sum_optimized", modules["triplet_sum"].triplet_sum_optimized, values[:400], ()),
+            ("largest_container_optimal", modules["largest_container"].largest_container_optimal,
+             heights, ()),
+            ("largest_container_skip", modules["largest_container"].largest_container_skip,
+             heights, ()),
+            ("trapped_water", modules["largest_container"].trapped_water, heights, ()),
+        ]
+        failures = []
+        kinds = 0
+        for name, func, data, extra in cases:
+            expected = freeze(func(list(data), *extra))
+            for label, converted in _input_kinds(data):
+                kinds += 1
+                snapshot = bytes(memoryview(converted)) if label != "list" else list(converted)
+                result = freeze(func(converted, *extra))
+                unchanged = (bytes(memoryview(converted)) if label != "list"
+                             else list(converted)) == snapshot
+                if result != expected or not unchanged:
+                    failures.append(f"{name}[{label}]")
+        status = "✅" if not failures else "❌"
+        print(f"{status} n = {length}: {len(cases)} entry points, {kinds} (entry point, input kind) runs"
+              + (f" | failed: {', '.join(failures)}" if failures else ""))
+
+    # Narrow dtypes must not wrap around: 100 - 200 is 156 in uint8
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    if np is not None:
+        pair_sum = modules["pair_sum_unsorted"].pair_sum_optimized
+        pair_sum_sorted = modules["pair_sum_sorted"].pair_sum_sorted
+        triplet_sum = modules["triplet_sum"].triplet_sum
+        narrow = np.array([200, 156] + [0] * 2000, dtype=np.uint8)
+        big = np.array([2 ** 62, -2 ** 62, 0] * 400, dtype=np.int64)
+        checks = [
+            ("uint8 pair_sum, target 100", pair_sum(narrow, 100), []),
+            ("uint8 pair_sum, target 356", pair_sum(narrow, 356), [0, 1]),
+            ("uint8 pair_sum_sorted, target 100", pair_sum_sorted(np.sort(narrow), 100), []),
+            ("uint8 pair_sum_sorted, target 356", pair_sum_sorted(np.sort(narrow), 356), [2000, 2001]),
+            ("bool triplet_sum", freeze(triplet_sum(np.zeros(2000, dtype=bool))), [(0, 0, 0)]),
+            ("int64 pair_sum near overflow", pair_sum(big, 0), pair_sum(big.tolist(), 0)),
+            ("uint64 beyond int64", pair_sum(np.array([2 ** 63 + 1] + [1] * 2000, dtype=np.uint64), 2 ** 63 + 2),
+             [0, 1]),
+        ]
+        for label, got, expected in checks:
+            print(f"{'✅' if got == expected else '❌'} {label}: {got}")
+
+    palindrome = modules["palindrome"].palindrome
+    texts = ["", "a", "A man, a plan, a canal: Panama", "race a car", "ab" * 2000 + "a"]
+    agree = all(palindrome(text) == palindrome(text.encode()) ==
+                palindrome(bytearray(text.encode())) == palindrome(memoryview(text.encode()))
+                for text in texts)
+    print(f"{'✅' if agree else '❌'} palindrome: str, bytes, bytearray and memoryview agree")
+    del registry
+
+
+def buffer_performance_comparison():
+    """Time each entry point on list input against array.array, memoryview and NumPy input."""
+    import time
+
+    from benchmark import input_rng
+
+    print("\n" + "=" * 60)
+    print("LIST vs BUFFER INPUT")
+    print("=" * 60)
+
+    registry = _load_modules()
+    names = ["pair_sum_unsorted.optimized", "pair_sum_sorted.two_pointer", "triplet_sum.standard",
+             "largest_container.optimal", "trapped_water.two_pointer"]
+
+    for name in names:
+        benchmark = registry.benchmarks[name]
+        size = max(benchmark.sizes) if benchmark.complexity == "n" else 1000
+        args = benchmark.make_input(size, input_rng(0, name, size))
+        print(f"\n{name} (n = {size:,})")
+        print("-" * 40)
+        times = {}
+        for label, converted in _input_kinds(args[0]):
+            call_args = (converted,) + tuple(args[1:])
+            benchmark.func(*call_args)
+            runs = 3
+            start = time.perf_counter()
+            for _ in range(runs):
+                benchmark.func(*call_args)
+            times[label] = (time.perf_counter() - start) / runs
+            print(f"{label:12}: {times[label]*1000:9.2f} ms ({times['list'] / times[label]:5.2f}x list)")
+
+    # Just above VECTOR_MIN_LENGTH any per-call routing overhead shows up here;
+    # without NumPy the rest of the gap is array.array boxing every item it indexes
+    size = 1500
+    print(f"\nShort inputs (n = {size:,}, NumPy {'installed' if has_numpy() else 'not installed'})")
+    print("-" * 40)
+    for name in ["largest_container.optimal", "trapped_water.two_pointer"]:
+        benchmark = registry.benchmarks[name]
+        values = benchmark.make_input(size, input_rng(0, name, size))[0]
+        times = {}
+        for label, converted in [("list", values), ("array.array", array("q", values))]:
+            benchmark.func(converted)
+            runs = 200
+            start = time.perf_counter()
+            for _ in range(runs):
+                benchmark.func(converted)
+            times[label] = (time.perf_counter() - start) / runs
+        print(f"{name:28}: list {times['list']*1e6:8.1f} μs | array.array "
+              f"{times['array.array']*1e6:8.1f} μs ({times['list'] / times['array.array']:5.2f}x list)")
+
+    palindrome = registry.benchmarks["palindrome.dispatch"]
+    text = palindrome.make_input(1_000_000, input_rng(0, "palindrome", 1_000_000))[0]
+    print(f"\npalindrome (n = {len(text):,})")
+    print("-" * 40)
+    data = text.encode()
+    times = {}
+    for label, converted in [("str", text), ("bytes", data), ("memoryview", memoryview(data))]:
+        palindrome.func(converted)
+        start = time.perf_counter()
+        for _ in range(3):
+            palindrome.func(converted)
+        times[label] = (time.perf_counter() - start) / 3
+        print(f"{label:12}: {times[label]*1000:9.2f} ms ({times['str'] / times[label]:5.2f}x str)")
+
+
+if __name__ == "__main__":
+    test_buffer_inputs()
+    buffer_performance_comparison()
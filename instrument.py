@@ -0,0 +1,215 @@
+"""
+Operation counters for the algorithm implementations, generated on demand.
+
+The implementations themselves carry no counting code, so they pay nothing
+when nobody is counting. instrument(func, counters) re-reads func's source,
+inserts counter increments at the operations named in `counters`, and
+compiles the result as a separate function; the original is never touched.
+
+Counter rules, keyed by counter name:
+
+    ("calls", "isalnum")         calls of a function or method with that name
+    ("contains", "seen")         `x in seen` / `x not in seen` tests
+    ("reads", "seen")            seen[...] loads
+    ("writes", "seen")           seen[...] = ... stores
+    ("moves", ("left", "right")) updates of those names from their own value
+                                 (`left += 1`, `left = next_right[left]`;
+                                 not resets like `left = i + 1`)
+    ("loop", "left < right")     iterations of a while loop with exactly this
+                                 test (or a for loop over exactly this iterable)
+    ("branch", "i > 0 and lst[i] == lst[i - 1]")
+                                 times an `if` with exactly this test is taken
+
+Tests are matched against ast.unparse() of the source, so spacing follows
+Python's canonical form (`lst[i - 1]`, not `lst[i-1]`).
+
+Example:
+    counted = instrument(palindrome_optimized, {"isalnum_calls": ("calls", "isalnum")})
+    result, counts = counted("A man, a plan")
+"""
+
+import ast
+import inspect
+import textwrap
+
+
+RULE_KINDS = ("calls", "contains", "reads", "writes", "moves", "loop", "branch")
+
+_COUNTS = "_op_counts"
+
+_cache = {}
+
+
+def _increment(name):
+    """Statement `_op_counts[name] += 1`."""
+    return ast.AugAssign(
+        target=ast.Subscript(value=ast.Name(_COUNTS, ast.Load()), slice=ast.Constant(name),
+                             ctx=ast.Store()),
+        op=ast.Add(), value=ast.Constant(1))
+
+
+def _counted_expression(name, node):
+    """Expression `(_op_counts.__setitem__(name, _op_counts[name] + 1) or node)`, which is node's value."""
+    counts = ast.Name(_COUNTS, ast.Load())
+    bump = ast.Call(
+        func=ast.Attribute(value=counts, attr="__setitem__", ctx=ast.Load()),
+        args=[ast.Constant(name),
+              ast.BinOp(left=ast.Subscript(value=ast.Name(_COUNTS, ast.Load()),
+                                           slice=ast.Constant(name), ctx=ast.Load()),
+                        op=ast.Add(), right=ast.Constant(1))],
+        keywords=[])
+    return ast.BoolOp(op=ast.Or(), values=[bump, node])
+
+
+def _names_assigned(target):
+    if isinstance(target, ast.Name):
+        return {target.id}
+    if isinstance(target, (ast.Tuple, ast.List)):
+        return set().union(*(_names_assigned(elt) for elt in target.elts))
+    return set()
+
+
+def _subscripted_name(target):
+    if isinstance(target, ast.Subscript) and isinstance(target.value, ast.Name):
+        return target.value.id
+    return None
+
+
+class _Instrumenter(ast.NodeTransformer):
+    def __init__(self, counters):
+        self.rules = {kind: [] for kind in RULE_KINDS}
+        for name, (kind, pattern) in counters.items():
+            if kind not in self.rules:
+                raise ValueError(f"unknown counter rule {kind!r} for {name!r}")
+            if kind == "moves" and isinstance(pattern, str):
+                pattern = (pattern,)
+            self.rules[kind].append((name, pattern))
+
+    # Statements: increments go before the statement or at the top of its body
+
+    def visit_statements(self, statements):
+        result = []
+        for statement in statements:
+            before = self.statement_counters(statement)
+            visited = self.visit(statement)
+            result.extend(_increment(name) for name in before)
+            result.extend(visited if isinstance(visited, list) else [visited])
+        return result
+
+    def statement_counters(self, statement):
+        names = []
+        if isinstance(statement, (ast.Assign, ast.AugAssign, ast.AnnAssign)):
+            targets = statement.targets if isinstance(statement, ast.Assign) else [statement.target]
+            assigned = set().union(*(_names_assigned(t) for t in targets))
+            if not isinstance(statement, ast.AugAssign) and statement.value is not None:
+                assigned &= {node.id for node in ast.walk(statement.value)
+                             if isinstance(node, ast.Name)}
+            names += [name for name, variables in self.rules["moves"] if assigned & set(variables)]
+            subscripted = {_subscripted_name(t) for t in targets}
+            names += [name for name, container in self.rules["writes"] if container in subscripted]
+        return names
+
+    def generic_visit(self, node):
+        for field, value in ast.iter_fields(node):
+            if isinstance(value, list) and value and isinstance(value[0], ast.stmt):
+                setattr(node, field, self.visit_statements(value))
+            elif isinstance(value, list):
+                setattr(node, field, [self.visit(item) if isinstance(item, ast.AST) else item
+                                      for item in value])
+            elif isinstance(value, ast.AST):
+                setattr(node, field, self.visit(value))
+        return node
+
+    def visit_loop(self, node, test_source):
+        names = [name for name, test in self.rules["loop"] if test == test_source]
+        node = self.generic_visit(node)
+        node.body = [_increment(name) for name in names] + node.body
+        return node
+
+    def visit_While(self, node):
+        return self.visit_loop(node, ast.unparse(node.test))
+
+    def visit_For(self, node):
+        return self.visit_loop(node, ast.unparse(node.iter))
+
+    def visit_If(self, node):
+        names = [name for name, test in self.rules["branch"] if test == ast.unparse(node.test)]
+        node = self.generic_visit(node)
+        node.body = [_increment(name) for name in names] + node.body
+        return node
+
+    # Expressions: wrapped so the count happens exactly when they are evaluated
+
+    def visit_Call(self, node):
+        called = node.func.attr if isinstance(node.func, ast.Attribute) else \
+            node.func.id if isinstance(node.func, ast.Name) else None
+        names = [name for name, function in self.rules["calls"] if function == called]
+        node = self.generic_visit(node)
+        for name in names:
+            node = _counted_expression(name, node)
+        return node
+
+    def visit_Compare(self, node):
+        containers = {comparator.id for op, comparator in zip(node.ops, node.comparators)
+                      if isinstance(op, (ast.In, ast.NotIn)) and isinstance(comparator, ast.Name)}
+        names = [name for name, container in self.rules["contains"] if container in containers]
+        node = self.generic_visit(node)
+        for name in names:
+            node = _counted_expression(name, node)
+        return node
+
+    def visit_Subscript(self, node):
+        names = []
+        if isinstance(node.ctx, ast.Load):
+            names = [name for name, container in self.rules["reads"]
+                     if container == _subscripted_name(node)]
+        node = self.generic_visit(node)
+        for name in names:
+            node = _counted_expression(name, node)
+        return node
+
+
+def instrument(func, counters):
+    """
+    Counting variant of `func`.
+
+    Args:
+        func: a plain module-level function whose source is available
+        counters: {counter name: rule}, rules as in the module docstring
+
+    Returns:
+        counted(*args, **kwargs) -> (func's result, {counter name: count}),
+        with fresh counts for every call. Variants are cached per
+        (func, counters).
+    """
+    key = (func, tuple(sorted((name, kind, tuple(pattern) if isinstance(pattern, list) else pattern)
+                              for name, (kind, pattern) in counters.items())))
+    if key in _cache:
+        return _cache[key]
+
+    tree = ast.parse(textwrap.dedent(inspect.getsource(func)))
+    definition = tree.body[0]
+    if not isinstance(definition, ast.FunctionDef):
+        raise TypeError(f"{func.__qualname__} is not a plain function")
+    definition.decorator_list = []
+    definition.args.kwonlyargs.append(ast.arg(_COUNTS))
+    definition.args.kw_defaults.append(None)
+    definition.body = _Instrumenter(counters).visit_statements(definition.body)
+    ast.fix_missing_locations(tree)
+
+    namespace = {}
+    code = compile(tree, f"<instrumented {func.__module__}.{func.__qualname__}>", "exec")
+    # The module's globals, so the variant sees the same helpers and constants
+    exec(code, func.__globals__, namespace)
+    generated = namespace[definition.name]
+    names = list(counters)
+
+    def counted(*args, **kwargs):
+        counts = dict.fromkeys(names, 0)
+        result = generated(*args, **kwargs, **{_COUNTS: counts})
+        return result, counts
+
+    counted.__name__ = f"{func.__name__}_counted"
+    counted.__doc__ = f"{func.__name__} with operation counters {names}; returns (result, counts)."
+    _cache[key] = counted
+    return counted
@@ -0,0 +1,431 @@
+"""
+Opt-in memoization for the algorithm entry points, keyed on input content.
+
+    cache = ResultCache(max_bytes=64 << 20, path="results.sqlite")
+    pair_sum = cache.cached(pair_sum_optimized)
+    pair_sum([3, 1, 4], 5)     # computed, stored
+    pair_sum([3, 1, 4], 5)     # same content -> served from the cache
+
+The key is a BLAKE2b digest of the function name and the raw bytes of every
+argument: int lists are packed as 64-bit integers, strings are encoded as
+UTF-8, and buffer-protocol objects (array.array, memoryview, bytes, NumPy
+arrays) are hashed in place, without copying. Anything else is pickled.
+
+Entries live in an in-memory LRU bounded by the pickled size of the stored
+results; with `path`, a SQLite file keeps them across processes and runs,
+and disk hits are promoted back into memory. The file is opened in WAL mode
+with synchronous=NORMAL and writes are committed in batches of
+`commit_every`, so a put costs an insert rather than an fsync; flush() or
+close() commits the rest. Results come back frozen (lists become tuples,
+dicts read-only mappings, NumPy arrays read-only copies), so a caller
+cannot corrupt what later callers get.
+"""
+
+import hashlib
+import pickle
+import sys
+from array import array
+from collections import OrderedDict
+from types import MappingProxyType
+
+
+def _argument_bytes(arg):
+    """(type tag, bytes-like) for hashing one argument."""
+    if isinstance(arg, str):
+        return b"s", arg.encode("utf-8", "surrogatepass")
+    if isinstance(arg, (bytes, bytearray)):
+        return b"b", arg
+    if isinstance(arg, list):
+        try:
+            return b"l", memoryview(array("q", arg)).cast("B")
+        except (TypeError, OverflowError):
+            pass
+    try:
+        view = memoryview(arg)
+    except TypeError:
+        return b"p", pickle.dumps(arg, protocol=pickle.HIGHEST_PROTOCOL)
+    if not view.c_contiguous:
+        return b"p", pickle.dumps(arg, protocol=pickle.HIGHEST_PROTOCOL)
+    shape = repr((view.format, view.shape)).encode()
+    return b"v" + shape, view.cast("B")
+
+
+def content_key(name, args, kwargs=None):
+    """16-byte digest of `name` plus the content of every argument."""
+    digest = hashlib.blake2b(name.encode(), digest_size=16)
+    for arg in args:
+        tag, data = _argument_bytes(arg)
+        digest.update(tag)
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    for key in sorted(kwargs or ()):
+        digest.update(key.encode())
+        tag, data = _argument_bytes(kwargs[key])
+        digest.update(tag)
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.digest()
+
+
+def freeze(value):
+    """
+    Immutable copy of a result: lists, tuples and array.array become tuples,
+    sets frozensets, dicts read-only mappings, bytearrays bytes and NumPy
+    arrays read-only copies.
+    """
+    if isinstance(value, (list, tuple, array)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(item) for item in value)
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, bytearray):
+        return bytes(value)
+    numpy = sys.modules.get("numpy")  # an ndarray result means NumPy is already imported
+    if numpy is not None and isinstance(value, numpy.ndarray):
+        value = value.copy()
+        value.setflags(write=False)
+    return value
+
+
+class ResultCache:
+    """
+    LRU of frozen results bounded by `max_bytes`, with an optional SQLite tier.
+
+    Time Complexity: O(input bytes) to hash, O(1) lookup and eviction
+    Space Complexity: O(max_bytes) in memory, unbounded on disk
+    """
+
+    def __init__(self, max_bytes=64 << 20, path=None, commit_every=64):
+        self.max_bytes = max_bytes
+        self.commit_every = commit_every
+        self.pending = 0  # puts not yet committed to the disk tier
+        self.entries = OrderedDict()  # key -> (frozen result, size in bytes)
+        self.bytes = 0
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+        self.db = None
+        if path is not None:
+            import sqlite3
+            self.db = sqlite3.connect(path)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            self.db.execute("CREATE TABLE IF NOT EXISTS results "
+                            "(key BLOB PRIMARY KEY, value BLOB NOT NULL)")
+
+    def get(self, key):
+        """(True, result) on a hit in memory or on disk, (False, None) on a miss."""
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+        if self.db is not None:
+            row = self.db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                value = freeze(pickle.loads(row[0]))
+                self._remember(key, value, len(row[0]))
+                self.hits += 1
+                self.disk_hits += 1
+                return True, value
+        self.misses += 1
+        return False, None
+
+    def put(self, key, value):
+        """Store `value` and return its frozen copy."""
+        # Pickle the result as returned (read-only mappings do not pickle); disk hits refreeze it
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        value = freeze(value)
+        self._remember(key, value, len(data))
+        if self.db is not None:
+            self.db.execute("INSERT OR REPLACE INTO results VALUES (?, ?)", (key, data))
+            self.pending += 1
+            if self.pending >= self.commit_every:
+                self.flush()
+        return value
+
+    def flush(self):
+        """Commit pending disk-tier writes so other processes can see them."""
+        if self.db is not None and self.pending:
+            self.db.commit()
+            self.pending = 0
+
+    def _remember(self, key, value, size):
+        size += len(key)
+        if size > self.max_bytes:
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        self.entries[key] = (value, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def cached(self, func, name=None, copy_input=False):
+        """
+        Memoized version of `func` that returns frozen results.
+
+        Args:
+            func: the implementation
+            name: key namespace (defaults to module.qualname); implementations
+                  that must never share entries need different names
+            copy_input: pass shallow copies of list arguments on a miss, for
+                        implementations that sort in place; the caller's data
+                        is then left alone on hits and misses alike
+        """
+        name = name or f"{func.__module__}.{func.__qualname__}"
+
+        def wrapper(*args, **kwargs):
+            key = content_key(name, args, kwargs)
+            found, value = self.get(key)
+            if found:
+                return value
+            if copy_input:
+                args = [arg.copy() if isinstance(arg, list) else arg for arg in args]
+            return self.put(key, func(*args, **kwargs))
+
+        wrapper.__name__ = f"{func.__name__}_cached"
+        wrapper.__doc__ = func.__doc__
+        wrapper.cache = self
+        return wrapper
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "evictions": self.evictions,
+        }
+
+    def clear(self):
+        """Drop the in-memory entries and counters (the disk tier is kept)."""
+        self.entries.clear()
+        self.bytes = 0
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def close(self):
+        if self.db is not None:
+            self.flush()
+            self.db.close()
+            self.db = None
+
+
+# Registered benchmarks the cache is meant to front, with whether they sort in place
+CACHED_ENTRY_POINTS = [
+    ("pair_sum_unsorted.optimized", False),
+    ("triplet_sum.standard", False),
+    ("largest_container.optimal", False),
+    ("palindrome.dispatch", False),
+]
+
+
+def cached_entry_points(cache):
+    """{benchmark name: (cached function, registered benchmark)} for CACHED_ENTRY_POINTS."""
+    from benchmark import load_registry
+
+    registry = load_registry()
+    return {name: (cache.cached(registry.benchmarks[name].func, name, copy_input),
+                   registry.benchmarks[name])
+            for name, copy_input in CACHED_ENTRY_POINTS}
+
+
+def test_result_cache():
+    """Check keys, hits, freezing, byte-bounded eviction and the SQLite tier."""
+    import os
+    import tempfile
+    from operator import setitem
+
+    print("\n" + "=" * 60)
+    print("RESULT CACHE")
+    print("=" * 60)
+
+    calls = []
+
+    def pairs(lst, tgt):
+        calls.append(tgt)
+        return [[i, j] for i in range(len(lst)) for j in range(i + 1, len(lst))
+                if lst[i] + lst[j] == tgt]
+
+    def sorts(lst):
+        lst.sort()
+        return lst
+
+    cache = ResultCache()
+    cached_pairs = cache.cached(pairs)
+    first = cached_pairs([1, 2, 3, 4], 5)
+    second = cached_pairs([1, 2, 3, 4], 5)
+    checks = [
+        ("Repeat is a hit", second == first and len(calls) == 1),
+        ("Result is frozen", first == ((0, 3), (1, 2)) and isinstance(first, tuple)),
+        ("Other parameters miss", cached_pairs([1, 2, 3, 4], 6) == ((1, 3),) and len(calls) == 2),
+        ("array.array input hashes like content",
+         cached_pairs(array("q", [1, 2, 3, 4]), 5) == first),
+        ("str and list keys differ",
+         content_key("f", (["a", "b"],)) != content_key("f", ("ab",))),
+    ]
+
+    data = [3, 1, 2]
+    cached_sorts = cache.cached(sorts, copy_input=True)
+    checks.append(("copy_input leaves caller data alone",
+                   cached_sorts(data) == (1, 2, 3) and data == [3, 1, 2]))
+
+    def read_only(value, mutate):
+        try:
+            mutate(value)
+        except (TypeError, ValueError):
+            return True
+        return False
+
+    counts = cache.cached(lambda lst: {x: [x] * 2 for x in lst}, name="counts")([1, 2])
+    checks.append(("Dict results are read-only mappings",
+                   counts == {1: (1, 1), 2: (2, 2)} and read_only(counts, lambda m: setitem(m, 3, 3))))
+    packed = cache.cached(lambda n: array("q", range(n)), name="packed")(3)
+    checks.append(("array.array results become tuples", packed == (0, 1, 2)))
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    if np is not None:
+        returned = np.arange(4)
+        stored = cache.cached(lambda n: returned, name="ndarray")(4)
+        checks.append(("NumPy results are read-only copies",
+                       read_only(stored, lambda a: setitem(a, 0, 9))
+                       and returned.flags.writeable and stored is not returned))
+
+    small = ResultCache(max_bytes=400)
+    cached_range = small.cached(lambda n: list(range(n)), name="range")
+    for n in range(20):
+        cached_range(n)
+    checks.append(("Byte budget respected with evictions",
+                   small.bytes <= 400 and small.evictions > 0 and len(small.entries) < 20))
+    checks.append(("Oversized results are not cached",
+                   cached_range(1000) == tuple(range(1000)) and small.bytes <= 400))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "results.sqlite")
+        disk = ResultCache(path=path)
+        disk.cached(pairs, name="pairs")([5, 5], 10)
+        disk.cached(lambda: {"a": [1]}, name="mapping")()
+        other = ResultCache(path=path)
+        unseen = not other.get(content_key("pairs", ([5, 5], 10)))[0]
+        disk.flush()
+        other.clear()
+        seen = other.get(content_key("pairs", ([5, 5], 10)))[0]
+        checks.append(("Batched writes become visible on flush", unseen and seen))
+        other.close()
+        disk.close()
+        calls.clear()
+        reopened = ResultCache(path=path)
+        result = reopened.cached(pairs, name="pairs")([5, 5], 10)
+        checks.append(("SQLite tier survives a restart",
+                       result == ((0, 1),) and not calls and reopened.disk_hits == 1))
+        mapping = reopened.cached(lambda: None, name="mapping")()
+        checks.append(("Disk hits come back frozen",
+                       mapping == {"a": (1,)} and isinstance(mapping, MappingProxyType)))
+        reopened.close()
+
+    for label, passed in checks:
+        print(f"{'✅' if passed else '❌'} {label}")
+
+
+def cache_performance_comparison():
+    """Lookup overhead against compute time per entry point, break-even size and a repeated workload."""
+    import random
+    import time
+
+    from benchmark import input_rng
+
+    print("\n" + "=" * 60)
+    print("RESULT CACHE PERFORMANCE")
+    print("=" * 60)
+
+    cache = ResultCache(max_bytes=256 << 20)
+    entry_points = cached_entry_points(cache)
+    sizes = [10, 100, 1000, 10000, 100000]
+
+    def per_call(func, args, copy_input):
+        number = 1
+        while True:
+            batches = [[a.copy() if copy_input and isinstance(a, list) else a for a in args]
+                       for _ in range(number)]
+            start = time.perf_counter()
+            for call_args in batches:
+                func(*call_args)
+            elapsed = time.perf_counter() - start
+            if elapsed > 0.02 or number >= 1 << 16:
+                return elapsed / number
+            number *= 4
+
+    for name, (cached_func, benchmark) in entry_points.items():
+        print(f"\n{name}")
+        print("-" * 40)
+        print(f"{'size':>7} | {'compute':>10} {'hit':>10} {'miss':>10} | speedup on hit")
+        break_even = None
+        for size in sizes:
+            if benchmark.complexity == "n^2" and size > 1000:
+                continue
+            args = benchmark.make_input(size, input_rng(0, name, size))
+            compute = per_call(benchmark.func, args, benchmark.copy_input)
+            start = time.perf_counter()
+            cached_func(*args)
+            miss = time.perf_counter() - start
+            hit = per_call(cached_func, args, False)
+            if break_even is None and hit < compute:
+                break_even = size
+            print(f"{size:>7} | {compute*1e6:8.1f}μs {hit*1e6:8.1f}μs {miss*1e6:8.1f}μs | "
+                  f"{compute / hit:8.1f}x")
+        print(f"Break-even input size: {break_even if break_even else '> ' + str(sizes[-1])}")
+
+    # Pipeline that re-submits a few hot inputs: 2000 requests over 50 distinct arrays
+    name = "pair_sum_unsorted.optimized"
+    cached_func, benchmark = entry_points[name]
+    cache.clear()
+    rng = random.Random(7)
+    inputs = [benchmark.make_input(10000, input_rng(seed, name, 10000)) for seed in range(50)]
+    weights = [1 / (rank + 1) for rank in range(len(inputs))]
+    requests = rng.choices(inputs, weights, k=2000)
+
+    start = time.perf_counter()
+    for args in requests:
+        benchmark.func(*args)
+    uncached_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for args in requests:
+        cached_func(*args)
+    cached_time = time.perf_counter() - start
+
+    stats = cache.stats()
+    print(f"\nRepeated workload ({name}, 2000 requests over 50 inputs of 10,000)")
+    print("-" * 40)
+    print(f"Hit rate: {stats['hit_rate']:.1%} ({stats['hits']} hits, {stats['misses']} misses), "
+          f"{stats['entries']} entries, {stats['bytes'] / 1024:.1f} KB")
+    print(f"Uncached: {uncached_time*1000:8.1f} ms | Cached: {cached_time*1000:8.1f} ms | "
+          f"Speedup: {uncached_time / cached_time:.1f}x")
+
+    # Disk-tier write cost: a commit per put against batched commits
+    import os
+    import tempfile
+
+    print("\nSQLite tier, 2000 puts of a 100-element result")
+    print("-" * 40)
+    value = list(range(100))
+    for label, commit_every in [("commit per put", 1), ("batched (default)", 64)]:
+        with tempfile.TemporaryDirectory() as tmp:
+            disk = ResultCache(path=os.path.join(tmp, "results.sqlite"), commit_every=commit_every)
+            start = time.perf_counter()
+            for i in range(2000):
+                disk.put(i.to_bytes(16, "little"), value)
+            disk.close()
+            elapsed = time.perf_counter() - start
+        print(f"{label:<18}: {elapsed*1000:8.1f} ms ({elapsed / 2000 * 1e6:.1f} μs/put)")
+
+
+if __name__ == "__main__":
+    test_result_cache()
+    cache_performance_comparison()
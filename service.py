@@ -0,0 +1,809 @@
+"""
+Local query service for the algorithm modules.
+
+Processes that call these algorithms over and over can share one warm
+server instead of each paying the import cost and running its own
+uncoordinated threads. The server speaks newline-delimited JSON over a Unix
+socket or localhost TCP. Requests carry an id, so one connection may have
+many requests in flight and answers may come back out of order:
+
+    {"id": 1, "op": "pair_sum", "values": [3, 1, 4], "target": 5}
+    {"id": 1, "result": [1, 2]}
+    {"id": 2, "op": "nope"}
+    {"id": 2, "error": "ServiceError: unknown op 'nope'"}
+
+Endpoints (op: arguments -> result):
+
+    pair_sum    values, target -> [i, j] or []                    pair_sum_optimized
+    triplet     values         -> [[a, b, c], ...]                triplet_sum
+    palindrome  text           -> true / false                    palindrome
+    container   heights        -> [area, [left, right]]           largest_container_with_indices
+    sudoku      board          -> {"valid": ..., "conflict": [row, col] or null}
+    stats                      -> server counters
+
+Scheduling:
+
+- micro-batching: container and 9x9 sudoku requests that arrive together
+  are collected (up to --max-batch, the first one waiting at most
+  --max-delay seconds for company) and answered by one
+  largest_container_batch / verify_sudoku_boards call. Batches too small to
+  beat the per-item loop use the loop instead;
+- integer lists of VECTOR_MIN_LENGTH or more values are packed into
+  array('q') when NumPy is installed, so pair_sum and triplet_sum read them
+  in place through their vectorized backends (see buffer_input.py);
+- triplet requests of TRIPLET_POOL_MIN or more values (O(n²)) run in a pool
+  of --workers processes. Everything else is O(n), about the cost of
+  decoding its JSON, and runs on the event loop: there are no threads;
+- backpressure: at most --max-in-flight requests server-wide and
+  --max-pipeline per connection. When either is full the server stops
+  reading from that socket, so clients block in the kernel instead of
+  queueing unbounded work. At most two jobs per worker are queued in the
+  pool, and each response waits for its transport to drain.
+
+Usage:
+    python service.py serve [--unix /tmp/algorithms.sock | --host 127.0.0.1 --port 8765]
+    python service.py bench [--op sudoku,container] [--concurrency 1,16,64] [--requests 2000]
+    python service.py test
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from array import array
+from itertools import chain
+
+from buffer_input import VECTOR_MIN_LENGTH, has_numpy
+
+
+# Triplet requests at least this long go to the process pool
+TRIPLET_POOL_MIN = 200
+
+# verify_sudoku_boards has ~150 µs of fixed cost; the scalar loop takes
+# 5-20 µs per board, so batches go to it from this many boards on
+SUDOKU_BATCH_MIN = 32
+
+# largest_container_batch takes max(len) vectorized steps of ~40 scalar
+# steps each, so it wins once the batch holds this many times its longest row
+CONTAINER_BATCH_RATIO = 40
+
+# Longer profiles (or heights outside [0, 2**31)) skip the batcher
+CONTAINER_BATCH_MAX_LENGTH = 4096
+
+DEFAULT_ADDRESS = ("127.0.0.1", 8765)
+
+_functions = {}
+
+
+class ServiceError(Exception):
+    """A request the service rejects, or an error response seen by the client."""
+
+
+def _function(name):
+    """Module-level algorithm function by name, loading the modules on first use (also in pool workers)."""
+    if not _functions:
+        from benchmark import load_registry
+
+        load_registry()
+        modules = sys.modules
+        _functions.update(
+            pair_sum=modules["pair_sum_unsorted"].pair_sum_optimized,
+            triplet=modules["triplet_sum"].triplet_sum,
+            palindrome=modules["palindrome"].palindrome,
+            container=modules["largest_container"].largest_container_with_indices,
+            container_batch=modules["largest_container"].largest_container_batch,
+            sudoku=modules["verify_sudoku_board"].find_sudoku_conflict,
+            sudoku_n=modules["verify_sudoku_board"].find_sudoku_conflict_n,
+            sudoku_batch=modules["verify_sudoku_board"].verify_sudoku_boards,
+        )
+    return _functions[name]
+
+
+def _pool_call(name, *args):
+    """Run one endpoint function in a pool worker."""
+    return _function(name)(*args)
+
+
+def _json_default(value):
+    """NumPy scalars and arrays in results become plain JSON values."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _encode(message):
+    return json.dumps(message, separators=(",", ":"), default=_json_default).encode() + b"\n"
+
+
+class MicroBatcher:
+    """
+    Collects concurrent single-item calls into batches.
+
+    submit(item) returns a future for run_batch(items)[k]. A batch is run
+    when it reaches `max_batch` items, or `max_delay` seconds after its first
+    item arrived (max_delay = 0 means on the next event loop iteration, which
+    still picks up every request read in the same iteration). run_batch
+    runs on the event loop, so `max_batch` also bounds how long it blocks.
+    """
+
+    def __init__(self, run_batch, max_batch=256, max_delay=0.0):
+        self.run_batch = run_batch
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.pending = []
+        self.timer = None
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((item, future))
+        if len(self.pending) >= self.max_batch:
+            self.flush()
+        elif self.timer is None:
+            self.timer = (loop.call_later(self.max_delay, self.flush) if self.max_delay > 0
+                          else loop.call_soon(self.flush))
+        return future
+
+    def flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        batch, self.pending = self.pending, []
+        if not batch:
+            return
+        self.batches += 1
+        self.items += len(batch)
+        try:
+            results = self.run_batch([item for item, _ in batch])
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+def _values(request, key):
+    """Integer list argument; long lists become array('q') for the vectorized backends."""
+    values = request.get(key)
+    if not isinstance(values, list):
+        raise ServiceError(f"{key!r} must be a list of numbers")
+    if len(values) >= VECTOR_MIN_LENGTH and has_numpy():
+        try:
+            return array("q", values)
+        except (TypeError, OverflowError):
+            pass
+    return values
+
+
+def _batchable_heights(heights):
+    return (len(heights) <= CONTAINER_BATCH_MAX_LENGTH
+            and all(type(h) is int and 0 <= h < 1 << 31 for h in heights))
+
+
+def _sudoku_cells_ok(board):
+    return (len(board) == 9 and all(isinstance(row, list) and len(row) == 9 for row in board)
+            and all(type(d) is int and 0 <= d <= 9 for row in board for d in row))
+
+
+def _sudoku_result(conflict):
+    return {"valid": conflict is None, "conflict": None if conflict is None else list(conflict)}
+
+
+class AlgorithmService:
+    """
+    The asyncio server: connection handling, endpoints and scheduling (see
+    the module docstring). Use `async with` or start() / close().
+    """
+
+    def __init__(self, workers=None, max_batch=256, max_delay=0.0, max_in_flight=256,
+                 max_pipeline=32, max_request_bytes=16 << 20):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_in_flight = max_in_flight
+        self.max_pipeline = max_pipeline
+        self.max_request_bytes = max_request_bytes
+        # Connections waiting to be accepted; bursts of new clients beyond it are refused
+        self.backlog = max(128, max_in_flight)
+        self.container_batcher = MicroBatcher(self._container_batch, max_batch, max_delay)
+        self.sudoku_batcher = MicroBatcher(self._sudoku_batch, max_batch, max_delay)
+        self.handlers = {"pair_sum": self.pair_sum, "triplet": self.triplet,
+                         "palindrome": self.palindrome, "container": self.container,
+                         "sudoku": self.sudoku, "stats": self.stats}
+        self.pool = None
+        self.server = None
+        self.connections = {}
+        self.requests = 0
+        self.errors = 0
+        self.pool_jobs = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def start(self, address=DEFAULT_ADDRESS):
+        """Listen on a Unix socket path or a (host, port) pair; returns the asyncio server."""
+        _function("pair_sum")
+        self.in_flight_slots = asyncio.Semaphore(self.max_in_flight)
+        self.pool_slots = asyncio.Semaphore(2 * max(1, self.workers))
+        if self.workers > 0:
+            from concurrent.futures import ProcessPoolExecutor
+
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+            # Start the workers and load the modules now, not on the first heavy request
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(loop.run_in_executor(self.pool, _pool_call, "palindrome", "")
+                                   for _ in range(self.workers)))
+
+        if isinstance(address, str):
+            if os.path.exists(address):
+                os.unlink(address)
+            self.server = await asyncio.start_unix_server(
+                self.handle_connection, address, limit=self.max_request_bytes, backlog=self.backlog)
+        else:
+            host, port = address
+            self.server = await asyncio.start_server(
+                self.handle_connection, host, port, limit=self.max_request_bytes, backlog=self.backlog)
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            # Closed transports read as EOF, so the handlers answer what they read and return
+            for writer in self.connections.values():
+                writer.close()
+            await asyncio.gather(*self.connections, return_exceptions=True)
+            await self.server.wait_closed()
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    # Connections
+
+    async def handle_connection(self, reader, writer):
+        self.connections[asyncio.current_task()] = writer
+        pipeline = asyncio.Semaphore(self.max_pipeline)
+        tasks = set()
+        try:
+            while True:
+                # Backpressure: no slot, no further read from this connection.
+                # The server-wide slot is taken after the read, so idle
+                # connections do not hold one.
+                await pipeline.acquire()
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Longer than max_request_bytes: the stream cannot be framed any more
+                    writer.write(_encode({"id": None, "error": "ServiceError: request too large"}))
+                    break
+                if not line:
+                    break
+                await self.in_flight_slots.acquire()
+                task = asyncio.create_task(self.respond(line, writer, pipeline))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except ConnectionError:
+            pass
+        finally:
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+            del self.connections[asyncio.current_task()]
+
+    async def respond(self, line, writer, pipeline):
+        # The slots are held until the answer has left the write buffer, so a
+        # client that stops reading stops the server from reading its requests
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ServiceError("a request must be a JSON object")
+                request_id = request.get("id")
+                response = {"id": request_id, "result": await self.handle(request)}
+            except Exception as error:
+                self.errors += 1
+                response = {"id": request_id, "error": f"{type(error).__name__}: {error}"}
+            if not writer.is_closing():
+                writer.write(_encode(response))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.in_flight -= 1
+            self.in_flight_slots.release()
+            pipeline.release()
+
+    async def handle(self, request):
+        self.requests += 1
+        handler = self.handlers.get(request.get("op"))
+        if handler is None:
+            raise ServiceError(f"unknown op {request.get('op')!r}")
+        return await handler(request)
+
+    async def run_in_pool(self, name, *args):
+        """Run a CPU-heavy call in the process pool, or inline without one."""
+        if self.pool is None:
+            return _function(name)(*args)
+        async with self.pool_slots:
+            self.pool_jobs += 1
+            return await asyncio.get_running_loop().run_in_executor(self.pool, _pool_call, name, *args)
+
+    # Endpoints
+
+    async def pair_sum(self, request):
+        if "target" not in request:
+            raise ServiceError("'target' is required")
+        return _function("pair_sum")(_values(request, "values"), request["target"])
+
+    async def triplet(self, request):
+        values = _values(request, "values")
+        if len(values) >= TRIPLET_POOL_MIN:
+            return await self.run_in_pool("triplet", values)
+        return _function("triplet")(values)
+
+    async def palindrome(self, request):
+        text = request.get("text")
+        if not isinstance(text, str):
+            raise ServiceError("'text' must be a string")
+        return _function("palindrome")(text)
+
+    async def container(self, request):
+        heights = request.get("heights")
+        if not isinstance(heights, list):
+            raise ServiceError("'heights' must be a list of numbers")
+        if _batchable_heights(heights):
+            area, (left, right) = await self.container_batcher.submit(heights)
+        else:
+            area, (left, right) = _function("container")(_values(request, "heights"))
+        return [area, [left, right]]
+
+    async def sudoku(self, request):
+        board = request.get("board")
+        if not isinstance(board, list) or not board:
+            raise ServiceError("'board' must be a non-empty list of rows")
+        if _sudoku_cells_ok(board):
+            return await self.sudoku_batcher.submit(board)
+        if len(board) == 9:
+            raise ServiceError("a 9x9 board holds digits 0-9")
+        return _sudoku_result(_function("sudoku_n")(board))
+
+    async def stats(self, request=None):
+        """Counters since start: requests, errors, pool jobs, batching and in-flight peak."""
+        return {
+            "requests": self.requests, "errors": self.errors, "pool_jobs": self.pool_jobs,
+            "in_flight": self.in_flight, "peak_in_flight": self.peak_in_flight,
+            "batches": {name: {"batches": batcher.batches, "items": batcher.items}
+                        for name, batcher in (("container", self.container_batcher),
+                                              ("sudoku", self.sudoku_batcher))},
+        }
+
+    # Batch runners (called by the batchers, on the event loop)
+
+    def _container_batch(self, profiles):
+        lengths = [len(heights) for heights in profiles]
+        if has_numpy() and sum(lengths) >= CONTAINER_BATCH_RATIO * max(lengths):
+            areas, indices = _function("container_batch")(profiles)
+            return list(zip(areas.tolist(), map(tuple, indices.tolist())))
+        return [_function("container")(heights) for heights in profiles]
+
+    def _sudoku_batch(self, boards):
+        if len(boards) >= SUDOKU_BATCH_MIN and has_numpy():
+            import numpy as np
+
+            # fromiter over the flattened cells is about twice as fast as asarray on nested lists
+            cells = np.fromiter(chain.from_iterable(chain.from_iterable(boards)), np.uint8,
+                                81 * len(boards))
+            valid, conflicts = _function("sudoku_batch")(cells.reshape(-1, 9, 9))
+            return [{"valid": ok, "conflict": None if ok else conflict}
+                    for ok, conflict in zip(valid.tolist(), conflicts.tolist())]
+        return [_sudoku_result(_function("sudoku")(board)) for board in boards]
+
+
+class ServiceClient:
+    """
+    Pipelining client: any number of concurrent request() calls share one
+    connection and are matched to their answers by id.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.next_id = 0
+        self.waiting = {}
+        self.receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, address=DEFAULT_ADDRESS, limit=16 << 20):
+        if isinstance(address, str):
+            reader, writer = await asyncio.open_unix_connection(address, limit=limit)
+        else:
+            reader, writer = await asyncio.open_connection(*address, limit=limit)
+        return cls(reader, writer)
+
+    async def _receive(self):
+        error = ConnectionError("connection closed by the service")
+        try:
+            while line := await self.reader.readline():
+                response = json.loads(line)
+                future = self.waiting.pop(response.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if "error" in response:
+                    future.set_exception(ServiceError(response["error"]))
+                else:
+                    future.set_result(response["result"])
+        except (OSError, ValueError) as exc:
+            error = exc
+        for future in self.waiting.values():
+            if not future.done():
+                future.set_exception(error)
+        self.waiting.clear()
+
+    async def request(self, op, **args):
+        """Send one request and wait for its result; raises ServiceError on an error response."""
+        self.next_id += 1
+        request_id = self.next_id
+        future = asyncio.get_running_loop().create_future()
+        self.waiting[request_id] = future
+        self.writer.write(_encode({"id": request_id, "op": op, **args}))
+        await self.writer.drain()
+        return await future
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+        await self.receiver
+
+
+# Load generation
+
+def make_requests(op, count, seed=0):
+    """`count` request payloads for one endpoint, deterministic for a seed."""
+    import random
+
+    from benchmark import input_rng, load_registry
+
+    registry = load_registry()
+    rng = random.Random(f"{seed}/service/{op}")
+    requests = []
+    for k in range(count):
+        if op == "sudoku":
+            board = [list(row) for row in registry.benchmarks["sudoku_verify.bitmask"].make_input(
+                9, input_rng(seed, op, k))[0]]
+            for _ in range(40):
+                board[rng.randrange(9)][rng.randrange(9)] = 0
+            if rng.random() < 0.5:
+                board[rng.randrange(9)][rng.randrange(9)] = rng.randint(1, 9)
+            requests.append({"op": op, "board": board})
+        elif op == "container":
+            requests.append({"op": op, "heights": [rng.randint(0, 10_000) for _ in range(64)]})
+        elif op == "pair_sum":
+            values = [rng.randint(-10**6, 10**6) for _ in range(1000)]
+            requests.append({"op": op, "values": values, "target": rng.choice(values) * 2 + 1})
+        elif op == "triplet":
+            requests.append({"op": op, "values": [rng.randint(-300, 300) for _ in range(300)]})
+        elif op == "palindrome":
+            half = "".join(rng.choice("abc ,.") for _ in range(500))
+            text = half + half[::-1] if rng.random() < 0.5 else half + "x" + half
+            requests.append({"op": op, "text": text})
+        else:
+            raise ValueError(f"no workload for op {op!r}")
+    return requests
+
+
+async def generate_load(address, requests, concurrency):
+    """
+    Closed-loop load: `concurrency` connections, each sending its next request
+    as soon as the previous answer arrives, until `requests` run out.
+
+    Returns:
+        Dict with requests, errors, seconds, throughput (requests per second)
+        and p50_ms / p99_ms / max_ms latency, measured per request from send to answer
+    """
+    import statistics
+
+    pending = iter(requests)
+    latencies = []
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        connection = await ServiceClient.connect(address)
+        for request in pending:
+            start = time.perf_counter()
+            try:
+                await connection.request(**request)
+            except ServiceError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+        await connection.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    seconds = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 \
+        else latencies * 99
+    return {"requests": len(latencies), "errors": errors, "seconds": seconds,
+            "throughput": len(latencies) / seconds, "p50_ms": quantiles[49] * 1000,
+            "p99_ms": quantiles[98] * 1000, "max_ms": max(latencies) * 1000}
+
+
+async def serve(address=DEFAULT_ADDRESS, announce=True, **options):
+    """Run an AlgorithmService until SIGINT or SIGTERM, then shut it and its pool down."""
+    import signal
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+    async with AlgorithmService(**options) as service:
+        await service.start(address)
+        if announce:
+            print(f"serving on {address}", file=sys.stderr)
+        await stop.wait()
+
+
+def _serve(address, options):
+    """Child-process entry point for the benchmark."""
+    asyncio.run(serve(address, announce=False, **options))
+
+
+def _wait_for_server(address, process=None, timeout=30.0):
+    import socket
+
+    deadline = time.monotonic() + timeout
+    while True:
+        if process is not None and not process.is_alive():
+            raise RuntimeError(f"server process exited with status {process.exitcode}")
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+        with socket.socket(family, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(address)
+                return
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+        time.sleep(0.05)
+
+
+async def _batch_counts(address, op):
+    """(items, batches) the server's batcher for `op` has seen, or None if op is not batched."""
+    client = await ServiceClient.connect(address)
+    try:
+        counts = (await client.request("stats"))["batches"].get(op)
+    finally:
+        await client.close()
+    return None if counts is None else (counts["items"], counts["batches"])
+
+
+def load_benchmark(ops=("sudoku", "container", "palindrome", "pair_sum", "triplet"),
+                   concurrency=(1, 16, 64), count=2000, workers=None, address=None):
+    """
+    Serve from a child process and report latency and throughput per
+    endpoint and concurrency level; batched endpoints are also run with
+    micro-batching off (max_batch=1) for comparison.
+    """
+    import multiprocessing
+    import tempfile
+
+    print("\n" + "=" * 60)
+    print("SERVICE LOAD (closed loop, one connection per client)")
+    print("=" * 60)
+
+    configurations = [("batched", {}), ("unbatched", {"max_batch": 1})]
+    with tempfile.TemporaryDirectory() as directory:
+        for label, options in configurations:
+            if label == "unbatched" and not set(ops) & {"sudoku", "container"}:
+                continue
+            target = address or os.path.join(directory, f"{label}.sock")
+            server = None
+            if address is None:
+                # Not a daemon: daemonic processes cannot start the process pool
+                server = multiprocessing.Process(target=_serve, args=(target, dict(options, workers=workers)))
+                server.start()
+            try:
+                _wait_for_server(target, server)
+                print(f"\n{label} server")
+                print(f"{'op':12} {'clients':>7} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9} "
+                      f"{'max ms':>9} {'errors':>7} {'batch':>6}")
+                print("-" * 75)
+                for op in ops:
+                    if label == "unbatched" and op not in ("sudoku", "container"):
+                        continue
+                    requests = make_requests(op, count if op != "triplet" else max(1, count // 10))
+                    for clients in concurrency:
+                        before = asyncio.run(_batch_counts(target, op))
+                        report = asyncio.run(generate_load(target, requests, clients))
+                        after = asyncio.run(_batch_counts(target, op))
+                        # Mean requests per batch during the run
+                        batch = "-" if after is None else \
+                            f"{(after[0] - before[0]) / max(1, after[1] - before[1]):6.1f}"
+                        print(f"{op:12} {clients:7} {report['throughput']:10,.0f} {report['p50_ms']:9.2f} "
+                              f"{report['p99_ms']:9.2f} {report['max_ms']:9.2f} {report['errors']:7} {batch:>6}")
+            finally:
+                if server is not None:
+                    server.terminate()
+                    server.join()
+            if address is not None:
+                break
+
+
+def test_service():
+    """Every endpoint matches a direct call, batched or not; errors and backpressure behave."""
+    import random
+    import tempfile
+
+    print("\n" + "=" * 60)
+    print("ALGORITHM SERVICE")
+    print("=" * 60)
+
+    requests = [request for op in ("sudoku", "container", "palindrome", "pair_sum", "triplet")
+                for request in make_requests(op, 40)]
+    requests += [{"op": "triplet", "values": list(range(-150, 150))},
+                 {"op": "pair_sum", "values": list(range(5000)), "target": 9997},
+                 {"op": "container", "heights": [1, 8, 6, 2, 5, 4, 8, 3, 7] * 1000},
+                 {"op": "sudoku", "board": [[1, 2, 3, 4], [3, 4, 1, 2], [2, 1, 4, 3], [4, 3, 2, 2]]}]
+
+    def direct(request):
+        args = {key: value for key, value in request.items() if key != "op"}
+        op = request["op"]
+        if op == "container":
+            area, (left, right) = _function("container")(args["heights"])
+            return [area, [left, right]]
+        if op == "sudoku":
+            finder = _function("sudoku" if len(args["board"]) == 9 else "sudoku_n")
+            return _sudoku_result(finder(args["board"]))
+        if op == "pair_sum":
+            return _function("pair_sum")(args["values"], args["target"])
+        return _function(op)(next(iter(args.values())))
+
+    expected = [json.loads(_encode(direct(request))) for request in requests]
+
+    # The batch runners above their thresholds, against the per-item functions
+    # (the server test below rarely gathers 32 boards in one loop iteration)
+    rng = random.Random(11)
+    service = AlgorithmService(workers=0)
+    boards = [request["board"] for request in make_requests("sudoku", 2 * SUDOKU_BATCH_MIN)]
+    # Mostly full 64-length rows, well past CONTAINER_BATCH_RATIO * 64 in total
+    lengths = [64, 64, 64, 0, 1, 2] * CONTAINER_BATCH_RATIO
+    profiles = [[rng.randint(0, 1000) for _ in range(length)] for length in lengths]
+    batch_checks = [
+        (f"sudoku batch of {len(boards)}", service._sudoku_batch(boards),
+         [_sudoku_result(_function("sudoku")(board)) for board in boards]),
+        (f"container batch of {len(profiles)}", service._container_batch(profiles),
+         [_function("container")(heights) for heights in profiles]),
+    ]
+    path = "vectorized" if has_numpy() else "per-item loop, NumPy not installed"
+
+    async def scenario(address):
+        results = {}
+        async with AlgorithmService(workers=1, max_in_flight=8, max_pipeline=4) as service:
+            await service.start(address)
+            clients = [await ServiceClient.connect(address) for _ in range(4)]
+            order = list(range(len(requests)))
+            random.Random(5).shuffle(order)
+            answers = await asyncio.gather(*(clients[k % 4].request(**requests[k]) for k in order))
+            results["answers"] = [answer for _, answer in sorted(zip(order, answers))]
+
+            failures = []
+            for bad in ({"op": "nope"}, {"op": "pair_sum", "values": 3, "target": 1},
+                        {"op": "sudoku", "board": [[10] * 9] * 9}, {"op": "palindrome"}):
+                try:
+                    await clients[0].request(**bad)
+                    failures.append(bad["op"])
+                except ServiceError:
+                    pass
+            results["rejected"] = not failures
+            results["stats"] = await clients[0].request("stats")
+
+            # A client that sends but never reads: once its socket buffers are
+            # full the server must stop reading from it, not queue answers
+            _, stalled = await asyncio.open_unix_connection(address)
+            stalled.write(b"".join(_encode({"id": k, "op": "triplet", "values": list(range(-60, 60))})
+                                   for k in range(500)))
+            await asyncio.sleep(0.5)
+            results["stalled_tasks"] = len(asyncio.all_tasks())
+            stalled.close()
+
+            for client in clients:
+                await client.close()
+        return results
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = asyncio.run(scenario(os.path.join(directory, "test.sock")))
+
+    stats = results["stats"]
+    checks = [
+        (f"{len(requests)} requests over 4 pipelined connections match direct calls",
+         results["answers"] == expected),
+        ("malformed requests get error responses", results["rejected"]),
+        (f"in-flight peak {stats['peak_in_flight']} within the limit of 8", stats["peak_in_flight"] <= 8),
+        (f"sudoku batched: {stats['batches']['sudoku']['items']} boards in "
+         f"{stats['batches']['sudoku']['batches']} batches",
+         stats["batches"]["sudoku"]["batches"] < stats["batches"]["sudoku"]["items"]),
+        (f"{stats['pool_jobs']} triplet jobs ran in the process pool", stats["pool_jobs"] > 0),
+        (f"non-reading client: {results['stalled_tasks']} live tasks after 500 requests",
+         results["stalled_tasks"] < 30),
+    ]
+    checks += [(f"{label} ({path}) matches the per-item functions",
+                json.loads(_encode(got)) == json.loads(_encode(want)))
+               for label, got, want in batch_checks]
+    for label, ok in checks:
+        print(f"{'✅' if ok else '❌'} {label}")
+
+
+def parse_address(args):
+    return args.unix if args.unix else (args.host, args.port)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="run the service")
+    bench_parser = commands.add_parser("bench", help="load-test a fresh (or --unix/--port given) server")
+    commands.add_parser("test", help="check the endpoints against direct calls")
+    for command in (serve_parser, bench_parser):
+        command.add_argument("--unix", help="Unix socket path (default: TCP)")
+        command.add_argument("--host", default=DEFAULT_ADDRESS[0])
+        command.add_argument("--port", type=int, default=None)
+        command.add_argument("--workers", type=int, default=None,
+                             help="process pool size for heavy jobs (default: CPU count; 0 = inline)")
+
+    serve_parser.add_argument("--max-batch", type=int, default=256)
+    serve_parser.add_argument("--max-delay", type=float, default=0.0,
+                       help="seconds a batch waits for more requests (0 = next loop iteration)")
+    serve_parser.add_argument("--max-in-flight", type=int, default=256)
+    serve_parser.add_argument("--max-pipeline", type=int, default=32, help="in-flight requests per connection")
+
+    bench_parser.add_argument("--op", default="sudoku,container,palindrome,pair_sum,triplet",
+                       help="comma-separated endpoints")
+    bench_parser.add_argument("--concurrency", default="1,16,64", help="comma-separated client counts")
+    bench_parser.add_argument("--requests", type=int, default=2000, help="requests per run (triplet: a tenth)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "test":
+        test_service()
+        return 0
+
+    if args.command == "bench":
+        address = None
+        if args.unix or args.port is not None:
+            address = args.unix or (args.host, args.port)
+        load_benchmark(args.op.split(","), [int(n) for n in args.concurrency.split(",")],
+                       args.requests, args.workers, address)
+        return 0
+
+    if args.port is None:
+        args.port = DEFAULT_ADDRESS[1]
+    address = parse_address(args)
+
+    asyncio.run(serve(address, workers=args.workers, max_batch=args.max_batch,
+                      max_delay=args.max_delay, max_in_flight=args.max_in_flight,
+                      max_pipeline=args.max_pipeline))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())